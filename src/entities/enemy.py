@@ -4,12 +4,40 @@ import random  # модуль для случайных чисел
 import pygame as pg  # библиотека pygame для графики и управления
 
 from src.map.obstacles import is_blocked  # функция проверки препятствий
+from src.systems.enemy_pool import (DIRECTION_CODES, DIRECTIONS, STATE_CODES, STATES,
+                                     PoolField)  # хранение полей в пуле врагов
+from src.systems.game_loop import lerp  # интерполяция между тиками
+from src.systems.assets import ASSETS, DEAD_IMAGE, SKELETON_SHEET  # общий реестр ресурсов
+from src.systems.animation import ALIVE, unit_animations  # кадры шага и смерти
+from src.systems.atlas import ATLAS  # атласы статичной графики по зумам
 
 
 class Enemy:
+    # Поля хранятся в самом объекте, а после EnemyPool.add — в массивах пула
+    x = PoolField("x")
+    y = PoolField("y")
+    prev_x = PoolField("prev_x")
+    prev_y = PoolField("prev_y")
+    hp = PoolField("hp", decode=int)
+    speed = PoolField("speed")
+    aggro_range = PoolField("aggro_range")
+    damage = PoolField("damage", decode=int)
+    state = PoolField("state", decode=STATES.__getitem__, encode=STATE_CODES.__getitem__)
+    direction = PoolField("direction", decode=DIRECTIONS.__getitem__, encode=DIRECTION_CODES.__getitem__)
+    alive = PoolField("alive", decode=bool)
+    attack_cooldown = PoolField("attack_cooldown", decode=int)
+    last_attack_time = PoolField("last_attack_time", decode=int)
+    walk_start = PoolField("walk_start", decode=int)
+    walk_until = PoolField("walk_until", decode=int)
+    died_at = PoolField("died_at", decode=int)
+
     def __init__(self, x, y, hp=100, speed=0.1, aggro_range=15, damage=5):
+        self._pool = None  # пул врагов (EnemyPool), если враг в него добавлен
+        self._index = -1   # строка в массивах пула
         self.x = float(x)  # координата X врага
         self.y = float(y)  # координата Y врага
+        self.prev_x = self.x  # координата X на прошлом тике (для интерполяции)
+        self.prev_y = self.y  # координата Y на прошлом тике (для интерполяции)
         self.hp = hp  # здоровье врага
         self.speed = speed  # скорость передвижения
         self.aggro_range = aggro_range  # радиус агрессии (видимости игрока)
@@ -22,51 +50,30 @@ class Enemy:
         self.attack_cooldown = 1000  # задержка между атаками (мс)
         self.last_attack_time = 0  # время последней атаки
 
-        # Загружаем спрайт-лист (тот же, что у игрока)
-        self.sheet = pg.image.load(
-            "assets/images/units/player/BODY_skeleton.png"
-        ).convert_alpha()
+        # состояние анимации (время симуляции, мс)
+        self.walk_start = 0  # начало шага
+        self.walk_until = 0  # до какого времени враг «идёт»
+        self.died_at = ALIVE  # время смерти
 
-        # Загружаем спрайт смерти
-        self.dead_img = pg.image.load(
-            "assets/images/units/player/dead.png"
-        ).convert_alpha()
+        # Спрайт-лист (тот же, что у игрока) и спрайт смерти — общие из реестра ресурсов
+        self.sheet = ASSETS.image(SKELETON_SHEET)
+        self.dead_img = ASSETS.image(DEAD_IMAGE)
 
-        # Нарезаем кадры анимации
+        # Нарезаем кадры анимации (общая таблица на всех)
         self.frames = self.load_frames()
+        # анимации шага и смерти (кадры в атласе, общие с игроком)
+        self.animations = unit_animations()
 
     def load_frames(self):
-        sheet_width, sheet_height = self.sheet.get_size()  # размеры спрайт-листа
-        cols = 9  # количество столбцов
-        rows = 4  # количество строк
-        frame_width = sheet_width // cols  # ширина одного кадра
-        frame_height = sheet_height // rows  # высота одного кадра
-
-        frames = {"UP": [], "LEFT": [], "DOWN": [], "RIGHT": [], "IDLE": []}
-
-        # нарезаем кадры по строкам и столбцам
-        for row in range(rows):
-            for col in range(cols):
-                rect = pg.Rect(col * frame_width, row * frame_height, frame_width, frame_height)
-                frame = self.sheet.subsurface(rect)
-
-                if row == 0:
-                    frames["UP"].append(frame)
-                elif row == 1:
-                    frames["LEFT"].append(frame)
-                elif row == 2:
-                    frames["DOWN"].append(frame)
-                elif row == 3:
-                    frames["RIGHT"].append(frame)
-
-        frames["IDLE"].append(frames["DOWN"][0])  # кадр для состояния покоя
-        return frames
+        # кадры нарезаются один раз в реестре и общие для всех юнитов
+        return ASSETS.sprite_frames(SKELETON_SHEET, cols=9, rows=4)
 
     def distance_to(self, target_x, target_y):
         # вычисляем расстояние до цели (например, игрока)
         return math.sqrt((target_x - self.x) ** 2 + (target_y - self.y) ** 2)
 
-    def update(self, target_x, target_y, box_map, obstacles=None, player_alive=True, player=None):
+    def update(self, target_x, target_y, box_map, obstacles=None, player_alive=True, player=None,
+               flow_field=None):
         if not self.alive:
             return
 
@@ -86,11 +93,11 @@ class Enemy:
 
         # выполняем действие в зависимости от состояния
         if self.state == "attack":
-            self.move_towards(target_x, target_y, box_map, obstacles, player)
+            self.move_towards(target_x, target_y, box_map, obstacles, player, flow_field)
         else:
             self.wander(box_map, obstacles)
 
-    def move_towards(self, target_x, target_y, box_map, obstacles=None, player=None):
+    def move_towards(self, target_x, target_y, box_map, obstacles=None, player=None, flow_field=None):
         if not self.alive:
             return
 
@@ -101,6 +108,14 @@ class Enemy:
         if dist == 0:
             return
 
+        # обход препятствий по общему полю путей (если прямой путь упирается)
+        if flow_field is not None:
+            flow_field.update(target_x, target_y)
+            cell = flow_field.next_cell(self.x, self.y, dx, dy, self.speed)
+            if cell is not None:
+                dx, dy = cell[0] - self.x, cell[1] - self.y
+                dist = math.sqrt(dx ** 2 + dy ** 2)
+
         # шаг в сторону игрока
         step_x = (dx / dist) * self.speed
         step_y = (dy / dist) * self.speed
@@ -158,11 +173,21 @@ class Enemy:
             return self.dead_img  # если враг мёртв — показываем спрайт смерти
         return self.frames[self.direction][0]  # иначе кадр по направлению
 
-    def draw(self, screen, tile_size, offset_x, offset_y):
-        # отрисовка врага на экране
-        enemy_img = pg.transform.scale(self.get_image(), (tile_size, tile_size))
-        screen.blit(enemy_img, (int(self.x * tile_size + offset_x),
-                                int(self.y * tile_size + offset_y)))
+    def get_sprite(self, now=0):
+        """Имя кадра в атласе на время симуляции now (мс)"""
+        return self.animations.sprite(self.direction, self.walk_start, self.walk_until, self.died_at,
+                                      self.alive, now)
+
+    def render_position(self, alpha=1.0):
+        """Позиция для отрисовки между прошлым и текущим тиком"""
+        return lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha)
+
+    def draw(self, screen, tile_size, offset_x, offset_y, alpha=1.0, now=0):
+        # отрисовка врага на экране (с интерполяцией между тиками)
+        # сразу на screen; в игре кадры врагов подаются в очередь кадра по массивам пула
+        x, y = self.render_position(alpha)
+        ATLAS.blit(screen, self.get_sprite(now), tile_size,
+                   (int(x * tile_size + offset_x), int(y * tile_size + offset_y)))
 
     # ---------- Боевая система ----------
 
@@ -3,12 +3,19 @@ import math  # модуль для математических функций
 import pygame as pg  # библиотека pygame для графики и управления
 
 from src.map.obstacles import is_blocked  # функция проверки препятствий
+from src.systems.game_loop import lerp  # интерполяция между тиками
+from src.systems.assets import ASSETS, DEAD_IMAGE, SKELETON_SHEET  # общий реестр ресурсов
+from src.systems.animation import ALIVE, unit_animations  # кадры шага и смерти
+from src.systems.atlas import ATLAS  # атласы статичной графики по зумам
+from src.systems.render_queue import UNITS  # слой юнитов в очереди отрисовки
 
 
 class Player:
     def __init__(self, x, y, speed=0.50):
         self.x = float(x)  # координата X игрока
         self.y = float(y)  # координата Y игрока
+        self.prev_x = self.x  # координата X на прошлом тике (для интерполяции)
+        self.prev_y = self.y  # координата Y на прошлом тике (для интерполяции)
         self.health = 100  # текущее здоровье
         self.max_health = 100  # максимальное здоровье
         self.direction = "DOWN"  # направление по умолчанию
@@ -16,47 +23,33 @@ class Player:
         self.weapon = None  # ссылка на объект Weapon (оружие)
         self.alive = True  # состояние игрока (жив/мертв)
 
-        # Загружаем спрайт-лист (анимация движения)
-        self.sheet = pg.image.load(
-            "assets/images/units/player/BODY_skeleton.png"
-        ).convert_alpha()
+        # состояние анимации (время симуляции, мс)
+        self.walk_start = 0  # начало шага
+        self.walk_until = 0  # до какого времени игрок «идёт»
+        self.died_at = ALIVE  # время смерти
 
-        # Загружаем спрайт смерти
-        self.dead_img = pg.image.load(
-            "assets/images/units/player/dead.png"
-        ).convert_alpha()
+        # Спрайт-лист (анимация движения) и спрайт смерти — общие из реестра ресурсов
+        self.sheet = ASSETS.image(SKELETON_SHEET)
+        self.dead_img = ASSETS.image(DEAD_IMAGE)
 
-        # Нарезаем кадры анимации
+        # Нарезаем кадры анимации (общая таблица на всех)
         self.frames = self.load_frames()
+        # анимации шага и смерти (кадры в атласе, общие с врагами)
+        self.animations = unit_animations()
 
     def load_frames(self):
-        sheet_width, sheet_height = self.sheet.get_size()  # размеры спрайт-листа
-        cols = 9  # количество столбцов
-        rows = 4  # количество строк
-        frame_width = sheet_width // cols  # ширина одного кадра
-        frame_height = sheet_height // rows  # высота одного кадра
-
-        frames = {"UP": [], "LEFT": [], "DOWN": [], "RIGHT": [], "IDLE": []}
-
-        # нарезаем кадры по строкам и столбцам
-        for row in range(rows):
-            for col in range(cols):
-                rect = pg.Rect(col * frame_width, row * frame_height, frame_width, frame_height)
-                frame = self.sheet.subsurface(rect)
-
-                if row == 0:
-                    frames["UP"].append(frame)
-                elif row == 1:
-                    frames["LEFT"].append(frame)
-                elif row == 2:
-                    frames["DOWN"].append(frame)
-                elif row == 3:
-                    frames["RIGHT"].append(frame)
-
-        frames["IDLE"].append(frames["DOWN"][0])  # кадр для состояния покоя
-        return frames
-
-    def move(self, direction, boxmap, obstacles=None, is_blocked_fn=is_blocked):
+        # кадры нарезаются один раз в реестре и общие для всех юнитов
+        return ASSETS.sprite_frames(SKELETON_SHEET, cols=9, rows=4)
+
+    def begin_tick(self):
+        """Запоминает позицию перед тиком симуляции"""
+        self.prev_x, self.prev_y = self.x, self.y
+
+    def render_position(self, alpha=1.0):
+        """Позиция для отрисовки между прошлым и текущим тиком"""
+        return lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha)
+
+    def move(self, direction, boxmap, obstacles=None, is_blocked_fn=is_blocked, step_scale=1.0):
         if not self.alive:
             return  # мёртвый игрок не двигается
 
@@ -73,9 +66,9 @@ class Player:
         if dist == 0:
             return
 
-        # шаг с учётом скорости
-        step_x = (dx / dist) * self.speed
-        step_y = (dy / dist) * self.speed
+        # шаг с учётом скорости (step_scale пересчитывает скорость под частоту тиков)
+        step_x = (dx / dist) * self.speed * step_scale
+        step_y = (dy / dist) * self.speed * step_scale
 
         new_x = self.x + step_x
         new_y = self.y + step_y
@@ -95,34 +88,48 @@ class Player:
             return self.dead_img  # если игрок мёртв — показываем спрайт смерти
         return self.frames[self.direction][0]  # иначе кадр по направлению
 
-    def draw(self, screen, tile_size, offset_x, offset_y):
-        # перевод координат игрока в пиксели
-        px = int(self.x * tile_size + offset_x)
-        py = int(self.y * tile_size + offset_y)
-
-        # отрисовка игрока
-        player_img = pg.transform.scale(self.get_image(), (tile_size, tile_size))
-        screen.blit(player_img, (px, py))
-
-        # отрисовка оружия, если оно есть
-        if self.weapon and self.alive:
-            weapon_img = self.weapon.get_scaled_image(tile_size, equipped=True)
-            offset_weapon_x, offset_weapon_y = px, py
-
-            if self.direction == "LEFT":
-                weapon_img = pg.transform.flip(weapon_img, True, False)  # зеркалим спрайт
-                offset_weapon_x = px - tile_size // -8
-                offset_weapon_y = py + tile_size // 2
-            elif self.direction == "RIGHT":
-                offset_weapon_x = px + tile_size // 3
-                offset_weapon_y = py + tile_size // 2
-            elif self.direction == "DOWN":
-                offset_weapon_x = px + tile_size // 4
-                offset_weapon_y = py + tile_size // 2
-            elif self.direction == "UP":
-                return  # оружие не рисуется при движении вверх
-
-            screen.blit(weapon_img, (offset_weapon_x, offset_weapon_y))
+    def get_sprite(self, now=0):
+        """Имя кадра в атласе на время симуляции now (мс)"""
+        return self.animations.sprite(self.direction, self.walk_start, self.walk_until, self.died_at,
+                                      self.alive, now)
+
+    def draw(self, screen, tile_size, offset_x, offset_y, alpha=1.0, now=0):
+        """Отрисовка игрока и оружия в руке сразу на screen (в игре — submit в очередь кадра)"""
+        x, y = self.render_position(alpha)
+        px, py = int(x * tile_size + offset_x), int(y * tile_size + offset_y)
+        ATLAS.blit(screen, self.get_sprite(now), tile_size, (px, py))
+        weapon = self.weapon_placement(px, py, tile_size)
+        if weapon:
+            ATLAS.blit(screen, weapon[0], tile_size, weapon[1])
+
+    def submit(self, queue, atlas, tile_size, offset_x, offset_y, alpha=1.0, now=0):
+        """Команды очереди отрисовки: игрок и оружие в руке (слой юнитов, глубина — y игрока)"""
+        # перевод координат игрока в пиксели (с интерполяцией между тиками)
+        x, y = self.render_position(alpha)
+        px = int(x * tile_size + offset_x)
+        py = int(y * tile_size + offset_y)
+
+        # отрисовка игрока (кадр — из атласа зума)
+        queue.submit_sprite(atlas, self.get_sprite(now), (px, py), UNITS, y)
+
+        # отрисовка оружия, если оно есть;
+        # та же глубина, что у игрока: оружие подано позже и рисуется поверх
+        weapon = self.weapon_placement(px, py, tile_size)
+        if weapon:
+            queue.submit_sprite(atlas, weapon[0], weapon[1], UNITS, y)
+
+    def weapon_placement(self, px, py, tile_size):
+        """(спрайт, позиция) оружия в руке для игрока в пикселях (px, py) или None, если не рисуется"""
+        if not (self.weapon and self.alive):
+            return None
+        if self.direction == "LEFT":
+            # зеркальный спрайт
+            return self.weapon.flipped_sprite, (px - tile_size // -8, py + tile_size // 2)
+        if self.direction == "RIGHT":
+            return self.weapon.equipped_sprite, (px + tile_size // 3, py + tile_size // 2)
+        if self.direction == "DOWN":
+            return self.weapon.equipped_sprite, (px + tile_size // 4, py + tile_size // 2)
+        return None  # оружие не рисуется при движении вверх
 
     # ---------- Боевая система ----------
 
@@ -2,61 +2,89 @@ import sys  # стандартный модуль для выхода из пр
 import pygame as pg  # библиотека pygame для графики и управления
 
 from src import settings  # модуль с настройками игры
-from src.entities.player import Player  # класс игрока
-from src.map.map import BoxMap  # класс карты
-from src.map.obstacles import is_blocked  # функция проверки препятствий
-from src.map.renderer import draw_map, box_to_pixel  # функции для отрисовки карты и перевода координат
-from src.systems.spawner import spawn_obstacles, spawn_enemies, generate_weapons  # генераторы объектов
-# from src.systems.save_load import save_game, load_game  # импортируем функции сохранения/загрузки
-# from src.map.obstacles import Obstacle, MountainGroup, WaterGroup
+from src.entities.enemy import Enemy  # класс врага
+from src.map.camera import Camera  # камера и видимая область карты
+from src.map.obstacles import trees_in_front  # деревья, закрывающие юнитов
+from src.map.terrain import TerrainLayer  # запечённый статический слой местности
+from src.systems.autosave import Autosave  # фоновое автосохранение
+from src.systems import dirty_rects  # вывод кадра грязными прямоугольниками (F4)
+from src.systems.game_loop import FixedStepLoop  # фиксированный шаг симуляции
+from src.systems.profiler import PROFILER, TOGGLE_KEY  # профилировщик кадра (F3)
+from src.systems.render_queue import RenderQueue, UNITS  # очередь отрисовки спрайтов
+from src.systems.animation import unit_animations  # кадры шага и смерти юнитов
+from src.systems.atlas import ATLAS  # атласы статичной графики по зумам
+from src.systems.text import TEXT  # кэш надписей и атлас цифр
+from src.systems.save_load import load_game, save_game, slot_path, world_metadata  # слоты сохранений
+from src.systems.world import build_world, new_seed, world_from_save  # генерация мира и тик симуляции
+
+SAVE_SLOT = 1     # слот, в который пишет и из которого читает меню паузы
+MAP_RADIUS = 50   # радиус карты новой партии
+NUM_ENEMIES = 10  # число врагов новой партии
+RESTART_KEY = pg.K_r  # новая партия на той же карте после GAME OVER / VICTORY
 
 def main():
     pg.init()  # инициализация pygame
     screen = settings.ScreenManager().get_screen()  # создаём экран
     clock = pg.time.Clock()  # создаём таймер для FPS
 
-    box_map = BoxMap(radius=50)  # создаём карту
-
-    # --- генерация объектов ---
-    obstacles = spawn_obstacles(box_map)  # создаём препятствия
-
-    # создаём игрока в центре
-    player = Player(x=0, y=0)
-
-    # если клетка занята — перезапускаем игру
-    if is_blocked(int(player.x), int(player.y), obstacles):
-        print("Стартовая клетка занята, перезапуск игры...")
-        return main()  # рекурсивный вызов main()
-
-    # создаём врагов
-    enemies = spawn_enemies(num_enemies=10, box_map=box_map,
-                            player=player, min_distance=10, obstacles=obstacles)
-
-    # создаём оружие
-    weapons = generate_weapons(box_map, obstacles)
-
+    # --- генерация мира: карта, препятствия, игрок в центре, враги и оружие ---
     tile_size = 40  # размер тайла
+    camera = Camera(*screen.get_size(), tile_size=tile_size)  # камера (видимая область)
+    autosave = Autosave()  # снимок в игровом потоке, запись в фоне (saves/autosave.sav)
+    renderer = dirty_rects.DirtyRectRenderer()  # полный кадр или только изменившиеся области
+
+    world = obstacles = player = enemies = enemy_pool = weapons = spatial = terrain = None
+
+    def start(new_world):
+        """Делает new_world текущим миром (новая партия или загрузка сохранения)"""
+        nonlocal world, obstacles, player, enemies, enemy_pool, weapons, spatial, terrain
+        world = new_world
+        obstacles, player = world.obstacles, world.player
+        enemies, enemy_pool, weapons, spatial = world.enemies, world.enemy_pool, world.weapons, world.spatial
+        terrain = TerrainLayer(world.box_map, obstacles)  # трава, горы, озёра, деревья и кусты в чанках
+        autosave.bind(obstacles)
+        renderer.bind(obstacles)
+        renderer.force_full()
+
+    def new_game(seed):
+        """Партия на карте seed: при повторе той же карты мир берётся из кэша миров"""
+        start(build_world(radius=MAP_RADIUS, num_enemies=NUM_ENEMIES, seed=seed))
+
+    # зерно выбирается здесь, а не в build_world: так мир кэшируется и рестарт его не генерирует заново
+    new_game(settings.WORLD_SEED if settings.WORLD_SEED is not None else new_seed())
+    queue = RenderQueue()  # спрайты кадра: сортировка по слою и глубине, вывод одним blits
     running, paused = True, False  # флаги состояния игры
 
-    # шрифты для текста
-    font_normal = pg.font.SysFont(None, 48, bold=False)
-    font_bold = pg.font.SysFont(None, 48, bold=True)
-    font_gameover = pg.font.SysFont(None, 120, bold=True)
-    font_victory = pg.font.SysFont(None, 120, bold=True)
-    font_counter = pg.font.SysFont(None, 36, bold=True)  # шрифт для счётчика врагов
+    # симуляция идёт фиксированными тиками, отрисовка — с интерполяцией между ними
+    loop = FixedStepLoop(tick_rate=settings.SIM_TICK_RATE, max_steps=settings.MAX_CATCH_UP_STEPS,
+                         reference_rate=settings.SPEED_REFERENCE_RATE)
 
     # функция отрисовки полоски здоровья
     def draw_health_bar(x, y, health, max_health, width=200, height=20):
-        pg.draw.rect(screen, (255, 255, 255), (x, y, width, height), 2)  # рамка
+        frame = pg.draw.rect(screen, (255, 255, 255), (x, y, width, height), 2)  # рамка
         fill_width = int((health / max_health) * (width - 4))  # ширина заполнения
         pg.draw.rect(screen, (200, 50, 50), (x + 2, y + 2, fill_width, height - 4))  # красная полоска
+        renderer.record(frame, ("health", health, max_health))  # полоска меняется вместе со здоровьем
 
     while running:  # основной цикл игры
+        PROFILER.begin_frame()  # замеры этапов кадра (оверлей по F3)
+        frame_time = clock.tick(settings.FPS) / 1000  # ограничиваем FPS, время кадра в секундах
+        PROFILER.mark("wait")
+
         for event in pg.event.get():  # обработка событий
             if event.type == pg.QUIT:  # выход из игры
                 running = False
             elif event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE:  # пауза по ESC
                 paused = not paused
+            elif (event.type == pg.KEYDOWN and event.key == RESTART_KEY and not paused
+                  and (not player.alive or enemy_pool.alive_count() == 0)):  # партия окончена — заново
+                new_game(world.seed if world.seed is not None else new_seed())
+            elif event.type == pg.KEYDOWN and event.key == TOGGLE_KEY:  # оверлей профилировщика
+                PROFILER.toggle()
+            elif event.type == pg.KEYDOWN and event.key == dirty_rects.TOGGLE_KEY:  # режим вывода кадра
+                renderer.toggle()
+            elif event.type in dirty_rects.EXPOSE_EVENTS:  # окно показано снова — следующий кадр целиком
+                renderer.force_full()
             elif event.type == pg.MOUSEBUTTONDOWN and paused:  # меню при паузе
                 if event.button == 1:  # левая кнопка мыши
                     mouse_pos = pg.mouse.get_pos()
@@ -67,7 +95,16 @@ def main():
                         if rect.collidepoint(mouse_pos):
                             if text == "Продолжить":
                                 paused = False
+                            elif text == "Сохранить игру":
+                                save_game(player, enemies, obstacles, path=slot_path(SAVE_SLOT),
+                                          meta=world_metadata(world, loop.sim_time_ms / 1000, screen))
+                            elif text == "Загрузить игру":
+                                data = load_game(slot_path(SAVE_SLOT))
+                                if data:
+                                    start(world_from_save(data))
+                                    paused = False
                             elif text == "Выйти из игры":
+                                autosave.close()  # дописываем начатое автосохранение
                                 pg.quit()
                                 sys.exit()
                             elif text == "Выход в главное меню":
@@ -81,150 +118,132 @@ def main():
             # --- атака игрока по пробелу ---
             elif event.type == pg.KEYDOWN and not paused and player.alive:
                 if event.key == pg.K_SPACE:
-                    nearest_enemy = None
-                    nearest_dist = float("inf")  # начальное значение — бесконечность
-                    for enemy in enemies:  # ищем ближайшего врага
-                        dist = ((enemy.x - player.x) ** 2 + (enemy.y - player.y) ** 2) ** 0.5
-                        if dist < nearest_dist:
-                            nearest_dist = dist
-                            nearest_enemy = enemy
-                    if nearest_enemy and nearest_dist <= 1.5:  # радиус атаки игрока
-                        player.attack(nearest_enemy)
+                    # ищем ближайшего врага в радиусе атаки игрока (1.5 клетки)
+                    nearest = spatial.nearest(player.x, player.y, k=1, max_radius=1.5, cls=Enemy)
+                    if nearest:
+                        player.attack(nearest[0][1])
+        PROFILER.mark("events")
 
         if not paused:  # если игра не на паузе
+            keys = pg.key.get_pressed()  # клавиши читаем раз за кадр, применяем в каждом тике
+
             # --- Управление игроком ---
-            keys = pg.key.get_pressed()
-            if player.alive:  # мёртвый игрок не двигается
-                if keys[pg.K_w]:
-                    player.move("UP", box_map, obstacles, is_blocked_fn=is_blocked)
-                elif keys[pg.K_s]:
-                    player.move("DOWN", box_map, obstacles, is_blocked_fn=is_blocked)
-                elif keys[pg.K_a]:
-                    player.move("LEFT", box_map, obstacles, is_blocked_fn=is_blocked)
-                elif keys[pg.K_d]:
-                    player.move("RIGHT", box_map, obstacles, is_blocked_fn=is_blocked)
-
-            # --- Подбор оружия ---
-            for weapon in weapons:
-                if not weapon.picked and weapon.x == player.x and weapon.y == player.y:
-                    weapon.picked = True
-                    player.weapon = weapon
+            direction = None
+            for key, name in ((pg.K_w, "UP"), (pg.K_s, "DOWN"), (pg.K_a, "LEFT"), (pg.K_d, "RIGHT")):
+                if keys[key]:
+                    direction = name
+                    break
+            PROFILER.mark("input")
+
+            # --- Тики симуляции (фиксированный шаг, не зависит от FPS) ---
+            steps = loop.advance(frame_time)
+            for _ in range(steps):
+                world.tick(direction, step_scale=loop.step_scale, now=loop.sim_time_ms)
+            PROFILER.count("ticks", steps)
+            PROFILER.mark("simulation")
+            autosave.update(loop.sim_time_ms, world, screen)
+            PROFILER.mark("autosave")
+
+            alpha = loop.alpha  # доля до следующего тика для интерполяции
 
             # --- Камера ---
-            px, py = box_to_pixel(player.x, player.y, tile_size)
-            offset_x = screen.get_width() // 2 - px - tile_size // 4
-            offset_y = screen.get_height() // 2 - py - tile_size // 4
-
-            # --- Отрисовка ---
-            screen.fill(settings.BACKGROUND_COLOR)  # фон
-            draw_map(screen, box_map, size=tile_size, offset_x=offset_x, offset_y=offset_y)  # карта
-
-            for obs in obstacles:  # препятствия
-                obs.draw(screen, tile_size, offset_x, offset_y)
+            camera.resize(*screen.get_size())
+            camera.follow(*player.render_position(alpha), tile_size)
+            offset_x, offset_y = camera.offset_x, camera.offset_y
+
+            # --- Отрисовка (только то, что попадает на экран) ---
+            # фон рисуется целиком, только если сдвинулась камера (иначе он восстановлен под спрайтами)
+            if renderer.begin(screen, ("game", int(offset_x), int(offset_y), tile_size)):
+                screen.fill(settings.BACKGROUND_COLOR)  # фон
+                terrain.draw(screen, camera)  # карта и препятствия (видимые чанки)
+                renderer.background_done(screen)
+            PROFILER.mark("terrain")
+            canvas = renderer.track(screen)  # спрайты и HUD — через запоминающую обёртку экрана
+
+            # --- Спрайты мира: команды в очередь, вывод одним пакетом ---
+            atlas = ATLAS.at(tile_size)  # все спрайты — из атласа текущего зума
+            positions = []  # позиции спрайтов (клетки) для поиска закрывающих их деревьев
             for weapon in weapons:  # оружие
-                weapon.draw(screen, tile_size, offset_x, offset_y)
+                if not weapon.picked and camera.is_visible(weapon.x, weapon.y):
+                    weapon.submit(queue, atlas, tile_size, offset_x, offset_y)
+                    positions.append((weapon.x, weapon.y))
 
             # --- Игрок ---
-            player.draw(screen, tile_size, offset_x, offset_y)
+            now = loop.sim_time_ms  # время симуляции — по нему выбираются кадры анимаций
+            player.submit(queue, atlas, tile_size, offset_x, offset_y, alpha=alpha, now=now)
+            positions.append(player.render_position(alpha))
+
+            # --- Враги (только те, что на экране; позиции интерполированы) ---
+            enemy_xs, enemy_ys = enemy_pool.render_positions(alpha)
+            visible_enemies = enemy_pool.in_rect(*camera.visible_tiles())
+            # кадры анимации всех видимых врагов — одним векторным выбором по массивам пула
+            sprites = unit_animations().sprites(
+                enemy_pool.direction[visible_enemies], enemy_pool.walk_start[visible_enemies],
+                enemy_pool.walk_until[visible_enemies], enemy_pool.died_at[visible_enemies],
+                enemy_pool.alive[visible_enemies], now)
+            for index, sprite in zip(visible_enemies, sprites):
+                x, y = enemy_xs[index], enemy_ys[index]
+                queue.submit_sprite(atlas, sprite, (int(x * tile_size + offset_x), int(y * tile_size + offset_y)),
+                                    UNITS, y)
+                positions.append((x, y))
+
+            # деревья запечены в местность под спрайтами; те, что стоят ниже спрайта и пересекают его,
+            # дорисовываются поверх в общем порядке глубины
+            for tree in trees_in_front(obstacles, positions):
+                tree.submit(queue, atlas, tile_size, offset_x, offset_y)
+            queue.flush(canvas)
+            PROFILER.mark("entities")
+
+            # --- HUD (поверх мира) ---
             draw_health_bar(20, 20, player.health, player.max_health)
 
             # --- Счётчик живых врагов ---
-            alive_enemies = sum(1 for enemy in enemies if enemy.alive)  # считаем живых
-            counter_surface = font_counter.render(f"Врагов осталось: {alive_enemies}", True, (255, 255, 255))
-            counter_rect = counter_surface.get_rect(topright=(screen.get_width() - 20, 20))
-            screen.blit(counter_surface, counter_rect)
+            alive_enemies = enemy_pool.alive_count()  # считаем живых
+            # подпись — из кэша надписей, число — из атласа цифр
+            TEXT.draw_text(canvas, "Врагов осталось: ", alive_enemies, 36, bold=True,
+                           topright=(screen.get_width() - 20, 20))
+            PROFILER.count("blits", 1 + len(str(alive_enemies)))
 
             # --- Проверка смерти игрока ---
             if not player.alive:
-                text_surface = font_gameover.render("GAME OVER", True, (200, 0, 0))
+                text_surface = TEXT.render("GAME OVER", 120, (200, 0, 0), bold=True)
                 text_rect = text_surface.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
-                screen.blit(text_surface, text_rect)
+                canvas.blit(text_surface, text_rect)
+                PROFILER.count("blits")
 
             # --- Проверка победы ---
-            elif all(not enemy.alive for enemy in enemies):
-                text_surface = font_victory.render("VICTORY", True, (0, 0, 200))
+            elif alive_enemies == 0:
+                text_surface = TEXT.render("VICTORY", 120, (0, 0, 200), bold=True)
                 text_rect = text_surface.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
-                screen.blit(text_surface, text_rect)
-
-            # --- Враги ---
-            for enemy in enemies:
-                if not is_blocked(enemy.x, enemy.y, obstacles):
-                    # передаём player внутрь update
-                    enemy.update(player.x, player.y, box_map, obstacles, player_alive=player.alive, player=player)
+                canvas.blit(text_surface, text_rect)
+                PROFILER.count("blits")
 
-                # если игрок жив и враг рядом — атакует
-                dist = ((enemy.x - player.x) ** 2 + (enemy.y - player.y) ** 2) ** 0.5
-                if dist <= 1.1 and player.alive:
-                    enemy.attack(player)
-
-                # отрисовка врага
-                enemy_img = pg.transform.scale(enemy.get_image(), (tile_size, tile_size))
-                screen.blit(enemy_img, (int(enemy.x * tile_size + offset_x),
-                                        int(enemy.y * tile_size + offset_y)))
+            if not player.alive or alive_enemies == 0:  # подсказка о новой партии под надписью
+                hint = TEXT.render("R — начать заново", 36)
+                canvas.blit(hint, hint.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2 + 90)))
+                PROFILER.count("blits")
+            PROFILER.mark("hud")
 
         else:
             # --- Меню ---
-            screen.fill((30, 30, 30))
+            if renderer.begin(screen, ("menu",)):
+                screen.fill((30, 30, 30))
+                renderer.background_done(screen)
+            canvas = renderer.track(screen)
             options = ["Продолжить", "Сохранить игру", "Загрузить игру",
                    "Выход в главное меню", "Выйти из игры"]
             mouse_pos = pg.mouse.get_pos()
             for i, text in enumerate(options):
                 rect = pg.Rect(screen.get_width() // 2 - 150, 180 + i * 60, 300, 50)
-                label = (font_bold if rect.collidepoint(mouse_pos) else font_normal).render(text, True, (255, 255, 255))
-                screen.blit(label, label.get_rect(center=rect.center))
-
-        pg.display.flip() # обновляем экран
-        clock.tick(settings.FPS) # ограничиваем FPS
-
-        # Раскоммент для сохранений (в разработке)
-        # else:  # если игра на паузе
-        # screen.fill((30, 30, 30))
-        # options = [
-        #     "Продолжить",
-        #     "Сохранение",
-        #     "Загрузка",
-        #     "Выход в главное меню",
-        #     "Выйти из игры"
-        # ]
-        #
-        # mouse_pos = pg.mouse.get_pos()
-        # rects = []
-        # for i, text in enumerate(options):
-        #     rect = pg.Rect(screen.get_width() // 2 - 200, 150 + i * 60, 400, 50)
-        #     rects.append((rect, text))
-        #     label = (font_bold if rect.collidepoint(mouse_pos) else font_normal).render(
-        #         text, True, (255, 255, 255)
-        #     )
-        #     screen.blit(label, label.get_rect(center=rect.center))
-        #
-        # # обработка кликов
-        # for event in pg.event.get():
-        #     if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
-        #         for rect, text in rects:
-        #             if rect.collidepoint(event.pos):
-        #                 if text == "Продолжить":
-        #                     paused = False
-        #                 elif text == "Сохранение":
-        #                     save_game(player, enemies, obstacles)
-        #                 elif text == "Загрузка":
-        #                     data = load_game()
-        #                     if data:
-        #                         player.x = data["player"]["x"]
-        #                         player.y = data["player"]["y"]
-        #                         player.health = data["player"]["health"]
-        #
-        #                         for e, saved in zip(enemies, data["enemies"]):
-        #                             e.x, e.y, e.alive = saved["x"], saved["y"], saved["alive"]
-        #
-        #                         obstacles.clear()
-        #                         obstacles.extend(data["obstacles"])  # уже готовые объекты
-        #                 elif text == "Выход в главное меню":
-        #                     running = False
-        #                 elif text == "Выйти из игры":
-        #                     pg.quit()
-        #                     sys.exit()
-
-        pg.display.flip()
-        clock.tick(settings.FPS)
-
-
+                label = TEXT.render(text, 48, bold=rect.collidepoint(mouse_pos))  # обе версии — из кэша
+                canvas.blit(label, label.get_rect(center=rect.center))
+            PROFILER.count("blits", len(options))
+            PROFILER.mark("menu")
+
+        PROFILER.draw(canvas)  # оверлей профилировщика (если включён)
+        PROFILER.mark("overlay")
+        renderer.present(screen)  # обновляем экран: целиком или изменившиеся области
+        PROFILER.count("redraw %", round(renderer.redrawn_fraction * 100))
+        PROFILER.mark("flip")
+
+    autosave.close()  # дописываем начатое автосохранение
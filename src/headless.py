@@ -0,0 +1,138 @@
+"""
+Безголовый режим симуляции и замер производительности.
+
+Строит мир через build_world (spawn_obstacles / spawn_enemies / generate_weapons), прогоняет N тиков
+без окна и печатает JSON: тики в секунду, время по этапам и пиковую память.
+
+Запуск из корня проекта:
+    python -m src.headless --radius 50 --enemies 1000 --seed 1 --ticks 600
+Замер только генерации мира (время по этапам — в build.stages_s):
+    python -m src.headless --radius 1000 --ticks 0
+"""
+import argparse  # разбор аргументов командной строки
+import contextlib  # перенаправление служебных сообщений
+import json  # вывод результатов в JSON
+import os  # переменные окружения SDL
+import random  # сценарий движения игрока
+import sys  # поток вывода
+import time  # замеры времени
+import tracemalloc  # пиковая память Python-объектов
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # без окна
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")  # без звука
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # приветствие pygame испортило бы JSON
+
+from src import settings  # частота тиков и версия игры
+from src.systems.game_loop import FixedStepLoop  # шаг симуляции и пересчёт скоростей
+from src.systems.world import WORLD_CACHE, build_world  # генерация мира, кэш миров и тик симуляции
+
+DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+
+
+def max_rss_kb():
+    """Пиковый размер резидентной памяти процесса (КБ) или None, если недоступно"""
+    try:
+        import resource  # есть только на Unix
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss  # macOS отдаёт байты
+
+
+def run(radius=50, enemies=10, seed=0, ticks=600, player_input="random", trace_memory=False, world_cache=False):
+    """
+    Строит мир и прогоняет ticks тиков. Возвращает словарь с результатами.
+    world_cache — брать мир из кэша миров на диске (по умолчанию мир всегда генерируется,
+    чтобы замер генерации был честным).
+    """
+    if trace_memory:
+        tracemalloc.start()
+
+    build_timings = {}
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stderr):  # stdout оставляем только для JSON
+        world = build_world(radius=radius, num_enemies=enemies, seed=seed, timings=build_timings,
+                            cache=WORLD_CACHE if world_cache else None)
+    build_time = time.perf_counter() - start
+
+    loop = FixedStepLoop(tick_rate=settings.SIM_TICK_RATE, reference_rate=settings.SPEED_REFERENCE_RATE)
+    rng = random.Random(seed)  # отдельный генератор для сценария игрока
+    tick_timings = {}
+    direction = None
+
+    start = time.perf_counter()
+    for tick in range(ticks):
+        if player_input == "random" and tick % 10 == 0:
+            direction = rng.choice(DIRECTIONS + (None,))  # меняем направление раз в 10 тиков
+        world.tick(direction, step_scale=loop.step_scale, now=int(tick * 1000 / loop.tick_rate),
+                   timings=tick_timings)
+    sim_time = time.perf_counter() - start
+    stages = {name: total * 1000 / ticks for name, total in tick_timings.items()} if ticks else {}
+
+    result = {
+        "version": settings.GAME_VERSION,
+        "params": {
+            "radius": radius,
+            "enemies": enemies,
+            "seed": seed,
+            "ticks": ticks,
+            "tick_rate": loop.tick_rate,
+            "player_input": player_input,
+        },
+        "build": {
+            "total_s": build_time,
+            "stages_s": build_timings,
+            "obstacles": len(world.obstacles),
+            "from_cache": world.from_cache,
+        },
+        "simulation": {
+            "total_s": sim_time,
+            "ticks_per_sec": ticks / sim_time if sim_time > 0 else None,
+            "realtime_factor": ticks / loop.tick_rate / sim_time if sim_time > 0 else None,
+            "stages_ms_per_tick": stages,
+        },
+        "state": {
+            "enemies_alive": world.enemy_pool.alive_count(),
+            "player_alive": world.player.alive,
+            "player_health": world.player.health,
+        },
+        "memory": {
+            "max_rss_kb": max_rss_kb(),
+        },
+    }
+
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["memory"]["tracemalloc_peak_bytes"] = peak
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Безголовая симуляция и замер производительности")
+    parser.add_argument("--radius", type=int, default=50, help="радиус карты в клетках")
+    parser.add_argument("--enemies", type=int, default=10, help="число врагов")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генерации")
+    parser.add_argument("--ticks", type=int, default=600, help="число тиков симуляции")
+    parser.add_argument("--input", choices=("random", "idle"), default="random",
+                        help="сценарий игрока: случайное движение или стоять на месте")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="замерять пик памяти через tracemalloc (замедляет симуляцию)")
+    parser.add_argument("--world-cache", action="store_true",
+                        help="загружать мир из кэша миров (и сохранять в него), а не генерировать")
+    parser.add_argument("--output", help="файл для JSON (по умолчанию — stdout)")
+    args = parser.parse_args(argv)
+
+    result = run(radius=args.radius, enemies=args.enemies, seed=args.seed, ticks=args.ticks,
+                 player_input=args.input, trace_memory=args.trace_memory, world_cache=args.world_cache)
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,54 @@
+import json                      # отчёт о первом кадре (--first-frame)
+import os                        # путь к корню проекта
+import sys                       # пути импорта и аргументы запуска
+import time                      # замер запуска
+
+STARTED = time.perf_counter()    # начало импорта модулей меню
+
+if not __package__:
+    # запуск как «python src/main.py»: в путях импорта корень проекта вместо src/,
+    # чтобы все модули брались как src.* и settings загружался один раз
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 import pygame as pg              # библиотека pygame для графики и событий
 import pygame.mixer as pgm       # модуль pygame для работы со звуком и музыкой
 
-import settings                  # модуль с настройками игры
-from menu import draw_menu       # функция отрисовки меню
-
-def main():
+from src import settings         # модуль с настройками игры
+from src.menu import MenuView    # меню (перерисовывается только при изменениях)
+from src.systems.asset_cache import ASSET_CACHE  # декодированные картинки и звуки на диске
+from src.systems.dirty_rects import EXPOSE_EVENTS  # события повторного показа окна
+
+HOVER_SOUND = "assets/sounds/ui/hover.wav"            # звук наведения курсора
+MENU_MUSIC = "assets/music/menu_music.mp3"            # музыка меню
+GAME_MUSIC = "assets/music/game_music_ambient.mp3"    # музыка игры
+
+
+def play_music(path):
+    """Музыка в цикле (-1 = бесконечно); если файла нет — без музыки"""
+    try:
+        pgm.music.load(path)
+    except (pg.error, FileNotFoundError):
+        return
+    pgm.music.set_volume(settings.CURRENT_VOLUME)  # выставляем громкость
+    pgm.music.play(-1)
+
+
+def main(first_frame=False):
+    """
+    Главное меню. Игра (game.py со всеми её модулями) импортируется только при «Новой игре»,
+    звук наведения загружается при первом наведении, музыка — после первого кадра.
+    first_frame — замер запуска: после первого кадра меню печатает JSON с временем этапов и выходит.
+    """
+    imported = time.perf_counter()
     pg.init()                    # инициализация pygame
     pgm.init()                   # инициализация звукового модуля
 
     # --- получаем экран через синглтон ---
     screen = settings.ScreenManager().get_screen()
+    initialized = time.perf_counter()
 
-    hover_sound = pgm.Sound("assets/sounds/ui/hover.wav")  # звук наведения курсора
-
-    # Музыка меню
-    pgm.music.load("assets/music/menu_music.mp3")          # загружаем музыку меню
-    pgm.music.set_volume(settings.CURRENT_VOLUME)          # выставляем громкость
-    pgm.music.play(-1)                                     # проигрываем в цикле (-1 = бесконечно)
+    hover_sound = None  # звук наведения (загружается при первом наведении)
+    music_started = False  # музыка меню включается после первого кадра
 
     clock = pg.time.Clock()        # таймер для FPS
     running = True                 # флаг работы программы
@@ -27,13 +59,9 @@ def main():
 
     # виртуальный экран для интерфейса (масштабируемый)
     virtual_screen = pg.Surface((settings.CURRENT_WIDTH, settings.CURRENT_HEIGHT))
+    menu_view = MenuView()  # собранные страницы меню и заранее отрисованные надписи
 
     while running:  # основной цикл меню
-        virtual_screen.fill(settings.BACKGROUND_COLOR)  # фон меню
-
-        # отрисовываем меню и получаем список опций с их прямоугольниками
-        option_rects = draw_menu(virtual_screen, mode, settings_submenu, settings.CURRENT_VOLUME)
-
         hovered_now = None  # текущая наведённая опция
 
         # переводим координаты мыши в виртуальные координаты
@@ -43,10 +71,38 @@ def main():
         mouse_pos_virtual = (int(pg.mouse.get_pos()[0] * scale_x),
                              int(pg.mouse.get_pos()[1] * scale_y))
 
+        # отрисовываем меню (только если что-то изменилось) и получаем список опций с их прямоугольниками
+        option_rects, changed = menu_view.draw(virtual_screen, mode, settings_submenu,
+                                               settings.CURRENT_VOLUME, mouse_pos_virtual)
+        if changed:
+            # масштабируем виртуальный экран под реальный
+            scaled = pg.transform.scale(virtual_screen, screen.get_size())
+            screen.blit(scaled, (0, 0))
+            pg.display.flip()  # обновляем экран только при изменениях
+
+        if not music_started:  # первый кадр уже на экране — теперь можно заняться музыкой
+            if first_frame:
+                shown = time.perf_counter()
+                print(json.dumps({
+                    "wall_time": time.time(),  # момент первого кадра (для замера из другого процесса)
+                    "imports_s": imported - STARTED,
+                    "init_s": initialized - imported,
+                    "first_frame_s": shown - initialized,
+                    "total_s": shown - STARTED,
+                    "settings_modules": sum(name in sys.modules for name in ("settings", "src.settings")),
+                    "game_imported": "src.game" in sys.modules,
+                }))
+                break
+            play_music(MENU_MUSIC)
+            music_started = True
+
         for event in pg.event.get():  # обработка событий
             if event.type == pg.QUIT:  # выход из программы
                 running = False
 
+            elif event.type in EXPOSE_EVENTS:  # окно показано снова — кадр меню выводится целиком
+                menu_view.invalidate()
+
             elif event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE:  # выход по ESC
                 running = False
 
@@ -63,19 +119,16 @@ def main():
                         elif option == "Новая игра":
                             # переключаем музыку на игровую
                             pgm.music.stop()
-                            pgm.music.load("assets/music/game_music_ambient.mp3")
-                            pgm.music.set_volume(settings.CURRENT_VOLUME)
-                            pgm.music.play(-1)
+                            play_music(GAME_MUSIC)
 
-                            # запускаем игровой цикл
-                            from game import main as game_main
+                            # запускаем игровой цикл (модули игры импортируются только здесь)
+                            from src.game import main as game_main
                             game_main()
 
-                            # после выхода из игры возвращаемся в меню
+                            # после выхода из игры возвращаемся в меню (экран перерисуется целиком)
+                            menu_view.invalidate()
                             pgm.music.stop()
-                            pgm.music.load("assets/music/menu_music.mp3")
-                            pgm.music.set_volume(settings.CURRENT_VOLUME)
-                            pgm.music.play(-1)
+                            play_music(MENU_MUSIC)
 
                         elif option == "Назад":
                             mode = "main"
@@ -107,6 +160,7 @@ def main():
                             settings.CURRENT_MODE = option
                             # пересоздаём экран через Singleton
                             screen = settings.ScreenManager().reset_screen()
+                            menu_view.invalidate()
 
             elif event.type == pg.MOUSEBUTTONUP and event.button == 1:
                 dragging = False  # отпускаем ползунок
@@ -132,18 +186,15 @@ def main():
 
         # если наведена новая опция — проигрываем звук
         if hovered_now != last_hovered and hovered_now is not None:
+            if hover_sound is None:
+                hover_sound = ASSET_CACHE.sound(HOVER_SOUND)
             hover_sound.play()
             last_hovered = hovered_now
 
-        # масштабируем виртуальный экран под реальный
-        scaled = pg.transform.scale(virtual_screen, screen.get_size())
-        screen.blit(scaled, (0, 0))
-
-        pg.display.flip()          # обновляем экран
         clock.tick(settings.FPS)   # ограничиваем FPS
 
     # Закрываем pygame только при полном выходе
     pg.quit()
 
 if __name__ == "__main__":
-    main()  # запускаем функцию main при старте программы
+    main(first_frame="--first-frame" in sys.argv)  # запускаем функцию main при старте программы
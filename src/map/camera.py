@@ -0,0 +1,66 @@
+import math  # модуль для математических функций (floor)
+
+
+def visible_tile_range(screen_width, screen_height, size, offset_x, offset_y):
+    """
+    Прямоугольник клеток, попадающих на экран.
+    Возвращает (min_x, min_y, max_x, max_y) включительно.
+    """
+    min_x = math.floor(-offset_x / size)                  # левая видимая клетка
+    min_y = math.floor(-offset_y / size)                  # верхняя видимая клетка
+    max_x = math.floor((screen_width - offset_x) / size)  # правая видимая клетка
+    max_y = math.floor((screen_height - offset_y) / size) # нижняя видимая клетка
+    return min_x, min_y, max_x, max_y
+
+
+class Camera:
+    """
+    Камера (вьюпорт) поверх клеточной карты.
+    - offset_x, offset_y: смещение мира относительно экрана в пикселях
+    - tile_size: текущий размер клетки (зум)
+    - width, height: размер экрана в пикселях
+    Позволяет каждому слою отрисовки брать только то, что попадает на экран.
+    """
+
+    def __init__(self, width, height, tile_size=40):
+        self.width = width          # ширина экрана
+        self.height = height        # высота экрана
+        self.tile_size = tile_size  # размер клетки
+        self.offset_x = 0           # смещение по X
+        self.offset_y = 0           # смещение по Y
+
+    def resize(self, width, height):
+        """Обновление размера экрана (например, при смене разрешения)"""
+        self.width = width
+        self.height = height
+
+    def follow(self, x, y, tile_size):
+        """Центрирует камеру на клетке (x, y) при размере клетки tile_size"""
+        self.tile_size = tile_size
+        px, py = x * tile_size, y * tile_size  # координаты цели в пикселях
+        self.offset_x = self.width // 2 - px - tile_size // 4
+        self.offset_y = self.height // 2 - py - tile_size // 4
+
+    def visible_tiles(self):
+        """Видимый прямоугольник клеток (min_x, min_y, max_x, max_y)"""
+        return visible_tile_range(self.width, self.height, self.tile_size,
+                                  self.offset_x, self.offset_y)
+
+    def is_visible(self, x, y, w=1, h=1):
+        """Пересекает ли экран область из w × h клеток с левым верхним углом (x, y)"""
+        size = self.tile_size
+        px = x * size + self.offset_x
+        py = y * size + self.offset_y
+        return px < self.width and py < self.height and px + w * size > 0 and py + h * size > 0
+
+    def is_bounds_visible(self, bounds):
+        """Пересекает ли экран область клеток (min_x, min_y, max_x, max_y)"""
+        min_x, min_y, max_x, max_y = bounds
+        return self.is_visible(min_x, min_y, max_x - min_x + 1, max_y - min_y + 1)
+
+    def visible_obstacles(self, obstacles):
+        """Препятствия, попадающие на экран (в порядке отрисовки)"""
+        # список с пространственным индексом отдаёт только нужные корзины
+        if hasattr(obstacles, "query_rect"):
+            return obstacles.query_rect(*self.visible_tiles())
+        return [o for o in obstacles if self.is_bounds_visible(o.get_bounds())]
@@ -1,35 +1,29 @@
-import pygame as pg  # библиотека pygame для работы с графикой
+from src.map.tile_chunks import TileChunks, TileView  # компактное хранилище тайлов по чанкам
+from src.systems.assets import ASSETS  # общий реестр ресурсов
+from src.systems.surface_cache import scale  # масштабирование через общий кэш
 
 class BoxMap:
     def __init__(self, radius=10, tile_size=40, base_tile="grass.png"):
         self.radius = radius          # радиус карты (от центра до края в клетках)
         self.tile_size = tile_size    # размер одной клетки (в пикселях)
-        self.tiles = {}               # словарь для хранения тайлов карты
 
         # Загружаем оригинальный тайл один раз (например, grass.png)
-        self.grass_tile_original = pg.image.load(
-            f"assets/images/tiles/{base_tile}"
-        ).convert_alpha()
+        self.grass_tile_original = ASSETS.image(f"assets/images/tiles/{base_tile}")
 
-        # Масштабируем тайл под текущий размер клетки
-        self.grass_tile = pg.transform.scale(
-            self.grass_tile_original, (self.tile_size, self.tile_size)
-        )
+        # номера тайлов лежат в чанках (байт на клетку), поверхности — в палитре
+        self.tile_store = TileChunks(radius, [self.grass_tile_original])
+        self.tiles = TileView(self.tile_store)  # словарь (x, y) -> тайл поверх чанков
 
         # Генерируем клетки карты
         self.generate_boxes()
 
     def generate_boxes(self):
         """Генерация квадратной области [-radius, radius] × [-radius, radius]"""
-        # пересоздаём масштабированный тайл на случай изменения tile_size
-        self.grass_tile = pg.transform.scale(
-            self.grass_tile_original, (self.tile_size, self.tile_size)
-        )
+        # масштабированный тайл берём из общего кэша
+        self.grass_tile = scale(self.grass_tile_original, (self.tile_size, self.tile_size))
 
-        # создаём сетку тайлов от -radius до +radius по X и Y
-        for x in range(-self.radius, self.radius + 1):
-            for y in range(-self.radius, self.radius + 1):
-                self.tiles[(x, y)] = self.grass_tile  # сохраняем тайл в словарь
+        # вся карта — трава: чанки не создаются, пока в них не запишут другой тайл
+        self.tile_store.fill(self.tile_store.palette_id(self.grass_tile_original))
 
     def is_inside(self, x, y):
         """Проверка: находится ли клетка внутри карты"""
@@ -38,4 +32,5 @@ class BoxMap:
     def update_tile_size(self, new_size):
         """Обновление размера клетки (например, при зуме колесиком мыши)"""
         self.tile_size = new_size     # обновляем размер клетки
-        self.generate_boxes()         # пересоздаём тайлы под новый размер
+        # тайлы хранятся в исходном размере и масштабируются при отрисовке — пересоздавать карту не нужно
+        self.grass_tile = scale(self.grass_tile_original, (self.tile_size, self.tile_size))
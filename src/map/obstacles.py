@@ -1,5 +1,16 @@
+import math  # округление позиций до клеток
+
+import numpy as np  # маски клеток гор и озёр
 import pygame as pg  # библиотека pygame для работы с графикой
 
+from src.systems.assets import ASSETS, MOUNTAIN_TILES, MOUNTAINS_TILESET, WATER_IMAGE  # реестр ресурсов
+from src.systems.atlas import ATLAS, tile_size_fn  # атласы статичной графики по зумам
+from src.systems.render_queue import UNITS  # слой юнитов в очереди отрисовки
+from src.systems.surface_cache import SURFACE_CACHE  # общий кэш масштабированных картинок
+
+MOUNTAIN_SPRITES = {name: f"mountain/{name}" for name in MOUNTAIN_TILES}  # клетка тайлсета -> имя в атласе
+TREE_KINDS = ("tree-1", "tree-2")  # деревья выше клетки на один тайл
+
 # ---------- Базовый объект-препятствие ----------
 
 class Obstacle:
@@ -9,26 +20,27 @@ class Obstacle:
         "tree-2": "assets/images/tiles/tree-2.png",
         "bush": "assets/images/tiles/bush.png",
     }
-    TILE_IMAGES = {}  # кэш загруженных изображений
 
     def __init__(self, x, y, kind, shade_factor=1.0):
         self.x, self.y = x, y          # координаты препятствия
         self.kind = kind               # тип препятствия (дерево, куст и т.д.)
         self.shade_factor = shade_factor  # коэффициент затемнения (для будущих эффектов)
 
-        # если тип есть в словаре путей
-        if kind in Obstacle.TILE_PATHS:
-            # загружаем изображение только один раз
-            if kind not in Obstacle.TILE_IMAGES:
-                Obstacle.TILE_IMAGES[kind] = pg.image.load(
-                    Obstacle.TILE_PATHS[kind]
-                ).convert_alpha()
-            self.base_img = Obstacle.TILE_IMAGES[kind]  # сохраняем картинку
+        # если тип есть в словаре путей — картинка и имя в атласе общие для всех препятствий этого типа
+        sprite = _sprites().get(kind)
+        if sprite is not None:
+            self.base_img, self.sprite = sprite
         else:
             # если тип неизвестен — рисуем цветной квадрат
             self.base_img = None
             self.color = (200, 0, 200)
 
+    def get_bounds(self):
+        """Клетки, которые препятствие занимает на экране: (min_x, min_y, max_x, max_y)"""
+        if self.base_img and self.kind in TREE_KINDS:
+            return self.x, self.y - 1, self.x, self.y  # дерево выше клетки на один тайл
+        return self.x, self.y, self.x, self.y
+
     def draw(self, screen, tile_size, offset_x, offset_y):
         # переводим координаты в пиксели
         px = self.x * tile_size + offset_x
@@ -36,24 +48,67 @@ class Obstacle:
 
         if self.base_img:
             # для деревьев картинка выше клетки (2 тайла по высоте)
-            if self.kind in ("tree-1", "tree-2"):
-                scaled = pg.transform.scale(self.base_img, (tile_size, tile_size * 2))
-                screen.blit(scaled, (int(px), int(py - tile_size)))
+            if self.kind in TREE_KINDS:
+                ATLAS.blit(screen, self.sprite, tile_size, (int(px), int(py - tile_size)))
             else:
                 # для остальных препятствий картинка размером с клетку
-                scaled = pg.transform.scale(self.base_img, (tile_size, tile_size))
-                screen.blit(scaled, (int(px), int(py)))
+                ATLAS.blit(screen, self.sprite, tile_size, (int(px), int(py)))
         else:
             # если нет картинки — рисуем квадрат
             rect = pg.Rect(int(px), int(py), tile_size, tile_size)
             pg.draw.rect(screen, self.color, rect)
 
+    def submit(self, queue, atlas, tile_size, offset_x, offset_y):
+        """Команда очереди отрисовки: дерево в слое юнитов с глубиной по нижней клетке"""
+        px = int(self.x * tile_size + offset_x)
+        py = int((self.y - 1) * tile_size + offset_y)  # дерево выше клетки на один тайл
+        queue.submit_sprite(atlas, self.sprite, (px, py), UNITS, self.y)
+
+
+_obstacle_sprites = None  # тип препятствия -> (картинка, имя в атласе)
+
+
+def _sprites():
+    """
+    Картинки одиночных препятствий и клетки тайлсета гор — в реестр ресурсов и атлас.
+    Регистрируется один раз на процесс при создании первого препятствия, а не в каждом конструкторе.
+    """
+    global _obstacle_sprites
+    if _obstacle_sprites is None:
+        sprites = {}
+        for kind, path in Obstacle.TILE_PATHS.items():
+            image = ASSETS.image(path)
+            height = 2 if kind in TREE_KINDS else 1  # для деревьев картинка выше клетки (2 тайла)
+            sprites[kind] = (image, ATLAS.add(f"obstacle/{kind}", image, tile_size_fn(1, height)))
+        # набор текстур для гор (нарезается один раз в реестре ресурсов)
+        for name, tile in ASSETS.tileset(MOUNTAINS_TILESET, MOUNTAIN_TILES).items():
+            ATLAS.add(MOUNTAIN_SPRITES[name], tile)
+        _obstacle_sprites = sprites
+    return _obstacle_sprites
+
+
+def trees_in_front(obstacles, positions):
+    """
+    Деревья из ObstacleList, верхушка которых закрывает что-то из positions (позиции (x, y) в клетках):
+    дерево стоит ниже по экрану и пересекает спрайт. Сами деревья уже запечены в местность —
+    эти нужно дорисовать поверх юнитов в очереди отрисовки.
+    """
+    found = {}
+    for x, y in positions:
+        # спрайт занимает [x, x+1) × [y, y+1), дерево — [o.x, o.x+1) × [o.y-1, o.y+1)
+        top = math.floor(y)
+        for o in obstacles.query_rect(math.floor(x), top, math.ceil(x), top + 2):
+            if getattr(o, "kind", None) in TREE_KINDS and y < o.y < y + 2 and abs(o.x - x) < 1:
+                found[id(o)] = o
+    return list(found.values())
+
 
 # ---------- Горы с авторезкой 3×3 ----------
 
-def mount_rules(up: bool, down: bool, left: bool, right: bool, textures: dict) -> pg.Surface:
+def mount_rules(up: bool, down: bool, left: bool, right: bool, textures: dict):
     """
     Определяет тип горной текстуры на основе соседей.
+    Возвращает значение textures для нужной клетки тайлсета (поверхность или имя спрайта в атласе).
     Использует битовую маску:
     - Бит 0 (1): гора сверху
     - Бит 1 (2): гора снизу
@@ -83,70 +138,99 @@ def mount_rules(up: bool, down: bool, left: bool, right: bool, textures: dict) -
     return textures.get(rules.get(mnt_state, "center"))  # возвращаем нужную текстуру
 
 
-class MountainGroup:
-    TILESET = None  # набор текстур для гор
+# имя спрайта клетки гор по битовой маске соседей mount_rules (16 вариантов)
+MOUNTAIN_STATE_SPRITES = [mount_rules(not state & 1, not state & 2, not state & 4, not state & 8, MOUNTAIN_SPRITES)
+                          for state in range(16)]
 
-    def __init__(self, cells):
-        self.cells = set(cells)  # множество клеток, занятых горами
-        xs = [x for x, y in cells]
-        ys = [y for x, y in cells]
-        self.min_x, self.max_x = min(xs), max(xs)  # границы по X
-        self.min_y, self.max_y = min(ys), max(ys)  # границы по Y
-
-        # загружаем тайлсет один раз
-        if MountainGroup.TILESET is None:
-            full_image = pg.image.load("assets/images/tiles/mountains.png").convert_alpha()
-            tw, th = full_image.get_width() // 3, full_image.get_height() // 3
-
-            def crop(i, j):
-                rect = pg.Rect(j * tw, i * th, tw, th)
-                return full_image.subsurface(rect)
-
-            MountainGroup.TILESET = {
-                "center": crop(1, 1),
-                "top": crop(0, 1),
-                "bottom": crop(2, 1),
-                "left": crop(1, 0),
-                "right": crop(1, 2),
-                "corner_tl": crop(0, 0),
-                "corner_tr": crop(0, 2),
-                "corner_bl": crop(2, 0),
-                "corner_br": crop(2, 2),
-            }
 
-    def draw(self, screen, tile_size, offset_x, offset_y):
-        # отрисовка каждой клетки гор
-        for (cx, cy) in self.cells:
-            up = (cx, cy - 1) in self.cells
-            down = (cx, cy + 1) in self.cells
-            left = (cx - 1, cy) in self.cells
-            right = (cx + 1, cy) in self.cells
-
-            tile = mount_rules(up, down, left, right, MountainGroup.TILESET)
+class CellGroup:
+    """
+    Группа клеток (гора, озеро): маска занятых клеток внутри ограничивающего прямоугольника.
+    - mask[y - min_y, x - min_x]: клетка (x, y) занята
+    - count: число клеток
+    - covers(x, y): проверка клетки за O(1)
+    - cell_arrays(): массивы координат клеток (x, y)
+    - cells: множество клеток (x, y), собирается при первом обращении
+    Генератор создаёт группы сразу из масок (from_mask), без множеств кортежей.
+    """
 
-            px = cx * tile_size + offset_x
-            py = cy * tile_size + offset_y
-            screen.blit(pg.transform.scale(tile, (tile_size, tile_size)), (px, py))
+    def __init__(self, cells):
+        xy = np.array([tuple(cell) for cell in cells], dtype=np.int64).reshape(-1, 2)
+        min_x, min_y = xy.min(axis=0).tolist()
+        max_x, max_y = xy.max(axis=0).tolist()
+        mask = np.zeros((max_y - min_y + 1, max_x - min_x + 1), dtype=bool)
+        mask[xy[:, 1] - min_y, xy[:, 0] - min_x] = True
+        self._set_mask(mask, min_x, min_y)
+
+    @classmethod
+    def from_mask(cls, mask, min_x, min_y, count=None):
+        """Группа из готовой маски (mask[y - min_y, x - min_x]); count — число клеток, если уже известно"""
+        group = cls.__new__(cls)
+        group._set_mask(mask, min_x, min_y, count)
+        return group
+
+    def _set_mask(self, mask, min_x, min_y, count=None):
+        self.mask = mask                       # занятые клетки в пределах прямоугольника
+        self.min_x, self.min_y = min_x, min_y  # левый верхний угол прямоугольника
+        self.max_x = min_x + mask.shape[1] - 1
+        self.max_y = min_y + mask.shape[0] - 1
+        self.count = int(mask.sum()) if count is None else count  # число клеток
+        self._cells = None                     # множество клеток (собирается по запросу)
+
+    def get_bounds(self):
+        """Ограничивающий прямоугольник группы: (min_x, min_y, max_x, max_y)"""
+        return self.min_x, self.min_y, self.max_x, self.max_y
+
+    def covers(self, x, y):
+        """Занята ли клетка (x, y)"""
+        if self.min_x <= x <= self.max_x and self.min_y <= y <= self.max_y:
+            return bool(self.mask[y - self.min_y, x - self.min_x])
+        return False
+
+    def cell_arrays(self):
+        """Координаты клеток: (xs, ys) — numpy-массивы по строкам маски"""
+        ys, xs = np.nonzero(self.mask)
+        return xs + self.min_x, ys + self.min_y
+
+    @property
+    def cells(self):
+        """Множество клеток (x, y)"""
+        if self._cells is None:
+            xs, ys = self.cell_arrays()
+            self._cells = frozenset(zip(xs.tolist(), ys.tolist()))
+        return self._cells
+
+
+class MountainGroup(CellGroup):
+    def draw(self, screen, tile_size, offset_x, offset_y):
+        _sprites()  # клетки тайлсета гор — в атласе
+        screen_w, screen_h = screen.get_size()
+        atlas = ATLAS.at(tile_size)  # все клетки гор — из одного атласа зума
+
+        # соседи всех клеток сразу — сдвигами маски с пустой рамкой (биты как в mount_rules)
+        padded = np.pad(self.mask, 1)
+        state = (~padded[:-2, 1:-1] * 1 | ~padded[2:, 1:-1] * 2    # нет соседа сверху / снизу
+                 | ~padded[1:-1, :-2] * 4 | ~padded[1:-1, 2:] * 8)  # нет соседа слева / справа
+        ys, xs = np.nonzero(self.mask)
+        px = (xs + self.min_x) * tile_size + offset_x
+        py = (ys + self.min_y) * tile_size + offset_y
+        # клетки вне экрана пропускаем
+        visible = (px < screen_w) & (py < screen_h) & (px + tile_size > 0) & (py + tile_size > 0)
+        states = state[ys[visible], xs[visible]].tolist()
+        for x, y, cell_state in zip(px[visible].tolist(), py[visible].tolist(), states):
+            atlas.blit(screen, MOUNTAIN_STATE_SPRITES[cell_state], (x, y))
 
 
 # ---------- Вода ----------
 
-class WaterGroup:
-    GROUP_IMAGE = None  # общий спрайт воды
-
-    def __init__(self, cells):
-        self.cells = set(cells)  # множество клеток воды
-        xs = [x for x, y in cells]
-        ys = [y for x, y in cells]
-        self.min_x, self.max_x = min(xs), max(xs)
-        self.min_y, self.max_y = min(ys), max(ys)
-
-        # загружаем картинку воды один раз
-        if WaterGroup.GROUP_IMAGE is None:
-            WaterGroup.GROUP_IMAGE = pg.image.load("assets/images/tiles/see.png").convert_alpha()
-        self.original_image = WaterGroup.GROUP_IMAGE
+class WaterGroup(CellGroup):
+    @property
+    def original_image(self):
+        """Общий спрайт воды из реестра ресурсов"""
+        return ASSETS.image(WATER_IMAGE)
 
-    def draw(self, screen, tile_size, offset_x, offset_y):
+    def build_image(self, tile_size):
+        """Картинка озера под размер клетки tile_size (растянутая и обрезанная по клеткам)"""
         # вычисляем размеры области воды
         w = (self.max_x - self.min_x + 1) * tile_size
         h = (self.max_y - self.min_y + 1) * tile_size
@@ -161,6 +245,11 @@ class WaterGroup:
 
         # применяем маску к картинке
         stretched.blit(mask, (0, 0), special_flags=pg.BLEND_RGBA_MULT)
+        return stretched
+
+    def draw(self, screen, tile_size, offset_x, offset_y):
+        # картинка строится один раз на каждый размер клетки и хранится в общем кэше
+        stretched = SURFACE_CACHE.get(self, "water", tile_size, lambda: self.build_image(tile_size))
 
         # отрисовываем воду на экране
         px = self.min_x * tile_size + offset_x
@@ -172,9 +261,18 @@ class WaterGroup:
 
 def is_blocked(x, y, obstacles):
     # проверка: занята ли клетка препятствием
+    if obstacles is None:
+        return False
+
+    # быстрый путь: список с сеткой занятости (ObstacleList) — O(1)
+    grid = getattr(obstacles, "grid", None)
+    if grid is not None:
+        return grid.is_blocked(x, y)
+
+    # медленный путь: обычный список — линейный перебор
     return any(
         (hasattr(o, "x") and o.x == x and o.y == y) or   # одиночный объект
-        (hasattr(o, "cells") and (x, y) in o.cells)      # группа клеток (горы, вода)
+        (hasattr(o, "covers") and o.covers(x, y))        # группа клеток (горы, вода)
         for o in obstacles
     )
 
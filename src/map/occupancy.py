@@ -0,0 +1,405 @@
+import zlib  # сжатие массивов сетки для кэша миров
+from array import array  # компактный массив счётчиков
+
+import numpy as np  # разметка клеток групп по маскам и пачек одиночных препятствий
+
+from src.map.obstacles import MountainGroup, WaterGroup  # группы клеток (горы, вода)
+
+# ---------- Типы клеток в сетке занятости ----------
+
+FREE = 0      # клетка свободна
+TREE = 1      # дерево
+BUSH = 2      # куст
+MOUNTAIN = 3  # гора
+WATER = 4     # вода
+OTHER = 5     # препятствие неизвестного типа
+
+SINGLE_KINDS = {"tree-1": TREE, "tree-2": TREE, "bush": BUSH}  # вид одиночного препятствия -> тип клетки
+
+
+def obstacle_kind(obstacle):
+    """Возвращает код типа клетки для препятствия."""
+    if isinstance(obstacle, MountainGroup):
+        return MOUNTAIN
+    if isinstance(obstacle, WaterGroup):
+        return WATER
+    return SINGLE_KINDS.get(getattr(obstacle, "kind", None), OTHER)
+
+
+def obstacle_covers(obstacle, x, y):
+    """Занимает ли препятствие клетку (x, y)."""
+    if hasattr(obstacle, "x"):  # одиночный объект
+        return obstacle.x == x and obstacle.y == y
+    return obstacle.covers(x, y)  # группа клеток (горы, вода)
+
+
+class OccupancyGrid:
+    """
+    Плотная сетка занятости поверх квадрата [-radius, radius] × [-radius, radius].
+    - kinds: тип клетки (FREE, TREE, BUSH, MOUNTAIN, WATER, OTHER), 1 байт на клетку
+    - counts: сколько препятствий покрывают клетку (горы и озёра могут пересекаться)
+    Клетки за пределами карты хранятся в небольшом словаре.
+    """
+
+    def __init__(self, radius):
+        self.radius = radius                # радиус карты в клетках
+        self.size = 2 * radius + 1          # сторона квадрата в клетках
+        cells_total = self.size * self.size
+        self.kinds = bytearray(cells_total)        # тип клетки
+        self.counts = array("H", bytes(2 * cells_total))  # число препятствий в клетке
+        self.outside = {}                   # (x, y) -> [count, kind] для клеток вне карты
+        # numpy-виды (size × size) на те же байты — для разметки групп и пачек препятствий
+        self.kinds_view = np.frombuffer(self.kinds, dtype=np.uint8).reshape(self.size, self.size)
+        self.counts_view = np.frombuffer(self.counts, dtype=np.uint16).reshape(self.size, self.size)
+
+    def _index(self, x, y):
+        """Индекс клетки в плоском массиве или -1, если клетка вне сетки."""
+        gx = x + self.radius
+        gy = y + self.radius
+        if 0 <= gx < self.size and 0 <= gy < self.size:
+            return gy * self.size + gx
+        return -1
+
+    def is_blocked(self, x, y):
+        """Проверка занятости клетки за O(1)."""
+        ix, iy = int(x), int(y)
+        if ix != x or iy != y:
+            return False  # дробные координаты не совпадают ни с одной клеткой
+        gx = ix + self.radius
+        gy = iy + self.radius
+        if 0 <= gx < self.size and 0 <= gy < self.size:
+            return self.kinds[gy * self.size + gx] != FREE
+        return (ix, iy) in self.outside
+
+    def kind_at(self, x, y):
+        """Тип клетки (FREE, если клетка свободна)."""
+        index = self._index(x, y)
+        if index >= 0:
+            return self.kinds[index]
+        entry = self.outside.get((x, y))
+        return entry[1] if entry else FREE
+
+    def add_cell(self, x, y, kind):
+        """Отмечает клетку как занятую препятствием типа kind."""
+        index = self._index(x, y)
+        if index >= 0:
+            self.counts[index] += 1
+            self.kinds[index] = kind  # последнее добавленное препятствие задаёт тип
+        else:
+            entry = self.outside.setdefault((x, y), [0, kind])
+            entry[0] += 1
+            entry[1] = kind
+
+    def remove_cell(self, x, y):
+        """
+        Снимает одно препятствие с клетки.
+        Возвращает True, если клетка осталась занята другим препятствием.
+        """
+        index = self._index(x, y)
+        if index >= 0:
+            if self.counts[index] == 0:
+                return False
+            self.counts[index] -= 1
+            if self.counts[index] == 0:
+                self.kinds[index] = FREE
+                return False
+            return True
+
+        entry = self.outside.get((x, y))
+        if entry is None:
+            return False
+        entry[0] -= 1
+        if entry[0] <= 0:
+            del self.outside[(x, y)]
+            return False
+        return True
+
+    def set_kind(self, x, y, kind):
+        """Перезаписывает тип уже занятой клетки."""
+        index = self._index(x, y)
+        if index >= 0:
+            self.kinds[index] = kind
+        elif (x, y) in self.outside:
+            self.outside[(x, y)][1] = kind
+
+    def add(self, obstacle):
+        """Добавляет все клетки препятствия в сетку."""
+        kind = obstacle_kind(obstacle)
+        if hasattr(obstacle, "mask"):  # группа клеток (горы, вода) — разметка по маске
+            self._add_group(obstacle, kind)
+        else:
+            self.add_cell(obstacle.x, obstacle.y, kind)
+
+    def add_cells(self, xs, ys, kinds):
+        """
+        Пачка одиночных препятствий (numpy-массивы координат и типов) в порядке добавления.
+        Если клетка встречается несколько раз, тип задаёт последнее препятствие — как при add по одному.
+        """
+        gx, gy = xs + self.radius, ys + self.radius
+        inside = (gx >= 0) & (gx < self.size) & (gy >= 0) & (gy < self.size)
+        index = gy[inside] * self.size + gx[inside]
+        np.add.at(self.counts_view.reshape(-1), index, 1)
+        last = len(index) - 1 - np.unique(index[::-1], return_index=True)[1]  # последнее вхождение клетки
+        self.kinds_view.reshape(-1)[index[last]] = kinds[inside][last]
+        for x, y, kind in zip(xs[~inside].tolist(), ys[~inside].tolist(), kinds[~inside].tolist()):
+            self.add_cell(x, y, kind)
+
+    def _group_window(self, group):
+        # часть маски группы в пределах сетки и соответствующие окна kinds/counts;
+        # второй результат — выходит ли группа за край сетки
+        h, w = group.mask.shape
+        gx, gy = group.min_x + self.radius, group.min_y + self.radius
+        x0, y0 = max(gx, 0), max(gy, 0)
+        x1, y1 = min(gx + w, self.size), min(gy + h, self.size)
+        clipped = (x0, y0, x1, y1) != (gx, gy, gx + w, gy + h)
+        if x0 >= x1 or y0 >= y1:
+            return None, clipped
+        mask = group.mask[y0 - gy:y1 - gy, x0 - gx:x1 - gx]
+        return (mask, self.kinds_view[y0:y1, x0:x1], self.counts_view[y0:y1, x0:x1], x0, y0), clipped
+
+    def _outside_cells(self, group):
+        # клетки группы за краем сетки (генератор их отбрасывает — бывают только у загруженных групп)
+        xs, ys = group.cell_arrays()
+        gx, gy = xs + self.radius, ys + self.radius
+        outside = (gx < 0) | (gx >= self.size) | (gy < 0) | (gy >= self.size)
+        return zip(xs[outside].tolist(), ys[outside].tolist())
+
+    def _add_group(self, group, kind):
+        window, clipped = self._group_window(group)
+        if window is not None:
+            mask, kinds, counts = window[:3]
+            counts[mask] += 1  # окна — виды на сетку, запись идёт прямо в неё
+            kinds[mask] = kind
+        if clipped:
+            for x, y in self._outside_cells(group):
+                self.add_cell(x, y, kind)
+
+    def remove(self, obstacle):
+        """Убирает клетки препятствия из сетки. Возвращает клетки, занятые кем-то ещё."""
+        if not hasattr(obstacle, "mask"):
+            return [(obstacle.x, obstacle.y)] if self.remove_cell(obstacle.x, obstacle.y) else []
+
+        shared = []
+        window, clipped = self._group_window(obstacle)
+        if window is not None:
+            mask, kinds, counts, x0, y0 = window
+            hit = mask & (counts > 0)
+            counts[hit] -= 1
+            kinds[hit & (counts == 0)] = FREE
+            ys, xs = np.nonzero(hit & (counts > 0))
+            shared = list(zip((xs + x0 - self.radius).tolist(), (ys + y0 - self.radius).tolist()))
+        if clipped:
+            for x, y in self._outside_cells(obstacle):
+                if self.remove_cell(x, y):
+                    shared.append((x, y))
+        return shared
+
+    def state(self):
+        """Содержимое сетки для кэша миров: сжатые kinds и counts (почти целиком нули) и клетки вне карты."""
+        return (zlib.compress(self.kinds, 1), zlib.compress(self.counts.tobytes(), 1),
+                [(x, y, count, kind) for (x, y), (count, kind) in self.outside.items()])
+
+    @classmethod
+    def from_state(cls, radius, state):
+        """Сетка из state() — без разметки препятствий заново."""
+        grid = cls(radius)
+        kinds, counts, outside = state
+        grid.kinds_view.reshape(-1)[:] = np.frombuffer(zlib.decompress(kinds), dtype=np.uint8)
+        grid.counts_view.reshape(-1)[:] = np.frombuffer(zlib.decompress(counts), dtype=np.uint16)
+        grid.outside = {(x, y): [count, kind] for x, y, count, kind in outside}
+        return grid
+
+    def clear(self):
+        """Полностью очищает сетку."""
+        # оба массива очищаются на месте: внешние ссылки и numpy-виды на них остаются верными
+        self.kinds_view[:] = FREE
+        self.counts_view[:] = 0
+        self.outside.clear()
+
+
+BUCKET_SIZE = 16  # сторона корзины пространственного индекса (в клетках)
+
+
+class ObstacleList(list):
+    """
+    Список препятствий с сеткой занятости.
+    Ведёт себя как обычный list, но при добавлении и удалении препятствий
+    синхронно обновляет OccupancyGrid, поэтому is_blocked/is_area_free работают за O(1).
+    Дополнительно раскладывает препятствия по корзинам BUCKET_SIZE × BUCKET_SIZE,
+    чтобы query_rect отдавал только видимые объекты, и оповещает подписчиков
+    (например, TerrainLayer) о каждом добавленном или удалённом препятствии.
+    """
+
+    def __init__(self, radius, obstacles=(), grid=None):
+        """grid — уже размеченная сетка этих же препятствий (кэш миров): разметка пропускается."""
+        super().__init__()
+        self.grid = grid if grid is not None else OccupancyGrid(radius)  # сетка занятости
+        self._buckets = {}                 # (bx, by) -> список препятствий
+        self._order = {}                   # id(препятствия) -> порядковый номер добавления
+        self._counter = 0                  # счётчик добавлений (порядок отрисовки)
+        self._listeners = []               # подписчики на изменения: fn(obstacle)
+        if grid is None:
+            self.extend(obstacles)
+        else:
+            obstacles = list(obstacles)
+            super().extend(obstacles)
+            self._index(obstacles)
+
+    def add_listener(self, callback):
+        """Подписка на изменения списка: callback(obstacle) при добавлении и удалении."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Отписка от изменений списка."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # --- пространственный индекс ---
+
+    @staticmethod
+    def _bucket_range(bounds):
+        min_x, min_y, max_x, max_y = bounds
+        for bx in range(min_x // BUCKET_SIZE, max_x // BUCKET_SIZE + 1):
+            for by in range(min_y // BUCKET_SIZE, max_y // BUCKET_SIZE + 1):
+                yield bx, by
+
+    def query_rect(self, min_x, min_y, max_x, max_y):
+        """Препятствия, пересекающие прямоугольник клеток, в порядке добавления."""
+        found = {}
+        for key in self._bucket_range((min_x, min_y, max_x, max_y)):
+            for obstacle in self._buckets.get(key, ()):
+                found[id(obstacle)] = obstacle
+
+        result = []
+        for obstacle in found.values():
+            o_min_x, o_min_y, o_max_x, o_max_y = obstacle.get_bounds()
+            if o_max_x >= min_x and o_min_x <= max_x and o_max_y >= min_y and o_min_y <= max_y:
+                result.append(obstacle)
+        result.sort(key=lambda o: self._order[id(o)])
+        return result
+
+    # --- синхронизация сетки ---
+
+    def _on_add(self, obstacle):
+        self.grid.add(obstacle)
+        self._index([obstacle])
+        for callback in self._listeners:
+            callback(obstacle)
+
+    def _index(self, obstacles):
+        # порядковые номера и корзины пространственного индекса
+        order, buckets, counter = self._order, self._buckets, self._counter
+        for obstacle in obstacles:
+            order[id(obstacle)] = counter
+            counter += 1
+            min_x, min_y, max_x, max_y = obstacle.get_bounds()
+            bx, by = min_x // BUCKET_SIZE, min_y // BUCKET_SIZE
+            if bx == max_x // BUCKET_SIZE and by == max_y // BUCKET_SIZE:
+                # препятствие в одной корзине (куст, почти любое дерево) — без перебора диапазона
+                bucket = buckets.get((bx, by))
+                if bucket is None:
+                    buckets[(bx, by)] = [obstacle]
+                else:
+                    bucket.append(obstacle)
+            else:
+                for key in self._bucket_range((min_x, min_y, max_x, max_y)):
+                    buckets.setdefault(key, []).append(obstacle)
+        self._counter = counter
+
+    def _add_singles(self, singles):
+        # пачка одиночных препятствий — в сетку одним векторным проходом
+        if singles:
+            n = len(singles)
+            self.grid.add_cells(np.fromiter((o.x for o in singles), dtype=np.int64, count=n),
+                                np.fromiter((o.y for o in singles), dtype=np.int64, count=n),
+                                np.fromiter((SINGLE_KINDS.get(getattr(o, "kind", None), OTHER) for o in singles),
+                                            dtype=np.uint8, count=n))
+
+    def _on_remove(self, obstacle):
+        self._order.pop(id(obstacle), None)
+        for key in self._bucket_range(obstacle.get_bounds()):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket[:] = [o for o in bucket if o is not obstacle]
+                if not bucket:
+                    del self._buckets[key]
+        for callback in self._listeners:
+            callback(obstacle)
+
+        # клетки, которые покрывает ещё одно препятствие (например, гора поверх озера):
+        # тип клетки задаёт последнее добавленное из оставшихся — ищем его только среди соседей по корзинам
+        for (x, y) in self.grid.remove(obstacle):
+            for other in reversed(self.query_rect(x, y, x, y)):
+                if obstacle_covers(other, x, y):
+                    self.grid.set_kind(x, y, obstacle_kind(other))
+                    break
+
+    # --- методы list ---
+
+    def append(self, obstacle):
+        super().append(obstacle)
+        self._on_add(obstacle)
+
+    def insert(self, index, obstacle):
+        super().insert(index, obstacle)
+        self._on_add(obstacle)
+
+    def extend(self, obstacles):
+        """
+        Добавление пачкой (генерация мира, загрузка): одиночные препятствия между группами
+        размечаются в сетке векторно, порядок добавления и тип общих клеток — как при append по одному.
+        """
+        obstacles = list(obstacles)
+        super().extend(obstacles)
+        singles = []
+        for obstacle in obstacles:
+            if hasattr(obstacle, "mask"):  # группа: сначала одиночные препятствия перед ней
+                self._add_singles(singles)
+                singles = []
+                self.grid.add(obstacle)
+            else:
+                singles.append(obstacle)
+        self._add_singles(singles)
+        self._index(obstacles)
+        for obstacle in obstacles:
+            for callback in self._listeners:
+                callback(obstacle)
+
+    def __iadd__(self, obstacles):
+        self.extend(obstacles)
+        return self
+
+    def remove(self, obstacle):
+        super().remove(obstacle)
+        self._on_remove(obstacle)
+
+    def pop(self, index=-1):
+        obstacle = super().pop(index)
+        self._on_remove(obstacle)
+        return obstacle
+
+    def clear(self):
+        removed = list(self)
+        super().clear()
+        self.grid.clear()
+        self._buckets.clear()
+        self._order.clear()
+        for obstacle in removed:
+            for callback in self._listeners:
+                callback(obstacle)
+
+    def __setitem__(self, index, value):
+        old = self[index]
+        if isinstance(index, slice):
+            value = list(value)
+        super().__setitem__(index, value)
+        for obstacle in (old if isinstance(index, slice) else (old,)):
+            self._on_remove(obstacle)
+        for obstacle in (value if isinstance(index, slice) else (value,)):
+            self._on_add(obstacle)
+
+    def __delitem__(self, index):
+        old = self[index]
+        super().__delitem__(index)
+        for obstacle in (old if isinstance(index, slice) else (old,)):
+            self._on_remove(obstacle)
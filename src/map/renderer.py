@@ -1,5 +1,8 @@
 import pygame as pg  # библиотека pygame для работы с графикой
 
+from src.map.camera import visible_tile_range  # видимый прямоугольник клеток
+from src.systems.surface_cache import scale  # масштабирование через общий кэш
+
 def box_to_pixel(x, y, size):
     # Прямая сетка: каждый тайл имеет размер size × size
     px = x * size  # перевод координаты X из клеток в пиксели
@@ -7,13 +10,23 @@ def box_to_pixel(x, y, size):
     return px, py  # возвращаем координаты в пикселях
 
 def draw_map(screen, boxmap, size=40, offset_x=0, offset_y=0):
-    # отрисовка всей карты на экране
-    for (x, y), tile_surface in boxmap.tiles.items():  # перебираем все клетки карты
-        px, py = box_to_pixel(x, y, size)  # переводим координаты клетки в пиксели
-        px += offset_x  # смещение камеры по X
-        py += offset_y  # смещение камеры по Y
+    # отрисовка видимой части карты на экране
+    screen_w, screen_h = screen.get_size()
+    min_x, min_y, max_x, max_y = visible_tile_range(screen_w, screen_h, size, offset_x, offset_y)
+
+    # ограничиваем видимый прямоугольник границами карты
+    min_x, max_x = max(min_x, -boxmap.radius), min(max_x, boxmap.radius)
+    min_y, max_y = max(min_y, -boxmap.radius), min(max_y, boxmap.radius)
+
+    # палитра масштабируется один раз на вызов, клетки хранят только номер тайла
+    store = boxmap.tile_store
+    scaled = [scale(tile, (size, size)) for tile in store.palette]
+    tile_id = store.tile_id
+    for x in range(min_x, max_x + 1):  # перебираем только видимые клетки
+        for y in range(min_y, max_y + 1):
+            px, py = box_to_pixel(x, y, size)  # переводим координаты клетки в пиксели
+            px += offset_x  # смещение камеры по X
+            py += offset_y  # смещение камеры по Y
 
-        # Масштабируем тайл под текущий размер клетки
-        scaled_tile = pg.transform.scale(tile_surface, (size, size))
-        # рисуем тайл на экране
-        screen.blit(scaled_tile, (int(px), int(py)))
+            # рисуем тайл на экране (масштабированный тайл — из кэша)
+            screen.blit(scaled[tile_id(x, y)], (int(px), int(py)))
@@ -0,0 +1,132 @@
+from collections import OrderedDict  # упорядоченный словарь для LRU
+
+import pygame as pg  # библиотека pygame для работы с графикой
+
+from src import settings  # цвет фона
+from src.map.renderer import draw_map  # отрисовка клеток карты
+from src.systems.profiler import PROFILER  # счётчики кадра
+
+CHUNK_PIXELS = 512  # примерный размер чанка в пикселях (сторона квадрата)
+MAX_CHUNK_BYTES = 96 * 1024 * 1024  # предел памяти под запечённые чанки (96 МБ)
+
+
+class TerrainLayer:
+    """
+    Статический слой местности, запечённый в чанки.
+    Трава, горы (с авторезкой mount_rules), озёра, деревья и кусты во время игры
+    не меняются, поэтому каждый чанк рисуется один раз на уровень зума,
+    а каждый кадр на экран выводятся только видимые чанки (несколько крупных blit).
+    - chunk_tiles: сторона чанка в клетках (зависит от зума, ~CHUNK_PIXELS пикселей)
+    - при добавлении/удалении препятствия пересобираются только затронутые чанки
+    - давно не видимые чанки вытесняются по LRU в пределах max_bytes
+    """
+
+    def __init__(self, box_map, obstacles, chunk_pixels=CHUNK_PIXELS, max_bytes=MAX_CHUNK_BYTES):
+        self.box_map = box_map          # карта (клетки травы)
+        self.obstacles = obstacles      # препятствия (ObstacleList или обычный список)
+        self.chunk_pixels = chunk_pixels
+        self.max_bytes = max_bytes      # предел памяти под чанки
+        self.tile_size = None           # зум, под который запечены чанки
+        self.chunk_tiles = 1            # сторона чанка в клетках
+        self.chunks = OrderedDict()     # (cx, cy) -> запечённая поверхность (порядок LRU)
+        self.baked = 0                  # сколько чанков было запечено (для профилирования)
+
+        # подписываемся на изменения препятствий, чтобы сбрасывать только нужные чанки
+        if hasattr(obstacles, "add_listener"):
+            obstacles.add_listener(self.on_obstacle_changed)
+
+    # --- зум и координаты ---
+
+    def _set_tile_size(self, tile_size):
+        if tile_size == self.tile_size:
+            return
+        # новый уровень зума: все чанки будут запечены заново по мере появления на экране
+        self.tile_size = tile_size
+        self.chunk_tiles = max(1, self.chunk_pixels // tile_size)
+        self.chunks.clear()
+
+    def _chunk_range(self, min_x, min_y, max_x, max_y):
+        """Чанки, покрывающие прямоугольник клеток: (min_cx, min_cy, max_cx, max_cy)"""
+        n = self.chunk_tiles
+        return min_x // n, min_y // n, max_x // n, max_y // n
+
+    # --- запекание ---
+
+    def _obstacles_in(self, min_x, min_y, max_x, max_y):
+        if hasattr(self.obstacles, "query_rect"):
+            return self.obstacles.query_rect(min_x, min_y, max_x, max_y)
+        result = []
+        for o in self.obstacles:
+            o_min_x, o_min_y, o_max_x, o_max_y = o.get_bounds()
+            if o_max_x >= min_x and o_min_x <= max_x and o_max_y >= min_y and o_min_y <= max_y:
+                result.append(o)
+        return result
+
+    def bake_chunk(self, cx, cy):
+        """Рисует чанк (cx, cy) в отдельную поверхность"""
+        n, size = self.chunk_tiles, self.tile_size
+        surface = pg.Surface((n * size, n * size))
+        if pg.display.get_surface() is not None:
+            surface = surface.convert()  # формат экрана — быстрый blit
+        surface.fill(settings.BACKGROUND_COLOR)
+
+        # смещение так, чтобы левый верхний угол чанка оказался в (0, 0)
+        x0, y0 = cx * n, cy * n
+        offset_x, offset_y = -x0 * size, -y0 * size
+
+        draw_map(surface, self.box_map, size=size, offset_x=offset_x, offset_y=offset_y)
+        for obs in self._obstacles_in(x0, y0, x0 + n - 1, y0 + n - 1):
+            obs.draw(surface, size, offset_x, offset_y)
+
+        self.baked += 1
+        return surface
+
+    # --- инвалидация ---
+
+    def invalidate_bounds(self, bounds):
+        """Сбрасывает чанки, пересекающие прямоугольник клеток (min_x, min_y, max_x, max_y)"""
+        if self.tile_size is None:
+            return
+        min_cx, min_cy, max_cx, max_cy = self._chunk_range(*bounds)
+        for key in list(self.chunks):
+            if min_cx <= key[0] <= max_cx and min_cy <= key[1] <= max_cy:
+                del self.chunks[key]
+
+    def invalidate_all(self):
+        """Сбрасывает все чанки (например, после перегенерации карты)"""
+        self.chunks.clear()
+
+    def on_obstacle_changed(self, obstacle):
+        # препятствие добавлено или удалено — пересобираем только его область
+        self.invalidate_bounds(obstacle.get_bounds())
+
+    # --- отрисовка ---
+
+    def draw(self, screen, camera):
+        """Выводит на экран видимые чанки"""
+        self._set_tile_size(camera.tile_size)
+        n, size, radius = self.chunk_tiles, self.tile_size, self.box_map.radius
+
+        min_cx, min_cy, max_cx, max_cy = self._chunk_range(*camera.visible_tiles())
+        # чанки за пределами карты не рисуем
+        map_min, map_max = -radius // n, radius // n
+        min_cx, max_cx = max(min_cx, map_min), min(max_cx, map_max)
+        min_cy, max_cy = max(min_cy, map_min), min(max_cy, map_max)
+
+        visible = 0
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk is None:
+                    chunk = self.chunks[(cx, cy)] = self.bake_chunk(cx, cy)
+                else:
+                    self.chunks.move_to_end((cx, cy))  # чанк снова «свежий»
+                screen.blit(chunk, (int(cx * n * size + camera.offset_x),
+                                    int(cy * n * size + camera.offset_y)))
+                visible += 1
+        PROFILER.count("blits", visible)
+
+        # вытесняем давно не видимые чанки, чтобы память зависела от экрана, а не от карты
+        chunk_bytes = (n * size) ** 2 * 4
+        while len(self.chunks) > visible and len(self.chunks) * chunk_bytes > self.max_bytes:
+            self.chunks.popitem(last=False)
@@ -0,0 +1,115 @@
+from array import array  # компактные массивы номеров тайлов
+from collections.abc import Mapping  # интерфейс словаря для BoxMap.tiles
+
+CHUNK_SIZE = 64  # сторона чанка в клетках
+
+
+class TileChunks:
+    """
+    Хранилище номеров тайлов карты: квадрат [-radius, radius]² разбит на чанки CHUNK_SIZE²,
+    каждый чанк — компактный массив номеров (1 байт на клетку, 2 байта при палитре > 256).
+    - palette: список поверхностей, номер тайла — индекс в палитре
+    - default_id: номер тайла клеток, в которые ещё ничего не записывали
+    Чанк создаётся только при первой записи, поэтому однородная карта не занимает памяти.
+    """
+
+    def __init__(self, radius, palette, default_id=0, chunk_size=CHUNK_SIZE):
+        self.radius = radius              # радиус карты в клетках
+        self.palette = list(palette)      # номер тайла -> поверхность
+        self.default_id = default_id      # номер тайла по умолчанию
+        self.chunk_size = chunk_size      # сторона чанка в клетках
+        self.typecode = "B" if len(self.palette) <= 256 else "H"
+        self.chunks = {}                  # (cx, cy) -> array номеров тайлов
+
+    def _locate(self, x, y):
+        # чанк и индекс клетки внутри него (координаты отсчитываются от угла карты)
+        gx, gy = x + self.radius, y + self.radius
+        n = self.chunk_size
+        return (gx // n, gy // n), (gy % n) * n + gx % n
+
+    def contains(self, x, y):
+        """Клетка лежит внутри карты"""
+        return abs(x) <= self.radius and abs(y) <= self.radius
+
+    def tile_id(self, x, y):
+        """Номер тайла в клетке (клетка должна лежать внутри карты)"""
+        key, index = self._locate(x, y)
+        chunk = self.chunks.get(key)
+        return self.default_id if chunk is None else chunk[index]
+
+    def set_tile_id(self, x, y, tile_id):
+        """Записывает номер тайла (чанк создаётся при первой записи)"""
+        if not self.contains(x, y):
+            raise KeyError((x, y))
+        key, index = self._locate(x, y)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if tile_id == self.default_id:
+                return  # чанк по-прежнему однородный
+            chunk = self.chunks[key] = array(self.typecode, [self.default_id]) * (self.chunk_size ** 2)
+        chunk[index] = tile_id
+
+    def palette_id(self, surface):
+        """Номер поверхности в палитре (новая поверхность добавляется в конец)"""
+        for tile_id, existing in enumerate(self.palette):
+            if existing is surface:
+                return tile_id
+        self.palette.append(surface)
+        if len(self.palette) > 256 and self.typecode == "B":
+            # палитра переросла байт — расширяем массивы до 2 байт на клетку
+            self.typecode = "H"
+            self.chunks = {key: array("H", chunk) for key, chunk in self.chunks.items()}
+        return len(self.palette) - 1
+
+    def fill(self, tile_id):
+        """Заполняет всю карту одним тайлом (чанки освобождаются)"""
+        self.default_id = tile_id
+        self.chunks.clear()
+
+    def memory_bytes(self):
+        """Сколько байт занимают созданные чанки"""
+        return sum(chunk.itemsize * len(chunk) for chunk in self.chunks.values())
+
+
+class TileView(Mapping):
+    """
+    Представление TileChunks в виде словаря (x, y) -> поверхность,
+    как раньше был устроен BoxMap.tiles. Клетки вне карты в словаре отсутствуют.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def __getitem__(self, cell):
+        x, y = cell
+        store = self.store
+        if not store.contains(x, y):
+            raise KeyError(cell)
+        return store.palette[store.tile_id(x, y)]
+
+    def get(self, cell, default=None):
+        x, y = cell
+        store = self.store
+        if not store.contains(x, y):
+            return default
+        return store.palette[store.tile_id(x, y)]
+
+    def __setitem__(self, cell, surface):
+        x, y = cell
+        self.store.set_tile_id(x, y, self.store.palette_id(surface))
+
+    def __contains__(self, cell):
+        try:
+            x, y = cell
+        except (TypeError, ValueError):
+            return False
+        return self.store.contains(x, y)
+
+    def __len__(self):
+        return (2 * self.store.radius + 1) ** 2
+
+    def __iter__(self):
+        radius = self.store.radius
+        for x in range(-radius, radius + 1):
+            for y in range(-radius, radius + 1):
+                yield x, y
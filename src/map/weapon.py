@@ -1,12 +1,17 @@
 import pygame as pg  # библиотека pygame для работы с графикой
 
-# Кэш путей и изображений оружия
+from src.map.obstacles import is_blocked  # проверка занятости клетки
+from src.systems.assets import ASSETS  # общий реестр ресурсов
+from src.systems.atlas import ATLAS  # атласы статичной графики по зумам
+from src.systems.render_queue import GROUND, RenderQueue  # очередь отрисовки
+from src.systems.surface_cache import scale  # масштабирование через общий кэш
+
+# Пути к изображениям оружия
 WEAPON_PATHS = {
     "axe": "assets/images/weapons/axe.png",    # путь к картинке топора
     "sword": "assets/images/weapons/sword.png",# путь к картинке меча
     "bow": "assets/images/weapons/bow.png",    # путь к картинке лука
 }
-_WEAPON_IMAGES_CACHE = {}  # кэш загруженных изображений оружия
 
 class Weapon:
     """
@@ -23,29 +28,25 @@ class Weapon:
         self.picked = False     # флаг: подобрано ли оружие
         self.image = self._load_image(kind)  # загружаем картинку оружия
 
-    def _load_image(self, kind: str) -> pg.Surface:
-        """Ленивая загрузка и кэширование PNG-иконки оружия"""
-        if kind in _WEAPON_IMAGES_CACHE:  # если картинка уже загружена
-            return _WEAPON_IMAGES_CACHE[kind]
+        # спрайты в атласе: на карте, в руке и в руке зеркально (при взгляде влево)
+        self.sprite = ATLAS.add(f"weapon/{kind}", self.image)
+        equipped = lambda tile_size: (tile_size // 3, tile_size // 3)  # в руке — в 3 раза меньше
+        self.equipped_sprite = ATLAS.add(f"weapon/{kind}/equipped", self.image, equipped)
+        self.flipped_sprite = ATLAS.add(f"weapon/{kind}/equipped/flipped",
+                                        pg.transform.flip(self.image, True, False), equipped)
 
+    def _load_image(self, kind: str) -> pg.Surface:
+        """Иконка оружия из общего реестра ресурсов (загружается один раз)"""
         path = WEAPON_PATHS.get(kind)  # получаем путь к картинке по типу
         if path:
             try:
-                img = pg.image.load(path).convert_alpha()  # загружаем картинку
-                _WEAPON_IMAGES_CACHE[kind] = img           # сохраняем в кэш
-                return img
+                return ASSETS.image(path)  # загружаем картинку
             except Exception:
-                # fallback: простая заливка, если файла нет
-                fallback = pg.Surface((40, 40), pg.SRCALPHA)  # создаём пустую поверхность
-                pg.draw.rect(fallback, (200, 200, 0), fallback.get_rect())  # рисуем жёлтый квадрат
-                _WEAPON_IMAGES_CACHE[kind] = fallback
-                return fallback
+                # fallback: жёлтый квадрат, если файла нет
+                return ASSETS.placeholder(("weapon", kind), (40, 40), (200, 200, 0))
 
-        # fallback если тип неизвестен
-        unknown = pg.Surface((40, 40), pg.SRCALPHA)  # создаём пустую поверхность
-        pg.draw.rect(unknown, (180, 180, 180), unknown.get_rect())  # рисуем серый квадрат
-        _WEAPON_IMAGES_CACHE[kind] = unknown
-        return unknown
+        # fallback если тип неизвестен: серый квадрат
+        return ASSETS.placeholder(("weapon", kind), (40, 40), (180, 180, 180))
 
     def get_scaled_image(self, tile_size: int, equipped: bool = False) -> pg.Surface:
         """
@@ -57,15 +58,22 @@ class Weapon:
             size = (tile_size // 3, tile_size // 3)  # уменьшенный размер
         else:
             size = (tile_size, tile_size)            # обычный размер
-        return pg.transform.scale(self.image, size)  # масштабируем картинку
+        return scale(self.image, size)  # масштабируем картинку (с кэшированием)
 
-    def draw(self, screen: pg.Surface, tile_size: int, offset_x: int, offset_y: int):
-        """Отрисовка оружия на карте, если оно не подобрано"""
+    def submit(self, queue: RenderQueue, atlas, tile_size: int, offset_x: int, offset_y: int):
+        """Команда очереди отрисовки: оружие на земле, если оно не подобрано"""
         if self.picked:  # если оружие подобрано — не рисуем
             return
         px = self.x * tile_size + offset_x  # перевод координаты X в пиксели
         py = self.y * tile_size + offset_y  # перевод координаты Y в пиксели
-        screen.blit(self.get_scaled_image(tile_size, equipped=False), (int(px), int(py)))  # рисуем оружие
+        queue.submit_sprite(atlas, self.sprite, (int(px), int(py)), GROUND, self.y)
+
+    def draw(self, screen: pg.Surface, tile_size: int, offset_x: int, offset_y: int):
+        """Отрисовка оружия на карте сразу на screen, если оно не подобрано (в игре — submit)"""
+        if self.picked:
+            return
+        ATLAS.blit(screen, self.sprite, tile_size,
+                   (int(self.x * tile_size + offset_x), int(self.y * tile_size + offset_y)))
 
 def _is_occupied(x: int, y: int, obstacles) -> bool:
     """
@@ -73,12 +81,6 @@ def _is_occupied(x: int, y: int, obstacles) -> bool:
     Поддерживает:
     - объекты с полями x, y (точечные)
     - объекты с набором cells (многоклеточные регионы)
+    Для ObstacleList проверка идёт по сетке занятости за O(1).
     """
-    for o in obstacles:
-        if hasattr(o, "x") and hasattr(o, "y"):  # если объект имеет координаты
-            if o.x == x and o.y == y:            # совпадают с проверяемыми
-                return True
-        elif hasattr(o, "cells"):                # если объект состоит из множества клеток
-            if (x, y) in o.cells:                # проверяем наличие клетки
-                return True
-    return False  # клетка свободна
+    return is_blocked(x, y, obstacles)
@@ -1,121 +1,172 @@
 import pygame as pg  # библиотека pygame для графики
 
-import settings  # модуль с константами, где есть GAME_VERSION и CURRENT_* параметры
+from src import settings  # модуль с константами, где есть GAME_VERSION и CURRENT_* параметры
+from src.systems.asset_cache import ASSET_CACHE  # декодированный фон на диске
+from src.systems.text import TEXT  # общие шрифты и кэш надписей
 
-def render_button(screen, text, center_x, center_y, mouse_pos):
-    # создаём шрифт для кнопки
-    font = pg.font.Font(settings.FONT_PATH, settings.FONT_SIZE_OPTION)
-    temp_surface = font.render(text, True, (0, 0, 0))  # временный рендер текста
-    temp_rect = temp_surface.get_rect(center=(center_x, center_y))  # прямоугольник текста
+BACKGROUND_PATH = "assets/images/ui/background_menu.png"  # фон меню
 
-    # проверка наведения курсора
-    is_hovered = temp_rect.collidepoint(mouse_pos)
-    font.set_bold(is_hovered)  # делаем текст жирным при наведении
-    color = (255, 255, 255) if is_hovered else (200, 200, 200)  # цвет текста
+NORMAL_COLOR = (200, 200, 200)  # цвет пункта меню
+HOVER_COLOR = (255, 255, 255)   # цвет пункта под курсором
 
-    text_surface = font.render(text, True, color)  # финальный рендер текста
-    text_rect = text_surface.get_rect(center=(center_x, center_y))  # прямоугольник текста
-    screen.blit(text_surface, text_rect)  # рисуем текст на экране
 
-    return text, text_rect  # возвращаем текст и его прямоугольник
+def render_text(text, size, color, bold=False):
+    """Надпись шрифтом меню (из общего кэша надписей)"""
+    return TEXT.render(text, size, color, bold=bold, font=settings.FONT_PATH)
 
-def draw_volume_slider(screen, mouse_pos, current_volume):
+
+class Button:
+    """Пункт меню с заранее отрисованными надписями: обычной и под курсором"""
+
+    def __init__(self, text, center_x, center_y):
+        self.text = text
+        self.normal = render_text(text, settings.FONT_SIZE_OPTION, NORMAL_COLOR)
+        self.hover = render_text(text, settings.FONT_SIZE_OPTION, HOVER_COLOR, bold=True)
+        self.rect = self.normal.get_rect(center=(center_x, center_y))  # область наведения и клика
+        self.hover_rect = self.hover.get_rect(center=(center_x, center_y))
+
+    def draw(self, screen, hovered):
+        if hovered:
+            screen.blit(self.hover, self.hover_rect)
+        else:
+            screen.blit(self.normal, self.rect)
+
+
+def _slider_rects(current_volume):
     # Параметры слайдера (в виртуальных координатах)
     slider_x = settings.CURRENT_WIDTH // 2 - 150
     slider_y = 250
     slider_width = 300
     slider_height = 10
-
-    # Прямоугольник трека (фон слайдера)
-    track_rect = pg.Rect(slider_x, slider_y, slider_width, slider_height)
-    pg.draw.rect(screen, (180, 180, 180), track_rect)
+    track_rect = pg.Rect(slider_x, slider_y, slider_width, slider_height)  # трек (фон слайдера)
 
     # Позиция ползунка (knob)
     knob_x = slider_x + int(current_volume * slider_width)
     knob_y = slider_y + slider_height // 2
+    knob_rect = pg.Rect(knob_x - 8, knob_y - 8, 16, 16)
+    return knob_rect, track_rect
 
-    knob_rect = pg.Rect(knob_x - 8, knob_y - 8, 16, 16)  # прямоугольник ползунка
-    pg.draw.rect(screen, (255, 255, 255), knob_rect)     # рисуем ползунок
-
+def draw_volume_slider(screen, current_volume):
+    knob_rect, track_rect = _slider_rects(current_volume)
+    pg.draw.rect(screen, (180, 180, 180), track_rect)  # трек
+    pg.draw.rect(screen, (255, 255, 255), knob_rect)   # рисуем ползунок
     return knob_rect, track_rect  # возвращаем прямоугольники ползунка и трека
 
-def draw_menu(screen, mode="main", submenu=None, current_volume=None):
-    try:
-        # загружаем фон меню
-        background = pg.image.load("assets/images/ui/background_menu.png")
-        background = pg.transform.scale(background, (settings.CURRENT_WIDTH, settings.CURRENT_HEIGHT))
-        screen.blit(background, (0, 0))
-    except:
-        # если нет картинки — заливаем фон цветом
-        screen.fill(settings.BACKGROUND_COLOR)
-
-    font_title = pg.font.Font(settings.FONT_PATH, settings.FONT_SIZE_TITLE)  # шрифт для заголовков
-
-    # --- масштабируем мышь в виртуальные координаты ---
-    screen_w, screen_h = pg.display.get_surface().get_size()
-    scale_x = settings.CURRENT_WIDTH / screen_w
-    scale_y = settings.CURRENT_HEIGHT / screen_h
-    mouse_pos = (int(pg.mouse.get_pos()[0] * scale_x),
-                 int(pg.mouse.get_pos()[1] * scale_y))
-
-    option_rects = []  # список опций меню
-
-    if mode == "main":  # главное меню
-        title_surface = font_title.render("RTS Thesis Project", True, (255, 255, 255))
-        title_rect = title_surface.get_rect(center=(settings.CURRENT_WIDTH // 2, 100))
-        screen.blit(title_surface, title_rect)
-
-        # рисуем все пункты главного меню
-        for i, option in enumerate(settings.MENU_OPTIONS):
-            item = render_button(screen, option, settings.CURRENT_WIDTH // 2, 200 + i * 60, mouse_pos)
-            option_rects.append(item)
-
-    elif mode == "settings":  # меню настроек
-        title_surface = font_title.render("Настройки", True, (255, 255, 255))
-        title_rect = title_surface.get_rect(center=(settings.CURRENT_WIDTH // 2, 60))
-        screen.blit(title_surface, title_rect)
-
-        if submenu is None:  # если подменю не выбрано
-            for i, tab in enumerate(settings.DISPLAY_SETTINGS_MENU):
-                item = render_button(screen, tab, settings.CURRENT_WIDTH // 2, 140 + i * 50, mouse_pos)
-                option_rects.append(item)
-        else:  # если выбрано подменю
-            selected_tab_text = get_tab_text(submenu)
-            if selected_tab_text:
-                font_tab = pg.font.Font(settings.FONT_PATH, settings.FONT_SIZE_OPTION)
-                tab_surface = font_tab.render(selected_tab_text, True, (255, 255, 255))
-                tab_rect = tab_surface.get_rect(center=(settings.CURRENT_WIDTH // 2, 120))
-                screen.blit(tab_surface, tab_rect)
-
-            if submenu == "resolution":  # список разрешений
-                for i, (w, h) in enumerate(settings.RESOLUTIONS):
-                    text = f"{w} x {h}"
-                    item = render_button(screen, text, settings.CURRENT_WIDTH // 2, 220 + i * 30, mouse_pos)
-                    option_rects.append(item)
-
-            elif submenu == "display_mode":  # список режимов окна
-                for i, mode_name in enumerate(settings.DISPLAY_MODES):
-                    item = render_button(screen, mode_name, settings.CURRENT_WIDTH // 2, 220 + i * 40, mouse_pos)
-                    option_rects.append(item)
-
-            elif submenu == "volume":  # регулировка громкости
-                if current_volume is None:
-                    current_volume = settings.CURRENT_VOLUME
-                knob_rect, track_rect = draw_volume_slider(screen, mouse_pos, current_volume)
-                option_rects.append(("volume_slider", knob_rect))
-                option_rects.append(("volume_track", track_rect))
-
-        # кнопка "Назад"
-        item = render_button(screen, "Назад", settings.CURRENT_WIDTH // 2, settings.CURRENT_HEIGHT - 200, mouse_pos)
-        option_rects.append(item)
-
-    # --- Версия игры справа снизу ---
-    font_version = pg.font.Font(settings.FONT_PATH, 20)
-    version_surface = font_version.render(settings.GAME_VERSION, True, (200, 200, 200))
-    version_rect = version_surface.get_rect(bottomright=(settings.CURRENT_WIDTH - 10, settings.CURRENT_HEIGHT - 10))
-    screen.blit(version_surface, version_rect)
-
-    return option_rects  # возвращаем список опций меню
+
+class MenuView:
+    """
+    Меню в retained-режиме: экран меню собирается один раз и перерисовывается,
+    только когда что-то изменилось.
+    - фон масштабируется один раз на разрешение и хранится вместе с заголовком,
+      вкладкой и версией игры в готовом статическом слое страницы
+    - надписи пунктов отрисованы заранее в двух вариантах (обычный и под курсором)
+    - draw() перерисовывает экран, только если сменились страница (режим, подменю, разрешение),
+      наведённый пункт или громкость; иначе экран не трогается
+    """
+
+    def __init__(self):
+        self._backgrounds = {}  # разрешение -> масштабированный фон
+        self._original = None   # исходная картинка фона (читается с диска один раз)
+        self._page_key = None   # (режим, подменю, разрешение) собранной страницы
+        self._static = None     # статический слой страницы
+        self._buttons = []      # пункты страницы
+        self._state = None      # (страница, наведённый пункт, громкость) последней отрисовки
+
+    def invalidate(self):
+        """Следующий draw() перерисует экран (например, после возврата из игры)"""
+        self._state = None
+
+    def _background(self, size):
+        background = self._backgrounds.get(size)
+        if background is None:
+            if self._original is None:
+                try:
+                    self._original = ASSET_CACHE.image(BACKGROUND_PATH, alpha=False)
+                except (pg.error, FileNotFoundError):
+                    self._original = False  # картинки нет — заливаем фон цветом
+            background = pg.Surface(size).convert()
+            if self._original:
+                background.blit(pg.transform.scale(self._original, size), (0, 0))
+            else:
+                background.fill(settings.BACKGROUND_COLOR)
+            self._backgrounds[size] = background
+        return background
+
+    def _build_page(self, mode, submenu, size):
+        # статический слой (фон, заголовок, вкладка, версия) и пункты страницы
+        width, height = size
+        static = self._background(size).copy()
+        buttons = []
+
+        if mode == "main":  # главное меню
+            title_surface = render_text("RTS Thesis Project", settings.FONT_SIZE_TITLE, (255, 255, 255))
+            static.blit(title_surface, title_surface.get_rect(center=(width // 2, 100)))
+            for i, option in enumerate(settings.MENU_OPTIONS):
+                buttons.append(Button(option, width // 2, 200 + i * 60))
+
+        elif mode == "settings":  # меню настроек
+            title_surface = render_text("Настройки", settings.FONT_SIZE_TITLE, (255, 255, 255))
+            static.blit(title_surface, title_surface.get_rect(center=(width // 2, 60)))
+
+            if submenu is None:  # если подменю не выбрано
+                for i, tab in enumerate(settings.DISPLAY_SETTINGS_MENU):
+                    buttons.append(Button(tab, width // 2, 140 + i * 50))
+            else:  # если выбрано подменю
+                selected_tab_text = get_tab_text(submenu)
+                if selected_tab_text:
+                    tab_surface = render_text(selected_tab_text, settings.FONT_SIZE_OPTION, (255, 255, 255))
+                    static.blit(tab_surface, tab_surface.get_rect(center=(width // 2, 120)))
+
+                if submenu == "resolution":  # список разрешений
+                    for i, (w, h) in enumerate(settings.RESOLUTIONS):
+                        buttons.append(Button(f"{w} x {h}", width // 2, 220 + i * 30))
+                elif submenu == "display_mode":  # список режимов окна
+                    for i, mode_name in enumerate(settings.DISPLAY_MODES):
+                        buttons.append(Button(mode_name, width // 2, 220 + i * 40))
+
+            # кнопка "Назад"
+            buttons.append(Button("Назад", width // 2, height - 200))
+
+        # --- Версия игры справа снизу ---
+        version_surface = render_text(settings.GAME_VERSION, 20, (200, 200, 200))
+        static.blit(version_surface, version_surface.get_rect(bottomright=(width - 10, height - 10)))
+
+        self._static, self._buttons = static, buttons
+
+    def draw(self, screen, mode="main", submenu=None, current_volume=None, mouse_pos=(0, 0)):
+        """
+        Рисует меню на screen (виртуальный экран размера CURRENT_WIDTH × CURRENT_HEIGHT),
+        если с прошлого вызова что-то изменилось. mouse_pos — в координатах screen.
+        Возвращает (список (пункт, прямоугольник), экран_изменился).
+        """
+        size = screen.get_size()
+        page_key = (mode, submenu, size)
+        if page_key != self._page_key:
+            self._build_page(mode, submenu, size)
+            self._page_key = page_key
+
+        hovered = next((i for i, b in enumerate(self._buttons) if b.rect.collidepoint(mouse_pos)), None)
+        volume = None
+        if mode == "settings" and submenu == "volume":
+            volume = settings.CURRENT_VOLUME if current_volume is None else current_volume
+
+        option_rects = [(button.text, button.rect) for button in self._buttons]
+        if volume is not None:  # ползунок громкости: прямоугольники для перетаскивания
+            knob_rect, track_rect = _slider_rects(volume)
+            option_rects[-1:-1] = [("volume_slider", knob_rect), ("volume_track", track_rect)]
+
+        state = (page_key, hovered, volume)
+        if state == self._state:
+            return option_rects, False  # ничего не изменилось — экран остаётся прежним
+        self._state = state
+
+        screen.blit(self._static, (0, 0))
+        for i, button in enumerate(self._buttons):
+            button.draw(screen, i == hovered)
+        if volume is not None:
+            draw_volume_slider(screen, volume)
+        return option_rects, True
+
 
 def get_tab_text(submenu):
     # словарь соответствия подменю и текста вкладки
@@ -0,0 +1,93 @@
+"""
+Замер сохранения и загрузки: JSON против двоичного формата (без сжатия, zlib, lzma).
+
+Строит мир через build_world, сохраняет и загружает его каждым способом
+и печатает JSON: размер файла и время записи и чтения.
+
+Запуск из корня проекта:
+    python -m src.save_bench --radius 50 --enemies 10 --seed 1
+    python -m src.save_bench --radius 1000 --repeat 1
+"""
+import argparse  # разбор аргументов командной строки
+import contextlib  # перенаправление служебных сообщений
+import json  # вывод результатов в JSON
+import os  # размеры файлов и переменные окружения SDL
+import sys  # поток вывода
+import tempfile  # каталог для временных сохранений
+import time  # замеры времени
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # без окна
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")  # без звука
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # приветствие pygame испортило бы JSON
+
+from src import settings  # версия игры
+from src.systems.save_format import COMPRESSION  # варианты сжатия двоичного формата
+from src.systems.save_load import export_json, import_json, load_game, save_game  # сохранение и загрузка
+from src.systems.world import build_world  # генерация мира
+
+
+def best_time(fn, repeat):
+    """Лучшее время из repeat запусков fn (секунды)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(radius=50, enemies=10, seed=0, repeat=3):
+    """Сохраняет и загружает один мир всеми форматами. Возвращает словарь с результатами."""
+    with contextlib.redirect_stdout(sys.stderr):  # stdout оставляем только для JSON
+        world = build_world(radius=radius, num_enemies=enemies, seed=seed, cache=None)
+    args = (world.player, world.enemies, world.obstacles)
+
+    formats = {"json": (lambda path: export_json(*args, path=path), import_json)}
+    for compression in COMPRESSION:
+        formats[f"binary-{compression}"] = (
+            lambda path, compression=compression: save_game(*args, path=path, compression=compression),
+            load_game)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(sys.stderr):
+        for name, (save, load) in formats.items():
+            path = os.path.join(directory, name)
+            save_s = best_time(lambda: save(path), repeat)
+            load_s = best_time(lambda: load(path), repeat)
+            results[name] = {"bytes": os.path.getsize(path), "save_s": save_s, "load_s": load_s}
+
+    base = results["json"]
+    for result in results.values():
+        result["size_vs_json"] = result["bytes"] / base["bytes"]
+
+    return {
+        "version": settings.GAME_VERSION,
+        "params": {"radius": radius, "enemies": enemies, "seed": seed, "repeat": repeat},
+        "obstacles": len(world.obstacles),
+        "cells": sum(o.count for o in world.obstacles if hasattr(o, "count")),
+        "formats": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замер сохранения: JSON против двоичного формата")
+    parser.add_argument("--radius", type=int, default=50, help="радиус карты в клетках")
+    parser.add_argument("--enemies", type=int, default=10, help="число врагов")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генерации")
+    parser.add_argument("--repeat", type=int, default=3, help="число повторов (берётся лучшее время)")
+    parser.add_argument("--output", help="файл для JSON (по умолчанию — stdout)")
+    args = parser.parse_args(argv)
+
+    result = run(radius=args.radius, enemies=args.enemies, seed=args.seed, repeat=args.repeat)
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
-import datetime        # модуль для работы с датой и временем
-import subprocess      # модуль для выполнения системных команд (например, git)
 import pygame as pg    # библиотека pygame для графики
 
+from src.systems.version import game_version  # версия без подпроцесса git
+
 # --- Текущие настройки (меняются в игре и меню) ---
 CURRENT_WIDTH = 1920          # текущая ширина окна/экрана
 CURRENT_HEIGHT = 1080         # текущая высота окна/экрана
@@ -10,28 +10,32 @@ CURRENT_VOLUME = 1.0          # текущая громкость (от 0.0 до
 
 # --- Константы ---
 FPS = 60                      # количество кадров в секунду
+SIM_TICK_RATE = 30            # частота шагов симуляции (тиков в секунду), не зависит от FPS
+MAX_CATCH_UP_STEPS = 5        # максимум догоняющих тиков симуляции за один кадр
+SPEED_REFERENCE_RATE = 60     # скорости юнитов заданы в клетках за тик при этой частоте
 BACKGROUND_COLOR = (30, 30, 30)  # цвет фона (RGB)
+DIRTY_RECTS = False           # выводить кадр грязными прямоугольниками (переключается F4)
+
+# --- Генерация мира ---
+WORLD_SEED = None             # зерно карты (None — новая случайная карта в каждой игре)
+WORLD_CACHE_DIR = "cache/worlds"           # каталог кэша сгенерированных миров
+WORLD_CACHE_MAX_BYTES = 64 * 1024 * 1024   # предел размера кэша миров (64 МБ)
+
+# --- Ресурсы ---
+ASSET_CACHE_DIR = "cache/assets"  # декодированные картинки и звуки (пересобираются при изменении исходников)
+
+# --- Сохранения ---
+SAVES_DIR = "saves"           # каталог слотов сохранения
+AUTOSAVE_INTERVAL = 60        # период автосохранения в секундах игрового времени (0 — выключено)
+SAVE_THUMBNAIL_SIZE = (64, 36)  # миниатюра кадра в метаданных сохранения
 
 FONT_PATH = "assets/fonts/main_font.ttf"  # путь к основному шрифту
 FONT_SIZE_TITLE = 38                      # размер шрифта для заголовков
 FONT_SIZE_OPTION = 22                     # размер шрифта для опций меню
 
-def get_last_commit_date():
-    """Возвращает дату последнего коммита Git в формате YYYY-MM-DD."""
-    try:
-        # выполняем команду git для получения даты последнего коммита
-        date_str = subprocess.check_output(
-            ["git", "log", "-1", "--format=%cd", "--date=short"],
-            encoding="utf-8"
-        ).strip()
-        return date_str
-    except Exception:
-        # fallback: если git недоступен, берём текущую дату
-        return datetime.datetime.now().strftime("%Y-%m-%d")
-
-# Версия игры с датой последнего коммита
+# Версия игры с датой сборки (файл сборки или коммит HEAD — без запуска git)
 VERSION_NUMBER = "v0.1.4"  # номер версии
-GAME_VERSION = f"{VERSION_NUMBER} ({get_last_commit_date()})"  # версия + дата коммита
+GAME_VERSION = game_version(VERSION_NUMBER)  # версия + дата сборки
 
 # --- Опции меню ---
 MENU_OPTIONS = [
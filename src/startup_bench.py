@@ -0,0 +1,71 @@
+"""
+Замер холодного запуска: время от старта процесса до первого кадра главного меню.
+
+Запускает игру (python -m src.main --first-frame или python src/main.py --first-frame)
+repeat раз в отдельных процессах и печатает JSON: полное время до первого кадра
+(с запуском интерпретатора) и этапы внутри процесса — импорт, инициализация, первый кадр.
+
+Запуск из корня проекта:
+    python -m src.startup_bench --repeat 5
+    python -m src.startup_bench --script --repeat 5
+"""
+import argparse  # разбор аргументов командной строки
+import json  # разбор отчёта игры и вывод результатов
+import os  # переменные окружения SDL и корень проекта
+import statistics  # медиана замеров
+import subprocess  # запуск игры в отдельном процессе
+import sys  # путь к интерпретатору
+import time  # замеры времени
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # корень проекта
+
+
+def run_once(script=False):
+    """Один запуск игры до первого кадра меню. Возвращает отчёт игры и полное время."""
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")  # без окна
+    env.setdefault("SDL_AUDIODRIVER", "dummy")  # без звука
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"     # приветствие pygame испортило бы JSON
+    command = [sys.executable, os.path.join("src", "main.py")] if script else [sys.executable, "-m", "src.main"]
+
+    start = time.time()
+    output = subprocess.run(command + ["--first-frame"], cwd=ROOT, env=env, check=True,
+                            capture_output=True, encoding="utf-8").stdout
+    report = json.loads(output.strip().splitlines()[-1])
+    report["process_s"] = report.pop("wall_time") - start  # с запуском интерпретатора
+    return report
+
+
+def run(repeat=5, script=False):
+    """repeat запусков. Возвращает медианы и лучшие значения по этапам."""
+    reports = [run_once(script) for _ in range(repeat)]
+    stages = ("process_s", "imports_s", "init_s", "first_frame_s", "total_s")
+    return {
+        "command": "python src/main.py" if script else "python -m src.main",
+        "repeat": repeat,
+        "median": {name: statistics.median(r[name] for r in reports) for name in stages},
+        "best": {name: min(r[name] for r in reports) for name in stages},
+        "settings_modules": max(r["settings_modules"] for r in reports),  # 1 — settings загружен один раз
+        "game_imported": any(r["game_imported"] for r in reports),        # модули игры до первого кадра
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замер запуска до первого кадра меню")
+    parser.add_argument("--repeat", type=int, default=5, help="число запусков")
+    parser.add_argument("--script", action="store_true", help="запускать как python src/main.py")
+    parser.add_argument("--output", help="файл для JSON (по умолчанию — stdout)")
+    args = parser.parse_args(argv)
+
+    result = run(repeat=args.repeat, script=args.script)
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
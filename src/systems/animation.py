@@ -0,0 +1,126 @@
+import numpy as np  # выбор кадров сразу для всех видимых врагов
+
+import pygame as pg  # смешивание кадров смерти
+
+from src.systems.assets import ASSETS, DEAD_IMAGE, SKELETON_SHEET  # спрайт-лист и спрайт смерти
+from src.systems.atlas import ATLAS  # кадры, масштабированные под текущий зум
+from src.systems.enemy_pool import DIRECTION_CODES, DIRECTIONS  # коды направлений в массивах пула
+
+WALK_FRAMES = 8        # кадры шага: столбцы 1..8 спрайт-листа (столбец 0 — стойка)
+WALK_FRAME_MS = 80     # длительность кадра шага (мс времени симуляции)
+WALK_HOLD_MS = 250     # сколько после последнего шага юнит ещё «идёт» (блуждание — редкие прыжки)
+DEATH_FRAMES = 4       # кадры смерти: стойка плавно переходит в спрайт смерти
+DEATH_FRAME_MS = 100   # длительность кадра смерти
+
+ALIVE = -1             # died_at живого юнита
+LONG_DEAD = -(1 << 62)  # died_at юнита, погибшего до загрузки (анимация смерти уже прошла)
+
+
+class UnitAnimations:
+    """
+    Анимации юнитов одного спрайт-листа.
+    Все кадры (шаг по 4 направлениям, кадры смерти, спрайт смерти) лежат в атласе ATLAS,
+    то есть уже масштабированы под текущий зум: атлас зума собирается лениво при первой
+    отрисовке после смены зума, и в кадре ничего не масштабируется.
+    Кадр выбирается по времени симуляции из состояния юнита:
+    - walk_start / walk_until: начало шага и время, до которого юнит считается идущим
+    - died_at: время смерти (ALIVE — жив)
+    """
+
+    def __init__(self, prefix, frames, dead_image):
+        names = ATLAS.add_frames(prefix, frames)
+        self.dead = ATLAS.add(f"{prefix}/dead", dead_image)
+        # имена кадров по коду направления: [стойка, шаг 1..8] и [смерть 1..DEATH_FRAMES]
+        self.walk = [names[direction] for direction in DIRECTIONS]
+        self.death = [
+            [ATLAS.add(f"{prefix}/death/{direction}/{i}", surface)
+             for i, surface in enumerate(death_frames(frames[direction][0], dead_image))]
+            for direction in DIRECTIONS
+        ]
+        # те же имена в массивах — для выбора кадров векторно
+        self.walk_table = np.array(self.walk, dtype=object)
+        self.death_table = np.array(self.death, dtype=object)
+
+    def sprite(self, direction, walk_start, walk_until, died_at, alive, now):
+        """Имя кадра одного юнита (direction — строка направления)"""
+        code = DIRECTION_CODES[direction]
+        if not alive:
+            step = (now - died_at) // DEATH_FRAME_MS if died_at != ALIVE else 0  # убит вне тика — первый кадр
+            return self.death[code][step] if 0 <= step < DEATH_FRAMES else self.dead
+        if now < walk_until:
+            return self.walk[code][1 + (now - walk_start) // WALK_FRAME_MS % WALK_FRAMES]
+        return self.walk[code][0]
+
+    def sprites(self, directions, walk_start, walk_until, died_at, alive, now):
+        """Имена кадров для массивов состояния (коды направлений, времена, флаги жизни)"""
+        walking = alive & (now < walk_until)
+        column = np.where(walking, 1 + (now - walk_start) // WALK_FRAME_MS % WALK_FRAMES, 0)
+        names = self.walk_table[directions, column]
+        dead = ~alive
+        if dead.any():
+            # died_at ещё не выставлен (убит вне тика) — первый кадр смерти; погибшие до загрузки — LONG_DEAD
+            step = np.where(died_at[dead] == ALIVE, 0, (now - died_at[dead]) // DEATH_FRAME_MS)
+            dying = (step >= 0) & (step < DEATH_FRAMES)
+            names[dead] = np.where(dying, self.death_table[directions[dead], np.clip(step, 0, DEATH_FRAMES - 1)],
+                                   self.dead)
+        return names
+
+
+def death_frames(standing, dead_image, count=DEATH_FRAMES):
+    """Кадры смерти: стойка растворяется, спрайт смерти проявляется (размер — как у кадра стойки)"""
+    size = standing.get_size()
+    dead = pg.transform.scale(dead_image, size)
+    frames = []
+    for i in range(count):
+        t = (i + 1) / (count + 1)  # доля спрайта смерти в кадре
+        fading, showing = standing.copy(), dead.copy()
+        fading.fill((255, 255, 255, round(255 * (1 - t))), special_flags=pg.BLEND_RGBA_MULT)
+        showing.fill((255, 255, 255, round(255 * t)), special_flags=pg.BLEND_RGBA_MULT)
+        frame = pg.Surface(size, pg.SRCALPHA)
+        frame.blit(fading, (0, 0))
+        frame.blit(showing, (0, 0))
+        frames.append(frame)
+    return frames
+
+
+_animations = {}  # префикс -> UnitAnimations
+
+
+def unit_animations(prefix="unit"):
+    """Анимации скелета (общие для игрока и врагов, создаются один раз)"""
+    animations = _animations.get(prefix)
+    if animations is None:
+        frames = ASSETS.sprite_frames(SKELETON_SHEET, cols=9, rows=4)
+        animations = _animations[prefix] = UnitAnimations(prefix, frames, ASSETS.image(DEAD_IMAGE))
+    return animations
+
+
+# --- Состояние анимации (обновляется в конце тика симуляции) ---
+
+def update_unit(unit, now):
+    """Шаг и смерть одного юнита (игрока) по сдвигу за тик"""
+    if unit.alive:
+        if unit.x != unit.prev_x or unit.y != unit.prev_y:
+            if now >= unit.walk_until:
+                unit.walk_start = now  # шаг начался заново с первого кадра
+            unit.walk_until = now + WALK_HOLD_MS
+    elif unit.died_at == ALIVE:
+        unit.died_at = now
+
+
+def update_pool(pool, now):
+    """То же для всех врагов пула — несколькими векторными операциями"""
+    n = pool.count
+    alive = pool.alive[:n]
+    walk_start, walk_until, died_at = pool.walk_start[:n], pool.walk_until[:n], pool.died_at[:n]
+    moved = alive & ((pool.x[:n] != pool.prev_x[:n]) | (pool.y[:n] != pool.prev_y[:n]))
+    walk_start[moved & (now >= walk_until)] = now
+    walk_until[moved] = now + WALK_HOLD_MS
+    died_at[~alive & (died_at == ALIVE)] = now
+
+
+def settle_dead(pool):
+    """Враги, погибшие до создания пула (загруженное сохранение), лежат без анимации смерти"""
+    n = pool.count
+    died_at = pool.died_at[:n]
+    died_at[~pool.alive[:n] & (died_at == ALIVE)] = LONG_DEAD
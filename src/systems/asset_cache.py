@@ -0,0 +1,185 @@
+"""
+Кэш декодированных ресурсов на диске.
+
+PNG и WAV декодируются один раз; пиксели (уже в формате экрана) и PCM-звук
+лежат в cache/assets и читаются одним блоком без распаковки: картинка собирается
+через pg.image.frombuffer, звук — через pg.mixer.Sound(buffer=...).
+Запись кэша проверяется по размеру и времени изменения исходного файла, а при их
+расхождении — по SHA-1 содержимого: изменённый файл декодируется заново автоматически.
+
+Предварительная сборка всего кэша из корня проекта:
+    python -m src.systems.asset_cache
+"""
+import hashlib  # ключ записи и хэш содержимого исходника
+import os  # файлы кэша
+import struct  # заголовок записи
+import sys  # порядок байт платформы
+
+import pygame as pg  # декодирование и сборка поверхностей
+import pygame.mixer as pgm  # звуки
+
+from src import settings  # каталог кэша
+
+CACHE_FORMAT = 1  # версия формата записей: при изменении старые записи пересобираются
+MAGIC = b"RTSASSET"
+# сигнатура, версия, формат данных, ширина, высота, размер и mtime исходника, SHA-1 исходника
+HEADER = struct.Struct("<8sH4sIIqq20s")
+
+# порядок байт 32-битного пикселя ARGB8888 — основного формата экрана SDL
+PIXEL_FORMAT = "BGRA" if sys.byteorder == "little" else "ARGB"
+SOUND_FORMAT = b"PCM\0"
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+SOUND_EXTENSIONS = (".wav", ".ogg")
+
+
+def file_digest(path):
+    """SHA-1 содержимого файла"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+class AssetCache:
+    """
+    Кэш декодированных картинок и звуков: файл на каждый исходник и вариант загрузки.
+    - image(path, alpha): поверхность из кэша (convert_alpha / convert уже сделаны при сборке)
+    - sound(path): pg.mixer.Sound из готового PCM (запись своя для каждого формата микшера)
+    - ошибки чтения и записи кэша не мешают игре: ресурс просто декодируется из исходника
+    """
+
+    def __init__(self, directory, enabled=True):
+        self.directory = directory  # каталог кэша
+        self.enabled = enabled      # False — всегда декодировать исходники
+        self.hits = 0               # ресурс взят из кэша
+        self.builds = 0             # ресурс декодирован и записан в кэш
+
+    def _path(self, source, variant):
+        key = hashlib.sha1(f"{os.path.normpath(source)}|{variant}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.asset")
+
+    # --- картинки ---
+
+    def image(self, path, alpha=True):
+        """Картинка по пути; без открытого экрана — декодированная, но не приведённая к экрану"""
+        converting = pg.display.get_surface() is not None
+        entry = self._path(path, ("alpha" if alpha else "opaque", converting))
+        record = self._read(entry, path) if self.enabled else None
+        if record is not None:
+            pixel_format, width, height, data = record
+            surface = pg.image.frombuffer(data, (width, height), pixel_format.decode("ascii"))
+            if not alpha and converting:
+                surface = surface.convert()  # без альфа-канала: быстрое копирование, не декодирование
+            self.hits += 1
+            return surface
+
+        surface = pg.image.load(path)
+        if converting:  # convert возможен только при открытом экране
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        if self.enabled:
+            data = pg.image.tobytes(surface, PIXEL_FORMAT)
+            self._write(entry, path, PIXEL_FORMAT.encode("ascii"), *surface.get_size(), data)
+        return surface
+
+    # --- звуки ---
+
+    def sound(self, path):
+        """Звук по пути (PCM в формате текущего микшера)"""
+        entry = self._path(path, ("sound", pgm.get_init()))
+        record = self._read(entry, path) if self.enabled else None
+        if record is not None:
+            self.hits += 1
+            return pgm.Sound(buffer=record[3])
+
+        sound = pgm.Sound(path)
+        if self.enabled:
+            self._write(entry, path, SOUND_FORMAT, 0, 0, sound.get_raw())
+        return sound
+
+    # --- записи ---
+
+    def _read(self, entry, source):
+        # (формат, ширина, высота, данные) или None, если записи нет или исходник изменился
+        try:
+            stat = os.stat(source)
+            f = open(entry, "rb")
+        except OSError:
+            return None
+        with f:
+            try:
+                magic, version, data_format, width, height, size, mtime_ns, digest = HEADER.unpack(
+                    f.read(HEADER.size))
+                if magic != MAGIC or version != CACHE_FORMAT or size != stat.st_size:
+                    return None
+                if mtime_ns != stat.st_mtime_ns:
+                    if file_digest(source) != digest:
+                        return None  # исходник изменился — запись пересоберётся
+                    # содержимое то же (файл скопирован или переписан): обновляем отметку времени
+                    self._write_header(entry, data_format, width, height, stat, digest)
+                data = bytearray(os.fstat(f.fileno()).st_size - HEADER.size)  # изменяемый буфер пикселей
+                if f.readinto(data) != len(data):
+                    return None
+            except (OSError, struct.error):
+                return None
+        return data_format, width, height, data
+
+    def _write_header(self, entry, data_format, width, height, stat, digest):
+        try:
+            with open(entry, "r+b") as f:
+                f.write(HEADER.pack(MAGIC, CACHE_FORMAT, data_format, width, height,
+                                    stat.st_size, stat.st_mtime_ns, digest))
+        except OSError:
+            pass
+
+    def _write(self, entry, source, data_format, width, height, data):
+        try:
+            stat = os.stat(source)
+            header = HEADER.pack(MAGIC, CACHE_FORMAT, data_format, width, height,
+                                 stat.st_size, stat.st_mtime_ns, file_digest(source))
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = entry + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(header)
+                f.write(data)
+            os.replace(tmp_path, entry)  # запись появляется целиком или не появляется
+        except OSError as error:
+            print(f"Не удалось сохранить ресурс в кэш: {error}")
+            return
+        self.builds += 1
+
+    def build(self, root="assets"):
+        """Декодирует в кэш все картинки и звуки под root. Возвращает число собранных записей."""
+        builds = self.builds
+        for directory, _, names in os.walk(root):
+            for name in sorted(names):
+                path = os.path.join(directory, name).replace(os.sep, "/")  # пути как в коде игры
+                extension = os.path.splitext(name)[1].lower()
+                try:
+                    if extension in IMAGE_EXTENSIONS:
+                        self.image(path)
+                        self.image(path, alpha=False)
+                    elif extension in SOUND_EXTENSIONS:
+                        self.sound(path)
+                except (pg.error, OSError) as error:
+                    print(f"Ресурс пропущен: {path}: {error}")
+        return self.builds - builds
+
+
+ASSET_CACHE = AssetCache(settings.ASSET_CACHE_DIR)  # общий кэш для реестра картинок, меню и звуков
+
+
+def main():
+    """Предварительная сборка кэша (с экраном и микшером, как в игре)"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pg.init()
+    pgm.init()
+    pg.display.set_mode((1, 1))
+    built = ASSET_CACHE.build()
+    print(f"{ASSET_CACHE.directory}: собрано {built}, уже актуально {ASSET_CACHE.hits}")
+
+
+if __name__ == "__main__":
+    main()
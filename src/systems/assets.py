@@ -0,0 +1,139 @@
+import pygame as pg  # библиотека pygame для работы с графикой
+
+from src.systems.asset_cache import ASSET_CACHE  # декодированные картинки на диске
+
+# --- Пути к общим ресурсам ---
+SKELETON_SHEET = "assets/images/units/player/BODY_skeleton.png"  # спрайт-лист юнитов
+DEAD_IMAGE = "assets/images/units/player/dead.png"               # спрайт смерти
+MOUNTAINS_TILESET = "assets/images/tiles/mountains.png"           # тайлсет гор 3×3
+WATER_IMAGE = "assets/images/tiles/see.png"                       # картинка воды
+
+# строки спрайт-листа юнитов (9 кадров в строке)
+WALK_ROWS = ("UP", "LEFT", "DOWN", "RIGHT")
+
+# клетки тайлсета гор 3×3: имя -> (строка, столбец)
+MOUNTAIN_TILES = {
+    "center": (1, 1),
+    "top": (0, 1),
+    "bottom": (2, 1),
+    "left": (1, 0),
+    "right": (1, 2),
+    "corner_tl": (0, 0),
+    "corner_tr": (0, 2),
+    "corner_bl": (2, 0),
+    "corner_br": (2, 2),
+}
+
+
+def _surface_bytes(surface):
+    # сколько байт пикселей занимает поверхность
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class AssetRegistry:
+    """
+    Единый реестр ресурсов (flyweight): каждая картинка загружается один раз
+    (из кэша декодированных пикселей, PNG декодируется только при изменении файла),
+    каждый спрайт-лист нарезается один раз, а все сущности получают общие таблицы кадров.
+    - image(path): загруженная картинка
+    - sprite_frames(path): кадры по направлениям {"UP": [...], ..., "IDLE": [...]}
+    - tileset(path, tiles, rows, cols): именованные клетки тайлсета
+    - placeholder(key, size, color): заглушка, если файла нет
+    - memory_report(): сколько ресурсов загружено и сколько памяти они занимают
+    """
+
+    def __init__(self):
+        self._images = {}        # путь -> поверхность
+        self._frames = {}        # (путь, cols, rows, имена строк) -> таблица кадров
+        self._tilesets = {}      # (путь, rows, cols, имена клеток) -> {имя: подповерхность}
+        self._placeholders = {}  # ключ -> поверхность-заглушка
+        self.loads = 0           # сколько раз картинки читались с диска
+
+    def image(self, path, alpha=True):
+        """Картинка по пути (загружается с диска только при первом запросе)"""
+        surface = self._images.get(path)
+        if surface is None:
+            surface = ASSET_CACHE.image(path, alpha)
+            self._images[path] = surface
+            self.loads += 1
+        return surface
+
+    def sprite_frames(self, path, cols=9, rows=4, row_names=WALK_ROWS):
+        """Общая таблица кадров спрайт-листа, нарезанная один раз"""
+        key = (path, cols, rows, tuple(row_names))  # разные имена строк — разные таблицы
+        frames = self._frames.get(key)
+        if frames is not None:
+            return frames
+
+        sheet = self.image(path)
+        frame_width = sheet.get_width() // cols    # ширина одного кадра
+        frame_height = sheet.get_height() // rows  # высота одного кадра
+
+        frames = {name: [] for name in row_names}
+        # нарезаем кадры по строкам и столбцам
+        for row, name in enumerate(row_names[:rows]):
+            for col in range(cols):
+                rect = pg.Rect(col * frame_width, row * frame_height, frame_width, frame_height)
+                frames[name].append(sheet.subsurface(rect))
+
+        # кадр для состояния покоя: взгляд вниз, а если такой строки нет — первый кадр первой строки
+        idle_row = "DOWN" if "DOWN" in frames else row_names[0]
+        frames["IDLE"] = [frames[idle_row][0]]
+        self._frames[key] = frames
+        return frames
+
+    def tileset(self, path, tiles, rows=3, cols=3):
+        """Именованные клетки тайлсета rows × cols: {имя: подповерхность}"""
+        key = (path, rows, cols, tuple(sorted(tiles.items())))  # разные карты имён — разные наборы
+        tileset = self._tilesets.get(key)
+        if tileset is not None:
+            return tileset
+
+        full_image = self.image(path)
+        tw, th = full_image.get_width() // cols, full_image.get_height() // rows
+        tileset = {
+            name: full_image.subsurface(pg.Rect(j * tw, i * th, tw, th))
+            for name, (i, j) in tiles.items()
+        }
+        self._tilesets[key] = tileset
+        return tileset
+
+    def placeholder(self, key, size, color):
+        """Цветной квадрат-заглушка (одна поверхность на ключ)"""
+        surface = self._placeholders.get(key)
+        if surface is None:
+            surface = pg.Surface(size, pg.SRCALPHA)
+            pg.draw.rect(surface, color, surface.get_rect())
+            self._placeholders[key] = surface
+        return surface
+
+    def memory_report(self):
+        """Сводка по загруженным ресурсам и занимаемой памяти (в байтах)"""
+        images = {path: _surface_bytes(s) for path, s in self._images.items()}
+        placeholders = sum(_surface_bytes(s) for s in self._placeholders.values())
+        frames = sum(len(f) for table in self._frames.values() for f in table.values())
+        return {
+            "images": len(images),
+            "image_bytes": sum(images.values()),
+            "placeholders": len(self._placeholders),
+            "placeholder_bytes": placeholders,
+            "sprite_sheets": len(self._frames),
+            "frames": frames,  # подповерхности делят пиксели с листом — памяти не добавляют
+            "tilesets": len(self._tilesets),
+            "disk_loads": self.loads,
+            "cache_hits": ASSET_CACHE.hits,      # взято готовыми пикселями из cache/assets
+            "cache_builds": ASSET_CACHE.builds,  # декодировано из PNG и записано в кэш
+            "total_bytes": sum(images.values()) + placeholders,
+            "by_path": images,
+        }
+
+    def clear(self):
+        """Сброс реестра (например, после пересоздания экрана)"""
+        self._images.clear()
+        self._frames.clear()
+        self._tilesets.clear()
+        self._placeholders.clear()
+
+
+# --- Общий реестр для всех сущностей ---
+ASSETS = AssetRegistry()
@@ -0,0 +1,159 @@
+from collections import OrderedDict  # порядок использования для вытеснения (LRU)
+
+import pygame as pg  # библиотека pygame для работы с графикой
+
+from src.systems.profiler import PROFILER  # счётчики кадра
+
+PAGE_SIZE = 1024  # сторона страницы атласа в пикселях (больше — только под крупную картинку)
+MAX_ZOOMS = 4     # сколько атласов зума держать одновременно
+
+
+def tile_size_fn(width=1, height=1):
+    """Размер спрайта в клетках: (width × tile_size, height × tile_size)"""
+    return lambda tile_size: (width * tile_size, height * tile_size)
+
+
+def shelf_pack(sizes, page_size=PAGE_SIZE):
+    """
+    Раскладка прямоугольников по страницам «полками»: высокие первыми, слева направо;
+    строка заполнена — новая полка ниже, страница заполнена — новая страница.
+    sizes: {имя: (ширина, высота)}. Возвращает ({имя: (номер страницы, pg.Rect)}, [размеры страниц]).
+    """
+    placements = {}
+    pages = []  # [ширина, предел высоты, занятая высота]
+    x = shelf_y = shelf_height = 0
+    for name in sorted(sizes, key=lambda n: (-sizes[n][1], -sizes[n][0], n)):
+        w, h = sizes[name]
+        if pages and x + w > pages[-1][0]:  # строка заполнена — новая полка
+            x, shelf_y, shelf_height = 0, shelf_y + shelf_height, 0
+        if not pages or w > pages[-1][0] or shelf_y + h > pages[-1][1]:  # новая страница
+            pages.append([max(page_size, w), max(page_size, h), 0])
+            x = shelf_y = shelf_height = 0
+        placements[name] = (len(pages) - 1, pg.Rect(x, shelf_y, w, h))
+        x += w
+        shelf_height = max(shelf_height, h)
+        pages[-1][2] = max(pages[-1][2], shelf_y + h)
+    return placements, [(width, used) for width, _, used in pages]  # страницы обрезаны по занятой высоте
+
+
+class TextureAtlas:
+    """
+    Набор спрайтов, упакованных в несколько больших поверхностей (страниц).
+    - region(name): (страница, область) спрайта
+    - blit(target, name, pos): вывод спрайта из страницы атласа
+    """
+
+    def __init__(self, surfaces, page_size=PAGE_SIZE):
+        placements, page_sizes = shelf_pack({name: s.get_size() for name, s in surfaces.items()}, page_size)
+        self.pages = []
+        for size in page_sizes:
+            page = pg.Surface(size, pg.SRCALPHA)
+            if pg.display.get_surface() is not None:
+                page = page.convert_alpha()  # формат экрана — быстрый blit
+            page.fill((0, 0, 0, 0))
+            self.pages.append(page)
+        self.regions = {}  # имя -> (страница, pg.Rect)
+        for name, (index, rect) in placements.items():
+            self.pages[index].blit(surfaces[name], rect)
+            self.regions[name] = (self.pages[index], rect)
+
+    def region(self, name):
+        """(страница, pg.Rect) спрайта"""
+        return self.regions[name]
+
+    def size(self, name):
+        """Размер спрайта (ширина, высота)"""
+        return self.regions[name][1].size
+
+    def blit(self, target, name, pos):
+        """Рисует спрайт name в pos (левый верхний угол). Возвращает занятую область."""
+        page, rect = self.regions[name]
+        return target.blit(page, pos, rect)
+
+    def memory_bytes(self):
+        """Память страниц в байтах"""
+        return sum(p.get_width() * p.get_height() * p.get_bytesize() for p in self.pages)
+
+
+class SpriteAtlas:
+    """
+    Атласы статичной графики по уровням зума.
+    - add(name, surface, size): спрайт регистрируется один раз (обычно в конструкторе сущности);
+      size(tile_size) -> (ширина, высота) — размер спрайта на экране при данном зуме
+    - at(tile_size): атлас этого зума — все спрайты, уже масштабированные и упакованные в страницы
+      (строится при первом запросе зума, давно не использованные зумы вытесняются)
+    - blit(target, name, tile_size, pos): вывод спрайта из атласа зума
+    Новый спрайт после постройки атласов сбрасывает их — при следующем запросе они соберутся заново.
+    """
+
+    def __init__(self, page_size=PAGE_SIZE, max_zooms=MAX_ZOOMS):
+        self.page_size = page_size
+        self.max_zooms = max_zooms
+        self._sources = {}            # имя -> (исходная поверхность, функция размера)
+        self._frames = {}             # префикс -> {направление: [имена кадров]}
+        self._zooms = OrderedDict()   # tile_size -> TextureAtlas (порядок LRU)
+        self.builds = 0               # сколько атласов зума было собрано
+
+    def add(self, name, surface, size=tile_size_fn()):
+        """Регистрирует спрайт (повторная регистрация того же имени ничего не меняет)"""
+        if name in self._sources:
+            return name
+        self._sources[name] = (surface, size)
+        self._zooms.clear()  # набор спрайтов изменился — атласы соберутся заново
+        return name
+
+    def add_frames(self, prefix, frames, size=tile_size_fn()):
+        """
+        Регистрирует таблицу кадров {направление: [кадры]} под именами «prefix/направление/номер».
+        Возвращает {направление: [имена]} (одна таблица на префикс — общая для всех юнитов).
+        """
+        names = self._frames.get(prefix)
+        if names is None:
+            names = self._frames[prefix] = {
+                direction: [self.add(f"{prefix}/{direction}/{i}", frame, size) for i, frame in enumerate(images)]
+                for direction, images in frames.items()
+            }
+        return names
+
+    def __contains__(self, name):
+        return name in self._sources
+
+    def at(self, tile_size):
+        """Атлас для размера клетки tile_size"""
+        atlas = self._zooms.get(tile_size)
+        if atlas is not None:
+            self._zooms.move_to_end(tile_size)
+            return atlas
+        # масштабированные копии нужны только на время упаковки — потом живут лишь страницы
+        scaled = {}
+        for name, (surface, size) in self._sources.items():
+            w, h = size(tile_size)
+            scaled[name] = pg.transform.scale(surface, (max(1, w), max(1, h)))
+        PROFILER.count("scale", len(scaled))
+        atlas = self._zooms[tile_size] = TextureAtlas(scaled, self.page_size)
+        self.builds += 1
+        while len(self._zooms) > self.max_zooms:
+            self._zooms.popitem(last=False)  # давно не использованный зум
+        return atlas
+
+    def blit(self, target, name, tile_size, pos):
+        """Рисует спрайт name при зуме tile_size в pos. Возвращает занятую область."""
+        return self.at(tile_size).blit(target, name, pos)
+
+    def stats(self):
+        """Сводка: спрайты, собранные зумы, страницы и их память"""
+        return {
+            "sprites": len(self._sources),
+            "zooms": list(self._zooms),
+            "pages": sum(len(a.pages) for a in self._zooms.values()),
+            "bytes": sum(a.memory_bytes() for a in self._zooms.values()),
+            "builds": self.builds,
+        }
+
+    def clear(self):
+        """Сброс атласов зума (спрайты остаются зарегистрированными)"""
+        self._zooms.clear()
+
+
+# --- Общий атлас для деревьев, кустов, гор, оружия и юнитов ---
+ATLAS = SpriteAtlas()
@@ -0,0 +1,161 @@
+import threading  # фоновый поток записи
+import time  # паузы фонового потока и замеры
+
+import numpy as np  # снимки массивов врагов
+
+from src import settings  # период автосохранения
+from src.systems.save_format import (pack_section, write_enemies, write_obstacles, write_player,
+                                     write_sections)  # секции двоичного сохранения
+from src.systems.save_load import AUTOSAVE_FILE, SAVE_INDEX, atomic_write, world_metadata  # слоты и запись
+
+
+class Autosave:
+    """
+    Автосохранение в фоновом потоке.
+    - в игровом потоке снимается только дешёвый снимок: игрок, копии массивов EnemyPool
+      и (если препятствия менялись) копия списка препятствий
+    - кодирование, сжатие и запись идут в отдельном потоке через временный файл
+      и атомарное переименование (сбой посреди записи не портит прежнее сохранение)
+    - секции кодируются заново, только если изменились: сжатая секция препятствий
+      хранится готовой, пока ObstacleList не сообщит об изменении; файл (заголовок с метаданными
+      и готовые секции) пишется при каждом снимке — время игры и миниатюра в слоте всегда свежие
+    - если новый снимок приходит, пока пишется старый, записывается только последний
+    """
+
+    def __init__(self, path=AUTOSAVE_FILE, interval=settings.AUTOSAVE_INTERVAL, compression="zlib"):
+        self.path = path                # файл слота автосохранения
+        self.interval = interval        # период в секундах игрового времени (0 — выключено)
+        self.compression = compression  # сжатие секций: none, zlib или lzma
+        self.last_snapshot = None       # время последнего снимка (мс игрового времени)
+        self.saves = 0                  # число записанных файлов
+        self.last_write_s = None        # длительность последней фоновой записи
+        self.last_error = None          # последняя ошибка записи (игра при ней продолжается)
+
+        self._obstacles = None          # ObstacleList, на изменения которого подписан автосейв
+        self._obstacles_dirty = True    # препятствия изменились с прошлого снимка
+        self._sections = {}             # имя секции -> (данные снимка, сжатые байты)
+
+        self._pending = None            # снимок, ждущий записи
+        self._busy = False              # поток сейчас пишет снимок
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def bind(self, obstacles):
+        """Подписка на изменения ObstacleList: секция препятствий кодируется заново только после них"""
+        if self._obstacles is not None:
+            self._obstacles.remove_listener(self._on_obstacle_changed)
+        self._obstacles = obstacles
+        obstacles.add_listener(self._on_obstacle_changed)
+        self._on_obstacle_changed(None)
+
+    def _on_obstacle_changed(self, obstacle):
+        with self._condition:
+            self._obstacles_dirty = True
+
+    # --- игровой поток ---
+
+    def update(self, now, world, screen=None):
+        """Снимок раз в interval секунд игрового времени now (мс); screen — кадр для миниатюры"""
+        if not self.interval or not world.player.alive:
+            return  # автосохранение выключено или игра проиграна
+        if self.last_snapshot is None:
+            self.last_snapshot = now  # первый снимок — через interval после старта
+        elif now - self.last_snapshot >= self.interval * 1000:
+            self.save(world, playtime_s=now / 1000, screen=screen)
+            self.last_snapshot = now
+
+    def save(self, world, playtime_s=0.0, screen=None):
+        """Снимает состояние мира и ставит его в очередь на запись (без ожидания)"""
+        snapshot = self.snapshot(world, playtime_s, screen)
+        with self._condition:
+            pending = self._pending
+            if pending is not None and snapshot["obstacles"] is None:
+                # более старый незаписанный снимок заменяется, но его препятствия ещё не закодированы
+                snapshot["obstacles"] = pending["obstacles"]
+            self._pending = snapshot
+            self._condition.notify()
+
+    def snapshot(self, world, playtime_s=0.0, screen=None):
+        """Копия изменяемого состояния мира и метаданные; препятствия — только если менялись"""
+        player, pool = world.player, world.enemy_pool
+        n = pool.count
+        with self._condition:  # флаг сбрасывает и фоновый поток при ошибке записи
+            dirty, self._obstacles_dirty = self._obstacles_dirty, False
+        # сами объекты препятствий не меняются — копируем список
+        obstacles = list(world.obstacles) if dirty else None
+        return {
+            "player": (player.x, player.y, player.health),
+            "enemies": (pool.x[:n].copy(), pool.y[:n].copy(), pool.alive[:n].copy()),
+            "obstacles": obstacles,
+            "meta": world_metadata(world, playtime_s, screen),
+        }
+
+    def flush(self, timeout=None):
+        """Ждёт, пока запишутся все снимки из очереди. Возвращает True, если успели."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+    def close(self, timeout=None):
+        """Дописывает очередь и останавливает поток"""
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        if self._obstacles is not None:
+            self._obstacles.remove_listener(self._on_obstacle_changed)
+
+    # --- фоновый поток ---
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._closed)
+                if self._pending is None:
+                    return  # закрыт и очередь пуста
+                snapshot, self._pending, self._busy = self._pending, None, True
+            try:
+                self._write(snapshot)
+            except Exception as error:  # ошибка диска не должна ронять игру
+                self.last_error = error
+                with self._condition:
+                    self._obstacles_dirty = True  # при следующем снимке препятствия снимутся заново
+                print(f"Автосохранение не удалось: {error}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _write(self, snapshot):
+        start = time.perf_counter()
+        sections = self._sections  # имя секции -> (данные снимка, сжатые байты)
+
+        # секция кодируется и сжимается заново, только если её данные изменились
+        player = snapshot["player"]
+        if "player" not in sections or sections["player"][0] != player:
+            sections["player"] = (player, pack_section(self.compression, write_player, *player))
+        enemies = snapshot["enemies"]
+        if "enemies" not in sections or not _same_arrays(sections["enemies"][0], enemies):
+            sections["enemies"] = (enemies, pack_section(self.compression, write_enemies,
+                                                         *(values.tolist() for values in enemies)))
+        obstacles = snapshot["obstacles"]
+        if obstacles is not None:
+            # time.sleep(0) отпускает GIL между пачками записей, чтобы игровой поток не ждал
+            sections["obstacles"] = (None, pack_section(self.compression, write_obstacles, obstacles,
+                                                        pause=lambda: time.sleep(0)))
+
+        # метаданные (время игры, время сохранения, миниатюра) новые в каждом снимке: файл пишется всегда,
+        # но неизменившиеся секции берутся готовыми — это лишь копирование байтов
+        body = [sections[name][1] for name in ("player", "enemies", "obstacles")]
+        meta = snapshot["meta"]
+        atomic_write(self.path, lambda f: write_sections(f, self.compression, body, meta))
+        SAVE_INDEX.record(self.path, meta, self.compression)
+        self.saves += 1
+        self.last_write_s = time.perf_counter() - start
+
+
+def _same_arrays(a, b):
+    # снимки врагов совпадают поэлементно
+    return all(np.array_equal(p, q) for p, q in zip(a, b))
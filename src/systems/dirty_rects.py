@@ -0,0 +1,159 @@
+import pygame as pg  # библиотека pygame для вывода на экран
+
+from src import settings  # включён ли режим по умолчанию
+
+TOGGLE_KEY = pg.K_F4  # клавиша переключения режима
+
+# окно снова показано (развёрнуто, перекрытие снято, возврат alt-tab): содержимое окна потеряно
+EXPOSE_EVENTS = (pg.WINDOWEXPOSED, pg.WINDOWRESTORED, pg.WINDOWFOCUSGAINED, pg.VIDEOEXPOSE)
+
+
+class DirtyRectRenderer:
+    """
+    Вывод кадра грязными прямоугольниками (pg.display.update(rects) вместо flip).
+    Кадр рисуется как обычно, но спрайты, HUD и оверлей выводятся через track(screen):
+    каждый blit запоминается вместе с исходной поверхностью.
+    - полный кадр: фон (местность или подложка меню) рисуется целиком и запоминается,
+      на экран уходит всё окно — при сдвиге камеры, зуме, смене размера окна или паузы,
+      изменении препятствий и после force_full() (окно показано снова)
+    - частичный кадр: под спрайтами прошлого кадра восстанавливается фон, спрайты рисуются
+      заново, а на экран уходят только прямоугольники, где что-то изменилось
+      (спрайт сдвинулся, сменил картинку, появился или исчез)
+    - redrawn_fraction: доля экрана, выведенная в последнем кадре (1.0 — полный кадр)
+    Выключенный режим рисует и выводит кадр целиком, как раньше.
+    """
+
+    def __init__(self, enabled=settings.DIRTY_RECTS):
+        self.enabled = enabled       # режим включён
+        self.full = True             # текущий кадр рисуется целиком
+        self.redrawn_fraction = 1.0  # доля экрана, выведенная в последнем кадре
+        self._view = None            # состояние камеры и экрана прошлого кадра
+        self._background = None      # фон без спрайтов (копия экрана)
+        self._items = []             # (ключ, прямоугольник) выведенного в текущем кадре
+        self._previous = []          # то же для прошлого кадра
+        self._force_full = True      # следующий кадр — полный
+        self._obstacles = None       # ObstacleList, изменения которого сбрасывают фон
+
+    def toggle(self):
+        """Включить / выключить режим"""
+        self.enabled = not self.enabled
+        self._force_full = True
+
+    def force_full(self):
+        """Следующий кадр — полный (например, окно показано снова и его содержимое потеряно)"""
+        self._force_full = True
+
+    def bind(self, obstacles):
+        """Подписка на изменения препятствий: местность изменилась — фон рисуется заново"""
+        if self._obstacles is not None:
+            self._obstacles.remove_listener(self._on_obstacle_changed)
+        self._obstacles = obstacles
+        obstacles.add_listener(self._on_obstacle_changed)
+
+    def _on_obstacle_changed(self, obstacle):
+        self._force_full = True
+
+    # --- кадр ---
+
+    def begin(self, screen, view):
+        """
+        Начало кадра. view — всё, от чего зависит фон (смещение камеры, размер тайла, пауза...).
+        Возвращает True, если фон нужно нарисовать целиком; иначе фон под спрайтами
+        прошлого кадра уже восстановлен.
+        """
+        view = (view, screen.get_size())
+        self.full = (not self.enabled or self._force_full or view != self._view
+                     or self._background is None or self._background.get_size() != screen.get_size())
+        self._view, self._force_full = view, False
+        self._items = []
+        if not self.full:
+            background = self._background
+            for _, rect in self._previous:  # стираем спрайты прошлого кадра
+                screen.blit(background, rect, rect)
+        return self.full
+
+    def background_done(self, screen):
+        """Фон полного кадра нарисован — запоминаем его для следующих кадров"""
+        if not (self.enabled and self.full):
+            return
+        if self._background is None or self._background.get_size() != screen.get_size():
+            self._background = pg.Surface(screen.get_size()).convert(screen)
+        self._background.blit(screen, (0, 0))
+
+    def track(self, screen):
+        """Поверхность для спрайтов: screen, blit на которую запоминает область и картинку"""
+        return TrackedSurface(screen, self) if self.enabled else screen
+
+    def record(self, rect, key):
+        """
+        Запоминает область, нарисованную в обход track() (например, pg.draw.rect).
+        key — то, от чего зависит картинка (поверхность или значение, например здоровье).
+        """
+        if self.enabled:
+            self._items.append((key, pg.Rect(rect)))
+
+    def present(self, screen):
+        """Выводит кадр на экран: целиком или только изменившиеся прямоугольники"""
+        items, previous = self._items, self._previous
+        self._previous, self._items = items, []
+        if self.full:
+            pg.display.flip()
+            self.redrawn_fraction = 1.0
+            return
+
+        # изменилось то, что есть только в одном из кадров (сдвиг, новая картинка, появление)
+        previous_keys, current_keys = set(map(_item_key, previous)), set(map(_item_key, items))
+        changed = [item[1] for item in previous if _item_key(item) not in current_keys]
+        changed += [item[1] for item in items if _item_key(item) not in previous_keys]
+        rects = merge_rects(changed, screen.get_rect())
+        if rects:
+            pg.display.update(rects)
+        area = screen.get_width() * screen.get_height()
+        self.redrawn_fraction = min(1.0, sum(r.width * r.height for r in rects) / area) if area else 0.0
+
+
+def _item_key(item):
+    # ключ (поверхности сравниваются как объекты) и прямоугольник в виде кортежа
+    key, rect = item
+    return key, tuple(rect)
+
+
+def merge_rects(rects, bounds):
+    """Обрезает прямоугольники по экрану и объединяет пересекающиеся"""
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if not rect.width or not rect.height:
+            continue
+        index = rect.collidelist(merged)
+        while index != -1:  # сливаем со всеми пересекающимися, пока пересечения есть
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class TrackedSurface:
+    """Обёртка экрана: blit и blits рисуют на экран и сообщают рендереру области и картинки"""
+
+    def __init__(self, screen, renderer):
+        self._screen = screen
+        self._renderer = renderer
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        rect = self._screen.blit(source, dest, area, special_flags)
+        key = source if area is None else (source, tuple(pg.Rect(area)))  # часть листа — своя картинка
+        self._renderer._items.append((key, rect))
+        return rect
+
+    def blits(self, blit_sequence, doreturn=True):
+        blit_sequence = list(blit_sequence)
+        rects = self._screen.blits(blit_sequence, doreturn=True)
+        items = self._renderer._items
+        for item, rect in zip(blit_sequence, rects):
+            source, area = item[0], item[2] if len(item) > 2 else None
+            items.append((source if area is None else (source, tuple(pg.Rect(area))), rect))
+        return rects if doreturn else None
+
+    def __getattr__(self, name):
+        return getattr(self._screen, name)  # get_size, get_width и прочее — от экрана
@@ -0,0 +1,338 @@
+import numpy as np  # векторные вычисления над массивами
+import pygame as pg  # библиотека pygame (таймер для атак)
+
+from src.map.obstacles import is_blocked  # проверка занятости клетки (обычный список)
+from src.systems.flow_field import FlowField  # общее поле путей к игроку
+
+# --- Коды направлений и состояний (в массивах хранятся числа, наружу отдаются строки) ---
+DIRECTIONS = ("UP", "LEFT", "DOWN", "RIGHT")
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+UP, LEFT, DOWN, RIGHT = range(4)
+
+STATES = ("wander", "attack")
+STATE_CODES = {name: code for code, name in enumerate(STATES)}
+WANDER, ATTACK = range(2)
+
+# смещения шага блуждания и соответствующие направления
+WANDER_STEPS = np.array([(1, 0), (-1, 0), (0, 1), (0, -1)], dtype=np.float64)
+WANDER_DIRECTIONS = np.array([RIGHT, LEFT, DOWN, UP], dtype=np.int8)
+
+WANDER_CHANCE = 0.02  # вероятность шага блуждания за тик
+ATTACK_RANGE = 1.1    # дистанция, с которой враг бьёт игрока
+STOP_RANGE = 1.0      # ближе этой дистанции враг к игроку не подходит
+
+
+class PoolField:
+    """
+    Поле врага, которое живёт в объекте, пока враг не добавлен в EnemyPool,
+    и в массиве пула — после добавления. Так Enemy остаётся лёгким «видом» на данные пула.
+    - array: имя массива в EnemyPool
+    - decode / encode: перевод между значением массива и значением для Python-кода
+    """
+
+    def __init__(self, array, decode=float, encode=None):
+        self.array = array
+        self.decode = decode
+        self.encode = encode
+
+    def __set_name__(self, owner, name):
+        self.local = "_" + name  # имя поля для хранения вне пула
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        pool = obj._pool
+        if pool is None:
+            return getattr(obj, self.local)
+        return self.decode(getattr(pool, self.array)[obj._index])
+
+    def __set__(self, obj, value):
+        pool = getattr(obj, "_pool", None)
+        if pool is None:
+            setattr(obj, self.local, value)
+        else:
+            getattr(pool, self.array)[obj._index] = self.encode(value) if self.encode else value
+
+
+class EnemyPool:
+    """
+    Хранилище врагов в виде структуры массивов (NumPy).
+    Позиции, здоровье, состояние, направление и таймеры атак лежат в массивах,
+    поэтому проверка агрессии, шаги, блуждание и атаки считаются для всех врагов
+    несколькими векторными операциями за тик.
+    Объекты Enemy остаются видами на строки пула (отрисовка и сохранение работают как раньше).
+    Преследующие враги обходят препятствия по общему полю путей (FlowField).
+    """
+
+    FIELDS = {
+        "x": np.float64,
+        "y": np.float64,
+        "prev_x": np.float64,
+        "prev_y": np.float64,
+        "hp": np.int32,
+        "speed": np.float64,
+        "aggro_range": np.float64,
+        "damage": np.int32,
+        "state": np.int8,
+        "direction": np.int8,
+        "alive": np.bool_,
+        "attack_cooldown": np.int64,
+        "last_attack_time": np.int64,
+        "walk_start": np.int64,   # анимация: начало шага (мс времени симуляции)
+        "walk_until": np.int64,   # анимация: до какого времени враг «идёт»
+        "died_at": np.int64,      # анимация: время смерти (-1 — жив)
+    }
+
+    def __init__(self, enemies=(), capacity=64, seed=None):
+        self.count = 0                          # число врагов в пуле
+        self.enemies = []                       # объекты Enemy (виды на строки пула)
+        self.rng = np.random.default_rng(seed)  # генератор для блуждания
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self._grid_view = None                  # (сетка, numpy-вид на её байты)
+        self._hash = None                       # пространственный хэш, с которым синхронизирован пул
+        self._hash_cells = np.empty((0, 2), dtype=np.int64)  # ячейка хэша каждого врага
+        self._in_hash = np.zeros(0, dtype=bool)              # лежит ли враг в хэше
+        self.flow_field = FlowField()           # поле путей к игроку (только для ObstacleList)
+        for enemy in enemies:
+            self.add(enemy)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.enemies)
+
+    # --- добавление врагов ---
+
+    def _grow(self):
+        # удваиваем ёмкость всех массивов
+        capacity = max(1, len(self.x)) * 2
+        for name in self.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add(self, enemy):
+        """Переносит данные врага в массивы пула и делает объект видом на строку пула."""
+        if self.count == len(self.x):
+            self._grow()
+        index = self.count
+        # читаем значения, пока враг ещё хранит их у себя
+        values = {name: getattr(enemy, name) for name in self.FIELDS}
+        enemy._pool, enemy._index = self, index
+        self.count += 1
+        for name, value in values.items():
+            setattr(enemy, name, value)  # запись через PoolField уходит в массив
+        self.enemies.append(enemy)
+        return index
+
+    # --- проверки клеток ---
+
+    def _kinds_view(self, grid):
+        # numpy-вид на байты сетки занятости (без копирования, всегда актуален)
+        if self._grid_view is None or self._grid_view[0] is not grid:
+            view = np.frombuffer(grid.kinds, dtype=np.uint8).reshape(grid.size, grid.size)
+            self._grid_view = (grid, view)
+        return self._grid_view[1]
+
+    def _blocked(self, cell_x, cell_y, obstacles):
+        """Векторная проверка is_blocked для массивов целых координат клеток."""
+        grid = getattr(obstacles, "grid", None)
+        if grid is None:
+            # обычный список препятствий — проверяем по одной клетке
+            return np.array([is_blocked(int(cx), int(cy), obstacles)
+                             for cx, cy in zip(cell_x, cell_y)], dtype=bool)
+
+        gx = cell_x.astype(np.int64) + grid.radius
+        gy = cell_y.astype(np.int64) + grid.radius
+        inside = (gx >= 0) & (gx < grid.size) & (gy >= 0) & (gy < grid.size)
+        blocked = np.zeros(len(gx), dtype=bool)
+        kinds = self._kinds_view(grid)
+        blocked[inside] = kinds[gy[inside], gx[inside]] != 0
+        return blocked
+
+    # --- тик симуляции ---
+
+    def begin_tick(self):
+        """Запоминает позиции перед тиком симуляции (для интерполяции)"""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+    def render_positions(self, alpha=1.0):
+        """Позиции всех врагов для отрисовки между прошлым и текущим тиком"""
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        prev_x, prev_y = self.prev_x[:n], self.prev_y[:n]
+        return prev_x + (x - prev_x) * alpha, prev_y + (y - prev_y) * alpha
+
+    def update(self, player, box_map, obstacles=None, now=None, spatial_hash=None, step_scale=1.0):
+        """
+        Один тик для всех врагов (аналог цикла Enemy.update + Enemy.attack).
+        Если передан spatial_hash, он обновляется после движения и используется для атак.
+        step_scale пересчитывает скорость и шанс блуждания под частоту тиков.
+        Возвращает индексы врагов, атаковавших игрока.
+        """
+        n = self.count
+        if n == 0:
+            return np.empty(0, dtype=np.int64)
+        x, y = self.x[:n], self.y[:n]
+        alive = self.alive[:n]
+        speed = self.speed[:n] * step_scale
+        radius = box_map.radius
+
+        # враг, стоящий ровно на занятой клетке, стоит на месте (как в исходном цикле)
+        active = alive.copy()
+        if obstacles is not None:
+            on_cell = (x == np.floor(x)) & (y == np.floor(y))
+            if on_cell.any():
+                idx = np.nonzero(on_cell & active)[0]
+                active[idx] &= ~self._blocked(x[idx], y[idx], obstacles)
+
+        # --- агрессия ---
+        dx = player.x - x
+        dy = player.y - y
+        dist = np.sqrt(dx * dx + dy * dy)
+        if player.alive:
+            chase = active & (dist <= self.aggro_range[:n])
+        else:
+            chase = np.zeros(n, dtype=bool)  # игрок мёртв — все блуждают
+        roam = active & ~chase
+        self.state[:n][active] = np.where(chase[active], ATTACK, WANDER)
+
+        # --- преследование ---
+        idx = np.nonzero(chase & (dist > 0))[0]
+        if len(idx):
+            d = dist[idx]
+            ddx, ddy = dx[idx], dy[idx]
+            if getattr(obstacles, "grid", None) is not None:
+                # обход препятствий: там, где прямой путь упирается, идём по полю к центру соседней клетки
+                self.flow_field.bind(obstacles)
+                self.flow_field.update(player.x, player.y)
+                tx, ty, routed = self.flow_field.steer(x[idx], y[idx], ddx, ddy, speed[idx])
+                ddx = np.where(routed, tx - x[idx], ddx)
+                ddy = np.where(routed, ty - y[idx], ddy)
+                d = np.where(routed, np.sqrt(ddx * ddx + ddy * ddy), d)
+            new_x = x[idx] + ddx / d * speed[idx]
+            new_y = y[idx] + ddy / d * speed[idx]
+
+            # направление для анимации
+            self.direction[idx] = np.where(np.abs(ddx) > np.abs(ddy),
+                                           np.where(ddx > 0, RIGHT, LEFT),
+                                           np.where(ddy > 0, DOWN, UP))
+
+            cell_x, cell_y = np.rint(new_x), np.rint(new_y)
+            ok = dist[idx] > STOP_RANGE  # не подходим вплотную к игроку
+            ok &= ~((cell_x == round(player.x)) & (cell_y == round(player.y)))  # и не входим в его клетку
+            ok &= (np.abs(new_x) <= radius) & (np.abs(new_y) <= radius)
+            if obstacles is not None and ok.any():
+                sub = np.nonzero(ok)[0]
+                ok[sub] &= ~self._blocked(cell_x[sub], cell_y[sub], obstacles)
+            moved = idx[ok]
+            x[moved] = new_x[ok]
+            y[moved] = new_y[ok]
+
+        # --- блуждание ---
+        idx = np.nonzero(roam)[0]
+        if len(idx):
+            chance = 1.0 - (1.0 - WANDER_CHANCE) ** step_scale  # вероятность шага за один тик
+            idx = idx[self.rng.random(len(idx)) < chance]  # бросок вероятности шага
+        if len(idx):
+            choice = self.rng.integers(0, 4, len(idx))
+            step = self.speed[idx] * 10  # прыжок блуждания — на одну клетку
+            new_x = x[idx] + WANDER_STEPS[choice, 0] * step
+            new_y = y[idx] + WANDER_STEPS[choice, 1] * step
+            ok = (np.abs(new_x) <= radius) & (np.abs(new_y) <= radius)
+            if obstacles is not None and ok.any():
+                sub = np.nonzero(ok)[0]
+                ok[sub] &= ~self._blocked(np.rint(new_x[sub]), np.rint(new_y[sub]), obstacles)
+            moved = idx[ok]
+            x[moved] = new_x[ok]
+            y[moved] = new_y[ok]
+            self.direction[moved] = WANDER_DIRECTIONS[choice[ok]]
+
+        if spatial_hash is not None:
+            self.sync_spatial_hash(spatial_hash)
+        return self.attack(player, now, spatial_hash)
+
+    def sync_spatial_hash(self, spatial_hash):
+        """
+        Переносит изменения в пространственный хэш: двигаются только враги,
+        сменившие ячейку, а погибшие удаляются из хэша.
+        """
+        n = self.count
+        if spatial_hash is not self._hash:
+            # новый хэш — все враги будут добавлены заново
+            self._hash = spatial_hash
+            self._in_hash = np.zeros(n, dtype=bool)
+            self._hash_cells = np.zeros((n, 2), dtype=np.int64)
+        elif len(self._in_hash) < n:
+            # в пул добавлены новые враги — дополняем служебные массивы
+            extra = n - len(self._in_hash)
+            self._in_hash = np.concatenate((self._in_hash, np.zeros(extra, dtype=bool)))
+            self._hash_cells = np.concatenate((self._hash_cells, np.zeros((extra, 2), dtype=np.int64)))
+
+        size = spatial_hash.cell_size
+        cells = np.stack((np.floor(self.x[:n] / size), np.floor(self.y[:n] / size)), axis=1).astype(np.int64)
+        alive = self.alive[:n]
+        changed = alive & (~self._in_hash | (cells != self._hash_cells).any(axis=1))
+        died = ~alive & self._in_hash
+
+        for i in np.nonzero(changed)[0]:
+            spatial_hash.move(self.enemies[i], float(self.x[i]), float(self.y[i]))
+        for i in np.nonzero(died)[0]:
+            spatial_hash.remove(self.enemies[i])
+
+        self._hash_cells = cells
+        self._in_hash = alive.copy()
+
+    def attack(self, player, now=None, spatial_hash=None):
+        """Атаки врагов, стоящих рядом с игроком (с учётом задержки между атаками)."""
+        n = self.count
+        if not player.alive or n == 0:
+            return np.empty(0, dtype=np.int64)
+        if now is None:
+            now = pg.time.get_ticks()  # текущее время в мс
+
+        if spatial_hash is not None:
+            # кандидаты — только враги из соседних ячеек хэша
+            nearby = spatial_hash.query_radius(player.x, player.y, ATTACK_RANGE)
+            candidates = np.array(sorted(e._index for e in nearby if getattr(e, "_pool", None) is self),
+                                  dtype=np.int64)
+        else:
+            candidates = np.arange(n)
+        if len(candidates) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        dist = np.hypot(self.x[candidates] - player.x, self.y[candidates] - player.y)
+        ready = self.alive[candidates] & (dist <= ATTACK_RANGE)
+        ready &= (now - self.last_attack_time[candidates]) >= self.attack_cooldown[candidates]
+
+        attackers = []
+        for i in candidates[ready]:
+            if not player.alive:
+                break  # игрок уже погиб — остальные не бьют
+            player.take_damage(int(self.damage[i]) * 2)  # наносим увеличенный урон
+            self.last_attack_time[i] = now
+            attackers.append(i)
+        return np.array(attackers, dtype=np.int64)
+
+    # --- запросы ---
+
+    def alive_count(self):
+        """Число живых врагов"""
+        return int(np.count_nonzero(self.alive[:self.count]))
+
+    def distances_to(self, x, y):
+        """Расстояния от всех врагов до точки (x, y)"""
+        n = self.count
+        return np.hypot(self.x[:n] - x, self.y[:n] - y)
+
+    def in_rect(self, min_x, min_y, max_x, max_y):
+        """Индексы врагов, чья клетка пересекает прямоугольник клеток (для отрисовки)"""
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        mask = (x > min_x - 1) & (x <= max_x) & (y > min_y - 1) & (y <= max_y)
+        return np.nonzero(mask)[0]
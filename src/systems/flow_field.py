@@ -0,0 +1,149 @@
+import numpy as np  # векторные вычисления над массивами
+
+FLOW_RADIUS = 24  # полуразмер окна поля в клетках (больше радиуса агрессии врагов)
+
+# соседи клетки: сначала прямые (вправо, влево, вниз, вверх), затем диагональные
+NEIGHBOURS = np.array([(1, 0), (-1, 0), (0, 1), (0, -1),
+                       (1, 1), (1, -1), (-1, 1), (-1, -1)], dtype=np.int64)
+# для каждой диагонали — индексы двух прямых соседей, которые должны быть свободны
+DIAGONAL_SIDES = np.array([(0, 2), (0, 3), (1, 2), (1, 3)], dtype=np.int64)
+
+
+class FlowField:
+    """
+    Общее поле расстояний до клетки игрока (BFS по свободным клеткам сетки занятости).
+    Считается один раз на всех преследующих врагов, поэтому стоимость поиска пути
+    не зависит от их числа.
+    - max_radius: поле строится только в окне (2 * max_radius + 1)² вокруг игрока
+    - пересчёт — только когда игрок сменил клетку или изменились препятствия
+    - steer(): следующая клетка пути для каждого врага (векторно)
+    Враги вне окна или без пути к игроку идут к нему напрямую, как раньше.
+    """
+
+    def __init__(self, max_radius=FLOW_RADIUS):
+        self.max_radius = max_radius  # полуразмер окна в клетках
+        self.grid = None              # сетка занятости (OccupancyGrid)
+        self.target = None            # клетка, от которой построено поле
+        self.origin = (0, 0)          # мировые координаты клетки [0, 0] окна
+        self.dist = np.full((0, 0), -1, dtype=np.int32)  # расстояния в шагах, -1 — недостижимо
+        self.dirty = True             # препятствия изменились с прошлого пересчёта
+        self.recomputes = 0           # число пересчётов (для замеров)
+        self._obstacles = None        # ObstacleList, на изменения которого подписано поле
+
+    def bind(self, obstacles):
+        """Подключает поле к ObstacleList: сетка занятости и подписка на изменения"""
+        if obstacles is self._obstacles:
+            return
+        if self._obstacles is not None:
+            self._obstacles.remove_listener(self._on_obstacle_changed)
+        self._obstacles = obstacles
+        self.grid = obstacles.grid
+        obstacles.add_listener(self._on_obstacle_changed)
+        self.dirty = True
+
+    def _on_obstacle_changed(self, obstacle):
+        # препятствие добавлено или удалено — поле устарело
+        self.dirty = True
+
+    def update(self, target_x, target_y):
+        """Пересчитывает поле, если цель сменила клетку или изменились препятствия"""
+        cell = (int(np.rint(target_x)), int(np.rint(target_y)))
+        if cell != self.target or self.dirty:
+            self.compute(cell)
+
+    def compute(self, cell):
+        """BFS от клетки cell по свободным клеткам в пределах окна"""
+        grid, r = self.grid, self.max_radius
+        radius = grid.radius
+        tx, ty = cell
+        min_x, max_x = max(tx - r, -radius), min(tx + r, radius)
+        min_y, max_y = max(ty - r, -radius), min(ty + r, radius)
+        self.target, self.origin, self.dirty = cell, (min_x, min_y), False
+        self.recomputes += 1
+        if min_x > max_x or min_y > max_y:
+            self.dist = np.full((0, 0), -1, dtype=np.int32)  # цель за пределами карты
+            return
+
+        kinds = np.frombuffer(grid.kinds, dtype=np.uint8).reshape(grid.size, grid.size)
+        passable = kinds[min_y + radius:max_y + radius + 1, min_x + radius:max_x + radius + 1] == 0
+        dist = np.full(passable.shape, -1, dtype=np.int32)
+        frontier = np.zeros(passable.shape, dtype=bool)
+        frontier[ty - min_y, tx - min_x] = True
+        dist[ty - min_y, tx - min_x] = 0
+        passable[ty - min_y, tx - min_x] = False  # клетка цели уже посещена
+
+        # волна BFS: все клетки фронта расширяются одновременно
+        step = 0
+        while frontier.any():
+            step += 1
+            grown = np.zeros_like(frontier)
+            grown[1:, :] |= frontier[:-1, :]
+            grown[:-1, :] |= frontier[1:, :]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            grown &= passable
+            passable &= ~grown
+            dist[grown] = step
+            frontier = grown
+        self.dist = dist
+
+    # --- запросы ---
+
+    def distance_at(self, cell_x, cell_y):
+        """Расстояния (в шагах) для массивов клеток; -1 — вне окна или недостижимо"""
+        cell_x = np.asarray(cell_x, dtype=np.int64)
+        cell_y = np.asarray(cell_y, dtype=np.int64)
+        lx, ly = cell_x - self.origin[0], cell_y - self.origin[1]
+        h, w = self.dist.shape
+        inside = (lx >= 0) & (lx < w) & (ly >= 0) & (ly < h)
+        result = np.full(cell_x.shape, -1, dtype=np.int32)
+        result[inside] = self.dist[ly[inside], lx[inside]]
+        return result
+
+    def steer(self, x, y, dir_x, dir_y, step):
+        """
+        Следующая клетка пути для врагов в точках (x, y).
+        dir_x, dir_y — прямое направление на цель, step — длина шага за тик.
+        Если шаг по прямой не упирается в препятствие и клетка впереди ближе к цели
+        по полю, враг идёт напрямую (routed = False), иначе — в центр соседней клетки,
+        ближайшей к цели по полю.
+        Возвращает (target_x, target_y, routed).
+        """
+        x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+        dir_x, dir_y = np.asarray(dir_x, dtype=np.float64), np.asarray(dir_y, dtype=np.float64)
+        cell_x, cell_y = np.rint(x).astype(np.int64), np.rint(y).astype(np.int64)
+        here = self.distance_at(cell_x, cell_y)
+
+        # прямой путь годится, если клетка на шаг впереди ближе к цели по полю,
+        # а клетка после шага этого тика свободна (враг не срежет угол препятствия)
+        norm = np.sqrt(dir_x * dir_x + dir_y * dir_y)
+        norm[norm == 0] = 1.0
+        unit_x, unit_y = dir_x / norm, dir_y / norm
+        ahead = self.distance_at(np.rint(x + unit_x), np.rint(y + unit_y))
+        landing = self.distance_at(np.rint(x + unit_x * step), np.rint(y + unit_y * step))
+        direct = (ahead >= 0) & (ahead < here) & (landing >= 0)
+
+        # расстояния в 8 соседних клетках; диагональ — только без срезания углов
+        nx = cell_x[:, None] + NEIGHBOURS[:, 0]
+        ny = cell_y[:, None] + NEIGHBOURS[:, 1]
+        nd = self.distance_at(nx, ny)
+        sides = nd[:, DIAGONAL_SIDES] >= 0
+        nd[:, 4:][~(sides[:, :, 0] & sides[:, :, 1])] = -1
+        valid = (nd >= 0) & (nd < here[:, None])
+
+        # минимум расстояния; при равенстве — сосед, чей центр ближе к врагу
+        # (выбор не меняется, пока враг к нему идёт, поэтому враг не дёргается между равными путями)
+        near = np.hypot(nx - x[:, None], ny - y[:, None])
+        score = np.where(valid, nd, np.iinfo(np.int32).max).astype(np.float64) + 0.1 * near
+        best = np.argmin(score, axis=1)
+        rows = np.arange(len(best))
+
+        routed = (here > 1) & ~direct & valid[rows, best]
+        return nx[rows, best], ny[rows, best], routed
+
+    def next_cell(self, x, y, dir_x, dir_y, step):
+        """steer() для одного врага: клетка (x, y), в которую идти, или None — идти напрямую"""
+        tx, ty, routed = self.steer([x], [y], [dir_x], [dir_y], step)
+        if not routed[0]:
+            return None
+        return int(tx[0]), int(ty[0])
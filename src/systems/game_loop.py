@@ -0,0 +1,58 @@
+class FixedStepLoop:
+    """
+    Планировщик игрового цикла с фиксированным шагом симуляции.
+    Симуляция идёт тиками постоянной длины (dt = 1 / tick_rate) независимо от FPS,
+    а отрисовка интерполирует позиции между двумя последними тиками (alpha).
+    - max_steps: предел догоняющих тиков за один кадр; остальное отставание отбрасывается,
+      чтобы долгий кадр на большой карте не раскачивал симуляцию («спираль смерти»)
+    - step_scale: множитель для скоростей, заданных в клетках за тик при reference_rate
+    """
+
+    def __init__(self, tick_rate=30, max_steps=5, reference_rate=60, max_frame_time=0.25):
+        self.tick_rate = tick_rate            # тиков симуляции в секунду
+        self.dt = 1.0 / tick_rate             # длительность тика в секундах
+        self.max_steps = max_steps            # максимум тиков за кадр
+        self.max_frame_time = max_frame_time  # кадр длиннее считается равным этому значению
+        self.step_scale = reference_rate / tick_rate  # пересчёт скоростей под частоту тиков
+        self.accumulator = 0.0                # накопленное, ещё не просимулированное время
+        self.ticks = 0                        # всего выполнено тиков
+        self.dropped_ticks = 0                # тиков отброшено из-за предела max_steps
+
+    def advance(self, frame_time):
+        """
+        Учитывает время кадра (в секундах) и возвращает число тиков,
+        которые нужно выполнить в этом кадре.
+        """
+        self.accumulator += min(frame_time, self.max_frame_time)
+        steps = 0
+        while self.accumulator >= self.dt and steps < self.max_steps:
+            self.accumulator -= self.dt
+            steps += 1
+
+        if self.accumulator >= self.dt:
+            # не успеваем догнать — отбрасываем отставание, сохраняя долю тика для интерполяции
+            lag = int(self.accumulator / self.dt)
+            self.dropped_ticks += lag
+            self.accumulator -= lag * self.dt
+
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """Доля до следующего тика (0..1) для интерполяции позиций при отрисовке"""
+        return self.accumulator / self.dt
+
+    @property
+    def sim_time_ms(self):
+        """Время симуляции в миллисекундах (для таймеров атак)"""
+        return int(self.ticks * 1000 / self.tick_rate)
+
+    def reset(self):
+        """Сброс накопленного времени (например, после паузы)"""
+        self.accumulator = 0.0
+
+
+def lerp(previous, current, alpha):
+    """Линейная интерполяция между положением на прошлом и текущем тике"""
+    return previous + (current - previous) * alpha
@@ -0,0 +1,164 @@
+import time  # таймер для замеров
+from array import array  # компактный кольцевой буфер времени кадров
+
+import pygame as pg  # библиотека pygame для отрисовки оверлея
+
+TOGGLE_KEY = pg.K_F3  # клавиша включения оверлея
+
+GRAPH_FRAMES = 240     # сколько последних кадров показывает график
+GRAPH_HEIGHT = 60      # высота графика в пикселях
+GRAPH_MAX_MS = 50.0    # верх шкалы графика (мс)
+TARGET_LINES_MS = (1000 / 60, 1000 / 30)  # ориентиры: 60 и 30 FPS
+
+
+class FrameProfiler:
+    """
+    Профилировщик кадра с оверлеем (включается клавишей F3).
+    - begin_frame(): начало кадра; время между вызовами — полное время кадра
+    - mark(stage): закрывает этап кадра (время с прошлой отметки)
+    - count(name, n): счётчики за кадр (блиты, вызовы transform.scale и т.п.)
+    Замеры всегда включены и стоят несколько вызовов perf_counter за кадр;
+    текст и график оверлея пересобираются не чаще refresh_interval и только когда он виден.
+    """
+
+    def __init__(self, history=1000, refresh_interval=0.25, smoothing=0.05):
+        self.enabled = False                        # виден ли оверлей
+        self.history = history                      # длина истории кадров (для 1% / 0.1% lows)
+        self.frame_times = array("d", [0.0]) * history  # кольцевой буфер времени кадров (с)
+        self.frames = 0                             # всего записано кадров
+        self.smoothing = smoothing                  # коэффициент скользящего среднего по этапам
+        self.stage_times = {}                       # этап -> сглаженное время (с)
+        self.counters = {}                          # счётчики текущего кадра
+        self.last_counters = {}                     # счётчики прошлого (завершённого) кадра
+        self.refresh_interval = refresh_interval    # период обновления оверлея (с)
+        self._frame_stages = {}                     # этап -> время в текущем кадре
+        self._frame_start = None                    # начало текущего кадра
+        self._mark = 0.0                            # время последней отметки
+        self._panel = None                          # готовая поверхность оверлея
+        self._next_refresh = 0.0                    # когда пересобрать оверлей
+        self._font = None                           # шрифт создаётся при первом показе
+
+    def toggle(self):
+        """Показать / скрыть оверлей"""
+        self.enabled = not self.enabled
+        self._panel = None
+
+    # --- замеры ---
+
+    def begin_frame(self):
+        """Начало кадра: закрывает прошлый кадр и переносит его замеры в статистику"""
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self.frame_times[self.frames % self.history] = now - self._frame_start
+            self.frames += 1
+
+            # сглаживаем этапы; этап, не встретившийся в кадре, считается нулевым
+            k, stages, current = self.smoothing, self.stage_times, self._frame_stages
+            for stage in [*stages, *(s for s in current if s not in stages)]:  # порядок этапов кадра
+                elapsed = current.get(stage, 0.0)
+                previous = stages.get(stage)
+                stages[stage] = elapsed if previous is None else previous + (elapsed - previous) * k
+
+        self._frame_start = self._mark = now
+        self._frame_stages = {}
+        self.last_counters, self.counters = self.counters, {}
+
+    def mark(self, stage):
+        """Закрывает этап stage: время с прошлой отметки добавляется к нему"""
+        now = time.perf_counter()
+        stages = self._frame_stages
+        stages[stage] = stages.get(stage, 0.0) + now - self._mark
+        self._mark = now
+
+    def count(self, name, n=1):
+        """Увеличивает счётчик текущего кадра"""
+        counters = self.counters
+        counters[name] = counters.get(name, 0) + n
+
+    # --- статистика ---
+
+    def recent_frame_times(self, n=None):
+        """Время последних n кадров (с), от старых к новым"""
+        filled = min(self.frames, self.history)
+        n = filled if n is None else min(n, filled)
+        start = self.frames - n
+        return [self.frame_times[i % self.history] for i in range(start, self.frames)]
+
+    def stats(self):
+        """Сводка: FPS, 1% / 0.1% lows, время этапов (мс) и счётчики прошлого кадра"""
+        times = self.recent_frame_times()
+        if not times:
+            return {"fps": 0.0, "frame_ms": 0.0, "low_1": 0.0, "low_01": 0.0,
+                    "stages_ms": {}, "counters": dict(self.last_counters)}
+
+        def low(fraction):
+            # средний FPS по худшей доле кадров
+            worst = sorted(times, reverse=True)[:max(1, int(len(times) * fraction))]
+            return len(worst) / sum(worst) if sum(worst) > 0 else 0.0
+
+        average = sum(times) / len(times)
+        return {
+            "fps": 1 / average if average > 0 else 0.0,
+            "frame_ms": average * 1000,
+            "low_1": low(0.01),
+            "low_01": low(0.001),
+            "stages_ms": {stage: t * 1000 for stage, t in self.stage_times.items()},
+            "counters": dict(self.last_counters),
+        }
+
+    # --- оверлей ---
+
+    def draw(self, screen):
+        """Рисует оверлей в левом нижнем углу (если он включён)"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._panel is None or now >= self._next_refresh:
+            self._panel = self._build_panel()
+            self._next_refresh = now + self.refresh_interval
+        screen.blit(self._panel, (10, screen.get_height() - self._panel.get_height() - 10))
+
+    def _build_panel(self):
+        if self._font is None:
+            self._font = pg.font.SysFont(None, 20)
+        font, stats = self._font, self.stats()
+
+        # строки оверлея: (подпись, значение) — значения выровнены по второй колонке
+        lines = [
+            ("FPS", f"{stats['fps']:.0f}  ({stats['frame_ms']:.1f} ms)"),
+            ("1% / 0.1% low", f"{stats['low_1']:.0f} / {stats['low_01']:.0f}"),
+        ]
+        lines += [(stage, f"{ms:.2f} ms") for stage, ms in stats["stages_ms"].items()]
+        lines += [(name, str(value)) for name, value in sorted(stats["counters"].items())]
+
+        line_height = font.get_linesize()
+        width = GRAPH_FRAMES + 20
+        height = len(lines) * line_height + GRAPH_HEIGHT + 20
+        panel = pg.Surface((width, height), pg.SRCALPHA)
+        panel.fill((0, 0, 0, 170))  # полупрозрачная подложка
+
+        for i, (label, value) in enumerate(lines):
+            y = 5 + i * line_height
+            panel.blit(font.render(label, True, (170, 170, 170)), (10, y))
+            panel.blit(font.render(value, True, (230, 230, 230)), (120, y))
+
+        # --- график времени кадра ---
+        top = height - GRAPH_HEIGHT - 5
+        bottom = top + GRAPH_HEIGHT
+
+        def to_y(ms):
+            return bottom - int(min(ms, GRAPH_MAX_MS) / GRAPH_MAX_MS * GRAPH_HEIGHT)
+
+        for target in TARGET_LINES_MS:
+            pg.draw.line(panel, (90, 90, 90), (10, to_y(target)), (10 + GRAPH_FRAMES, to_y(target)))
+
+        times = self.recent_frame_times(GRAPH_FRAMES)
+        if len(times) >= 2:
+            offset = 10 + GRAPH_FRAMES - len(times)
+            points = [(offset + i, to_y(t * 1000)) for i, t in enumerate(times)]
+            pg.draw.lines(panel, (80, 220, 80), False, points)
+        return panel
+
+
+# --- Общий экземпляр: счётчики пишут пути отрисовки, оверлей рисует game.py ---
+PROFILER = FrameProfiler()
@@ -0,0 +1,64 @@
+from operator import itemgetter  # ключ сортировки команд
+
+from src.systems.profiler import PROFILER  # счётчики кадра
+
+# --- Слои (рисуются по возрастанию) ---
+GROUND = 0  # предметы на земле
+UNITS = 1   # юниты и верхушки деревьев — внутри слоя по y (кто ниже на экране, тот ближе)
+
+LAYER_NAMES = {GROUND: "ground", UNITS: "units"}
+
+_order = itemgetter(0, 1, 2)  # (слой, y, номер команды)
+
+
+class RenderQueue:
+    """
+    Очередь отрисовки кадра.
+    - submit(...) / submit_sprite(...): команды (поверхность, позиция, область, слой, y) от всех слоёв
+    - flush(target): команды сортируются по слою и y (при равных — в порядке подачи)
+      и выводятся одним вызовом target.blits
+    - commands / batches: число команд и вызовов blits в последнем flush
+    """
+
+    def __init__(self):
+        self._commands = []  # (слой, y, номер, поверхность, позиция, область)
+        self.commands = 0    # команд в последнем flush
+        self.batches = 0     # вызовов blits в последнем flush
+
+    def submit(self, surface, dest, area=None, layer=UNITS, y=0.0):
+        """Команда: нарисовать surface (или её область area) в dest; y — глубина внутри слоя"""
+        commands = self._commands
+        commands.append((layer, y, len(commands), surface, dest, area))
+
+    def submit_sprite(self, atlas, name, dest, layer=UNITS, y=0.0):
+        """Команда для спрайта name из атласа зума"""
+        page, rect = atlas.region(name)
+        commands = self._commands
+        commands.append((layer, y, len(commands), page, dest, rect))
+
+    def __len__(self):
+        return len(self._commands)
+
+    def flush(self, target):
+        """Сортирует команды и выводит их на target одним пакетом. Возвращает число команд."""
+        commands = self._commands
+        self._commands = []
+        self.commands, self.batches = len(commands), 0
+        if not commands:
+            return 0
+
+        commands.sort(key=_order)
+        target.blits([(surface, dest, area) for _, _, _, surface, dest, area in commands], doreturn=False)
+        self.batches = 1
+
+        layers = {}
+        for command in commands:
+            layers[command[0]] = layers.get(command[0], 0) + 1
+        for layer, n in layers.items():
+            PROFILER.count(f"queue {LAYER_NAMES.get(layer, layer)}", n)
+        PROFILER.count("blits", len(commands))
+        return len(commands)
+
+    def clear(self):
+        """Отбрасывает накопленные команды"""
+        self._commands = []
@@ -0,0 +1,296 @@
+"""
+Двоичный формат сохранения.
+
+Файл: заголовок (магия, версия формата, сжатие), несжатые метаданные фиксированного размера
+и тело — последовательность секций с упакованными массивами. Тело пишется и читается потоком
+через выбранный компрессор, поэтому большая карта не собирается в памяти целиком.
+Метаданные лежат на известном смещении: список слотов читает их, не трогая тело.
+
+    заголовок   MAGIC | u16 версия | u8 сжатие
+    метаданные  (с версии 2) 32s версия игры | f64 время сохранения (unix) | f64 время игры, с
+                | u32 радиус карты | f64 здоровье игрока | u32 врагов | u32 живых врагов
+                | u32 препятствий | (с версии 3) i64 зерно мира, -1 — неизвестно
+                | u16 ширина миниатюры | u16 высота | RGB[ширина * высота]
+    игрок       f64 x | f64 y | f64 здоровье
+    враги       u32 n | f64[n] x | f64[n] y | u8[n] alive
+    типы        u16 n | n строк (u16 длина + UTF-8) — таблица видов одиночных препятствий
+    препятствия u32 n | n записей по порядку добавления:
+                  u8 OBSTACLE | i32 x | i32 y | u16 вид
+                  u8 MOUNTAINS / WATER | u32 клеток | i32[клеток] x | i32[клеток] y
+Все числа — little-endian.
+"""
+import gzip  # поток deflate (zlib) с потоковым чтением
+import io  # буфер для отдельно сжатых секций
+import lzma  # поток LZMA: медленнее, но плотнее
+import struct  # упаковка чисел заголовка и записей
+import sys  # порядок байтов платформы
+import time  # время сохранения в метаданных
+import zlib  # ошибки распаковки deflate
+from array import array  # упакованные массивы координат
+
+MAGIC = b"RTSSAVE\0"  # сигнатура двоичного сохранения
+SAVE_VERSION = 3      # версия формата: читаются файлы версии не новее этой
+META_VERSION = 2      # первая версия с блоком метаданных
+SEED_VERSION = 3      # первая версия с зерном мира в метаданных
+NO_SEED = -1          # зерно в метаданных: мир не из генератора или зерно не целое
+
+COMPRESSION = {"none": 0, "zlib": 1, "lzma": 2}  # код сжатия в заголовке
+COMPRESSION_NAMES = {code: name for name, code in COMPRESSION.items()}
+
+OBSTACLE, MOUNTAINS, WATER = 0, 1, 2  # тип записи препятствия
+GROUP_RECORDS = {"MountainGroup": MOUNTAINS, "WaterGroup": WATER}
+
+PAUSE_EVERY = 256  # записей препятствий между паузами фоновой записи
+
+HEADER = struct.Struct("<8sHB")
+META = struct.Struct("<32sddIdIIIqHH")
+META_FIELDS = ("game_version", "saved_at", "playtime_s", "map_radius", "player_health",
+               "enemies", "enemies_alive", "obstacles", "seed", "thumbnail_width", "thumbnail_height")
+META_V2 = struct.Struct("<32sddIdIIIHH")  # метаданные версии 2 — без зерна
+META_FIELDS_V2 = tuple(name for name in META_FIELDS if name != "seed")
+PLAYER = struct.Struct("<ddd")
+SINGLE = struct.Struct("<iiH")
+U8, U16, U32 = struct.Struct("<B"), struct.Struct("<H"), struct.Struct("<I")
+
+
+class SaveFormatError(Exception):
+    """Файл не является двоичным сохранением или записан более новой версией игры"""
+
+
+def is_binary_save(path):
+    """Файл начинается с сигнатуры двоичного сохранения"""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+# --- потоки ---
+
+def _open_body(f, compression, mode):
+    # тело файла поверх уже открытого файла: без сжатия, deflate или LZMA
+    if compression == COMPRESSION["zlib"]:
+        return gzip.GzipFile(fileobj=f, mode=mode, compresslevel=6, mtime=0)
+    if compression == COMPRESSION["lzma"]:
+        return lzma.LZMAFile(f, mode=mode)
+    return f
+
+
+def _write_array(out, typecode, values):
+    data = array(typecode, values)
+    if sys.byteorder == "big":
+        data.byteswap()  # в файле всегда little-endian
+    out.write(data.tobytes())
+
+
+def _read_exact(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise SaveFormatError("файл сохранения обрезан")
+    return data
+
+
+def _read_array(stream, typecode, count):
+    data = array(typecode)
+    data.frombytes(_read_exact(stream, data.itemsize * count))
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data
+
+
+def _read(stream, fmt):
+    return fmt.unpack(_read_exact(stream, fmt.size))
+
+
+# --- запись ---
+
+def write_player(out, x, y, health):
+    """Секция игрока"""
+    out.write(PLAYER.pack(x, y, health))
+
+
+def write_enemies(out, xs, ys, alive):
+    """Секция врагов: число врагов и три упакованных массива"""
+    out.write(U32.pack(len(xs)))
+    _write_array(out, "d", xs)
+    _write_array(out, "d", ys)
+    out.write(bytes(bool(a) for a in alive))
+
+
+def write_obstacles(out, obstacles, pause=None):
+    """
+    Секция препятствий: таблица видов и записи по порядку добавления.
+    pause — вызывается каждые PAUSE_EVERY записей (фоновая запись отдаёт процессор игре).
+    """
+    # таблица видов одиночных препятствий (дерево, куст...) — в записях только номер
+    kinds = {}
+    for o in obstacles:
+        if hasattr(o, "x"):
+            kinds.setdefault(o.kind, len(kinds))
+    out.write(U16.pack(len(kinds)))
+    for kind in kinds:
+        encoded = kind.encode("utf-8")
+        out.write(U16.pack(len(encoded)) + encoded)
+
+    out.write(U32.pack(len(obstacles)))
+    for i, o in enumerate(obstacles):
+        if pause is not None and i % PAUSE_EVERY == 0:
+            pause()
+        if hasattr(o, "x"):  # одиночный объект-препятствие
+            out.write(U8.pack(OBSTACLE) + SINGLE.pack(int(o.x), int(o.y), kinds[o.kind]))
+        else:  # группа клеток: два плоских массива координат
+            xs, ys = o.cell_arrays()
+            out.write(U8.pack(GROUP_RECORDS[o.__class__.__name__]) + U32.pack(len(xs)))
+            _write_array(out, "i", xs.tolist())
+            _write_array(out, "i", ys.tolist())
+
+
+def make_metadata(player_health, enemies, enemies_alive, obstacles, game_version="", playtime_s=0.0,
+                  map_radius=0, thumbnail=None, saved_at=None, seed=None):
+    """
+    Метаданные сохранения: здоровье игрока, число врагов (всего и живых), число препятствий и т.д.
+    thumbnail — (ширина, высота, байты RGB) или None; saved_at по умолчанию — текущее время.
+    seed — зерно мира (World.seed): по нему загрузка собирает карту из кэша миров.
+    """
+    width, height, pixels = thumbnail or (0, 0, b"")
+    return {
+        "game_version": game_version,
+        "saved_at": time.time() if saved_at is None else saved_at,
+        "playtime_s": playtime_s,
+        "map_radius": map_radius,
+        "player_health": player_health,
+        "enemies": enemies,
+        "enemies_alive": enemies_alive,
+        "obstacles": obstacles,
+        "seed": seed,
+        "thumbnail_width": width,
+        "thumbnail_height": height,
+        "thumbnail": pixels,
+    }
+
+
+def _write_header(f, code, meta):
+    f.write(HEADER.pack(MAGIC, SAVE_VERSION, code))
+    values = [meta[name] for name in META_FIELDS]
+    values[0] = values[0].encode("utf-8")  # struct обрезает или дополняет нулями до 32 байт
+    seed = meta.get("seed")
+    values[META_FIELDS.index("seed")] = seed if isinstance(seed, int) and 0 <= seed < 2 ** 63 else NO_SEED
+    f.write(META.pack(*values))
+    f.write(meta["thumbnail"])
+
+
+def write_save(f, player, enemies, obstacles, compression="zlib", meta=None):
+    """
+    Пишет сохранение в открытый двоичный файл f потоком; compression: none, zlib или lzma.
+    meta — метаданные make_metadata (по умолчанию только счётчики и время сохранения).
+    """
+    code = COMPRESSION[compression]
+    enemies = list(enemies)
+    if meta is None:
+        meta = make_metadata(player.health, len(enemies), sum(1 for e in enemies if e.alive), len(obstacles))
+    _write_header(f, code, meta)
+    body = _open_body(f, code, "wb")
+    write_player(body, player.x, player.y, player.health)
+    write_enemies(body, [e.x for e in enemies], [e.y for e in enemies], [e.alive for e in enemies])
+    write_obstacles(body, obstacles)
+    if body is not f:
+        body.close()  # дописывает хвост компрессора, сам файл f не закрывается
+
+
+def pack_section(compression, write, *args, **kwargs):
+    """
+    Секция, сжатая отдельно: write(out, *args) пишет её в буфер.
+    Сжатые секции склеиваются в тело файла (gzip и xz читают подряд идущие потоки как один),
+    поэтому неизменившуюся секцию можно хранить готовой и не сжимать заново.
+    """
+    buffer = io.BytesIO()
+    body = _open_body(buffer, COMPRESSION[compression], "wb")
+    write(body, *args, **kwargs)
+    if body is not buffer:
+        body.close()
+    return buffer.getvalue()
+
+
+def write_sections(f, compression, sections, meta):
+    """Пишет сохранение из готовых секций pack_section (игрок, враги, препятствия) и метаданных"""
+    _write_header(f, COMPRESSION[compression], meta)
+    for section in sections:
+        f.write(section)
+
+
+# --- чтение ---
+
+def read_metadata(f):
+    """
+    Читает заголовок и метаданные из начала открытого двоичного файла f (тело не читается).
+    Возвращает словарь: format_version, compression и поля META_FIELDS с миниатюрой;
+    у файлов версии 1 метаданных нет — в словаре только format_version и compression,
+    у файлов версии 2 нет зерна — seed равен None.
+    """
+    magic, version, code = _read(f, HEADER)
+    if magic != MAGIC:
+        raise SaveFormatError("это не двоичное сохранение")
+    if version > SAVE_VERSION:
+        raise SaveFormatError(f"сохранение версии {version} новее игры (поддерживается {SAVE_VERSION})")
+    if code not in COMPRESSION_NAMES:
+        raise SaveFormatError(f"неизвестное сжатие {code}")
+    meta = {"format_version": version, "compression": COMPRESSION_NAMES[code]}
+    if version >= SEED_VERSION:
+        meta.update(zip(META_FIELDS, _read(f, META)))
+        if meta["seed"] == NO_SEED:
+            meta["seed"] = None
+    elif version >= META_VERSION:
+        meta.update(zip(META_FIELDS_V2, _read(f, META_V2)), seed=None)
+    if version >= META_VERSION:
+        meta["game_version"] = meta["game_version"].rstrip(b"\0").decode("utf-8", "replace")
+        meta["thumbnail"] = _read_exact(f, meta["thumbnail_width"] * meta["thumbnail_height"] * 3)
+    return meta
+
+
+def read_save(f, obstacle_types):
+    """
+    Читает сохранение из открытого двоичного файла f.
+    obstacle_types: {"Obstacle": класс, "MountainGroup": класс, "WaterGroup": класс}.
+    Возвращает словарь того же вида, что и JSON-загрузка: player, enemies, obstacles,
+    и метаданные в meta.
+    """
+    meta = read_metadata(f)
+    body = _open_body(f, COMPRESSION[meta["compression"]], "rb")
+    try:
+        data = _read_body(body, obstacle_types)
+        data["meta"] = meta
+        return data
+    except (EOFError, OSError, zlib.error, lzma.LZMAError, UnicodeDecodeError, IndexError) as error:
+        raise SaveFormatError(f"повреждённые данные: {error}") from error
+
+
+def _read_body(body, obstacle_types):
+    x, y, health = _read(body, PLAYER)
+    player = {"x": x, "y": y, "health": health}
+
+    (count,) = _read(body, U32)
+    xs, ys = _read_array(body, "d", count), _read_array(body, "d", count)
+    alive = _read_exact(body, count)
+    enemies = [{"x": ex, "y": ey, "alive": bool(a)} for ex, ey, a in zip(xs, ys, alive)]
+
+    (count,) = _read(body, U16)
+    kinds = []
+    for _ in range(count):
+        (length,) = _read(body, U16)
+        kinds.append(_read_exact(body, length).decode("utf-8"))
+
+    single = obstacle_types["Obstacle"]
+    groups = {MOUNTAINS: obstacle_types["MountainGroup"], WATER: obstacle_types["WaterGroup"]}
+    (count,) = _read(body, U32)
+    obstacles = []
+    for _ in range(count):
+        (record,) = _read(body, U8)
+        if record == OBSTACLE:
+            ox, oy, kind = _read(body, SINGLE)
+            obstacles.append(single(ox, oy, kinds[kind]))
+        elif record in groups:
+            (cells,) = _read(body, U32)
+            gx, gy = _read_array(body, "i", cells), _read_array(body, "i", cells)
+            obstacles.append(groups[record](zip(gx, gy)))
+        else:
+            raise SaveFormatError(f"неизвестная запись препятствия {record}")
+
+    return {"player": player, "enemies": enemies, "obstacles": obstacles}
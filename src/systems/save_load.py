@@ -1,11 +1,79 @@
 import json
 import os
+import threading
+import pygame as pg
+from src import settings
 from src.map.obstacles import Obstacle, MountainGroup, WaterGroup
+from src.systems.save_format import (SAVE_VERSION, SaveFormatError, is_binary_save, make_metadata, read_metadata, read_save,
+                                     write_save)
 
-SAVE_FILE = "savegame.json"  # один файл для сохранения
+SAVE_FILE = "savegame.sav"    # основной файл сохранения (двоичный формат, см. save_format)
+EXPORT_FILE = "savegame.json"  # экспорт в JSON для отладки и ручного просмотра
+AUTOSAVE_FILE = os.path.join(settings.SAVES_DIR, "autosave.sav")  # слот автосохранения
 
-def save_game(player, enemies, obstacles):
-    """Сохраняем состояние игры в JSON."""
+INDEX_FILE = "index.json"      # индекс слотов в каталоге сохранений
+INDEX_VERSION = 1
+SAVE_EXTENSIONS = (".sav", ".json")  # файлы слотов (JSON — старые сохранения и экспорт)
+
+OBSTACLE_TYPES = {"Obstacle": Obstacle, "MountainGroup": MountainGroup, "WaterGroup": WaterGroup}
+
+
+def slot_path(slot):
+    """Путь к файлу слота сохранения (saves/save_slot_N.sav)."""
+    return os.path.join(settings.SAVES_DIR, f"save_slot_{slot}.sav")
+
+
+def atomic_write(path, write):
+    """
+    Записывает файл через временный и атомарное переименование:
+    при сбое посреди записи прежнее сохранение остаётся целым.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())  # данные на диске до переименования
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def make_thumbnail(surface, size=settings.SAVE_THUMBNAIL_SIZE):
+    """Миниатюра кадра для метаданных: (ширина, высота, байты RGB)"""
+    small = pg.transform.scale(surface, size)
+    return size[0], size[1], pg.image.tobytes(small, "RGB")
+
+
+def world_metadata(world, playtime_s=0.0, screen=None):
+    """Метаданные сохранения мира (World); screen — кадр для миниатюры"""
+    return make_metadata(world.player.health, len(world.enemy_pool), world.enemy_pool.alive_count(),
+                         len(world.obstacles), game_version=settings.GAME_VERSION, playtime_s=playtime_s,
+                         map_radius=world.box_map.radius, seed=world.seed,
+                         thumbnail=make_thumbnail(screen) if screen is not None else None)
+
+
+def save_game(player, enemies, obstacles, path=SAVE_FILE, compression="zlib", meta=None):
+    """
+    Сохраняем состояние игры в двоичном формате (compression: none, zlib или lzma).
+    meta — метаданные (world_metadata); без них записываются только счётчики и время.
+    """
+    if meta is None:
+        enemies = list(enemies)
+        meta = make_metadata(player.health, len(enemies), sum(1 for e in enemies if e.alive), len(obstacles),
+                             game_version=settings.GAME_VERSION)
+    atomic_write(path, lambda f: write_save(f, player, enemies, obstacles, compression=compression, meta=meta))
+    SAVE_INDEX.record(path, meta, compression)
+    print(f"Игра сохранена → {path}")
+
+
+def export_json(player, enemies, obstacles, path=EXPORT_FILE):
+    """Сохраняем состояние игры в JSON (экспорт и отладка)."""
     data = {
         "player": {
             "x": player.x,
@@ -33,22 +101,43 @@ def save_game(player, enemies, obstacles):
                 "type": o.__class__.__name__
             })
 
-    with open(SAVE_FILE, "w", encoding="utf-8") as f:
+    with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=4)
-    print(f"Игра сохранена → {SAVE_FILE}")
+    print(f"Игра экспортирована → {path}")
 
 
-def load_game():
-    """Загружаем состояние игры из JSON."""
-    if not os.path.exists(SAVE_FILE):
+def load_game(path=None, header_only=False):
+    """
+    Загружаем состояние игры: двоичное сохранение или JSON (формат определяется по сигнатуре).
+    path по умолчанию — savegame.sav, а если его ещё нет — старое сохранение savegame.json.
+    header_only — прочитать только метаданные двоичного сохранения (тело не читается).
+    """
+    if path is None:
+        path = SAVE_FILE if os.path.exists(SAVE_FILE) else EXPORT_FILE
+    if not os.path.exists(path):
         print("Сохранение отсутствует.")
         return None
 
-    if os.path.getsize(SAVE_FILE) == 0:
+    if os.path.getsize(path) == 0:
         print("Файл сохранения пуст.")
         return None
 
-    with open(SAVE_FILE, "r", encoding="utf-8") as f:
+    if is_binary_save(path):
+        with open(path, "rb") as f:
+            try:
+                return read_metadata(f) if header_only else read_save(f, OBSTACLE_TYPES)
+            except SaveFormatError as error:
+                print(f"Ошибка: повреждённый файл сохранения ({error}).")
+                return None
+
+    if header_only:
+        return {"format_version": 0, "compression": "json"}  # у JSON-сохранений нет заголовка
+    return import_json(path)
+
+
+def import_json(path=EXPORT_FILE):
+    """Загружаем состояние игры из JSON."""
+    with open(path, "r", encoding="utf-8") as f:
         try:
             data = json.load(f)
         except json.JSONDecodeError:
@@ -75,3 +164,100 @@ def load_game():
         "enemies": enemies_data,
         "obstacles": obstacles
     }
+
+
+class SaveIndex:
+    """
+    Индекс слотов сохранения (saves/index.json): метаданные каждого файла без миниатюры,
+    размер и время изменения. Меню читает список слотов из индекса, не открывая сами сохранения.
+    - запись сохранения обновляет его строку в индексе (record)
+    - файлы, изменённые в обход индекса, перечитываются по заголовку (только метаданные)
+    - JSON-сохранения не разбираются: для них известны только размер и время файла
+    """
+
+    def __init__(self, directory=settings.SAVES_DIR):
+        self.directory = directory                       # каталог слотов
+        self.path = os.path.join(directory, INDEX_FILE)  # файл индекса
+        self._entries = None                             # имя файла -> строка индекса
+        self._lock = threading.Lock()                    # record вызывается и из потока автосохранения
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._entries = data["slots"] if data.get("version") == INDEX_VERSION else {}
+            except (OSError, ValueError, KeyError, AttributeError):
+                self._entries = {}  # индекса нет или он повреждён — соберётся заново
+        return self._entries
+
+    def _save(self):
+        data = json.dumps({"version": INDEX_VERSION, "slots": self._entries}, ensure_ascii=False, indent=1)
+        try:
+            atomic_write(self.path, lambda f: f.write(data.encode("utf-8")))
+        except OSError as error:
+            print(f"Не удалось обновить индекс сохранений: {error}")
+
+    def _owns(self, path):
+        return os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.directory)
+
+    @staticmethod
+    def _entry(path, stat, meta):
+        entry = {name: value for name, value in meta.items() if name != "thumbnail"}
+        entry.update(size=stat.st_size, mtime=stat.st_mtime)
+        entry.setdefault("saved_at", stat.st_mtime)
+        return entry
+
+    def record(self, path, meta, compression):
+        """Обновляет строку индекса после записи сохранения path с метаданными meta"""
+        if not self._owns(path):
+            return  # файл вне каталога слотов
+        meta = dict(meta, format_version=SAVE_VERSION, compression=compression)
+        with self._lock:
+            entries = self._load()
+            entries[os.path.basename(path)] = self._entry(path, os.stat(path), meta)
+            self._save()
+
+    def slots(self):
+        """
+        Список слотов (новые сверху): метаданные, file, size, mtime.
+        Сверяет индекс с каталогом: читаются только заголовки новых и изменённых файлов.
+        """
+        with self._lock:
+            entries = self._load()
+            changed = False
+            present = set()
+            try:
+                files = [e for e in os.scandir(self.directory)
+                         if e.is_file() and e.name.endswith(SAVE_EXTENSIONS) and e.name != INDEX_FILE]
+            except OSError:
+                files = []
+            for file in files:
+                present.add(file.name)
+                stat = file.stat()
+                entry = entries.get(file.name)
+                if entry is not None and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+                    continue
+                meta = load_game(file.path, header_only=True)
+                if meta is None:
+                    continue
+                entries[file.name] = self._entry(file.path, stat, meta)
+                changed = True
+            for name in set(entries) - present:  # файл удалён
+                del entries[name]
+                changed = True
+            if changed:
+                self._save()
+            slots = [dict(entry, file=name) for name, entry in entries.items()]
+        return sorted(slots, key=lambda slot: slot["saved_at"], reverse=True)
+
+    def thumbnail(self, name):
+        """Миниатюра слота (pygame.Surface) из заголовка файла или None"""
+        meta = load_game(os.path.join(self.directory, name), header_only=True)
+        if not meta or not meta.get("thumbnail"):
+            return None
+        size = meta["thumbnail_width"], meta["thumbnail_height"]
+        return pg.image.frombytes(meta["thumbnail"], size, "RGB")
+
+
+SAVE_INDEX = SaveIndex()  # индекс слотов каталога сохранений
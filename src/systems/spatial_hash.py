@@ -0,0 +1,150 @@
+import math  # модуль для математических функций
+
+
+def _position(obj):
+    # координаты сущности по умолчанию: поля x, y
+    return obj.x, obj.y
+
+
+class SpatialHash:
+    """
+    Пространственный хэш (равномерная сетка) для подвижных сущностей:
+    врагов, игрока и лежащего на земле оружия.
+    - cell_size: сторона ячейки хэша в клетках карты
+    - move(): пересчитывает корзину, только если сущность перешла в другую ячейку
+    - query_radius / nearest / query_rect: поиск соседей без перебора всех сущностей
+    Точные координаты берутся у самих сущностей (position), поэтому движение
+    внутри ячейки не требует обновлений.
+    """
+
+    def __init__(self, cell_size=4, position=_position):
+        self.cell_size = cell_size  # сторона ячейки в клетках карты
+        self.position = position    # функция: сущность -> (x, y)
+        self._buckets = {}          # (cx, cy) -> {сущность: None} (порядок вставки)
+        self._cells = {}            # сущность -> (cx, cy)
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __contains__(self, obj):
+        return obj in self._cells
+
+    def cell_of(self, x, y):
+        """Ячейка хэша для точки (x, y)"""
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    # --- изменения ---
+
+    def insert(self, obj, x=None, y=None):
+        """Добавляет сущность (координаты по умолчанию берутся из неё самой)"""
+        self.move(obj, x, y)
+
+    def move(self, obj, x=None, y=None):
+        """Обновляет положение сущности; корзина меняется только при смене ячейки"""
+        if x is None or y is None:
+            x, y = self.position(obj)
+        cell = self.cell_of(x, y)
+        old = self._cells.get(obj)
+        if old == cell:
+            return
+        if old is not None:
+            self._discard(obj, old)
+        self._cells[obj] = cell
+        self._buckets.setdefault(cell, {})[obj] = None
+
+    def remove(self, obj):
+        """Убирает сущность из хэша (если она там есть)"""
+        old = self._cells.pop(obj, None)
+        if old is not None:
+            self._discard(obj, old)
+
+    def _discard(self, obj, cell):
+        bucket = self._buckets.get(cell)
+        if bucket is not None:
+            bucket.pop(obj, None)
+            if not bucket:
+                del self._buckets[cell]
+
+    def clear(self):
+        """Полная очистка хэша"""
+        self._buckets.clear()
+        self._cells.clear()
+
+    # --- запросы ---
+
+    def _iter_cells(self, min_cx, min_cy, max_cx, max_cy):
+        buckets = self._buckets
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = buckets.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+    def query_rect(self, min_x, min_y, max_x, max_y, cls=None):
+        """Сущности, чьи координаты лежат в прямоугольнике [min_x, max_x] × [min_y, max_y]"""
+        min_cx, min_cy = self.cell_of(min_x, min_y)
+        max_cx, max_cy = self.cell_of(max_x, max_y)
+        result = []
+        for obj in self._iter_cells(min_cx, min_cy, max_cx, max_cy):
+            if cls is not None and not isinstance(obj, cls):
+                continue
+            x, y = self.position(obj)
+            if min_x <= x <= max_x and min_y <= y <= max_y:
+                result.append(obj)
+        return result
+
+    def query_radius(self, x, y, radius, cls=None):
+        """Сущности не дальше radius от точки (x, y)"""
+        min_cx, min_cy = self.cell_of(x - radius, y - radius)
+        max_cx, max_cy = self.cell_of(x + radius, y + radius)
+        radius_sq = radius * radius
+        result = []
+        for obj in self._iter_cells(min_cx, min_cy, max_cx, max_cy):
+            if cls is not None and not isinstance(obj, cls):
+                continue
+            ox, oy = self.position(obj)
+            if (ox - x) ** 2 + (oy - y) ** 2 <= radius_sq:
+                result.append(obj)
+        return result
+
+    def nearest(self, x, y, k=1, max_radius=None, cls=None):
+        """
+        k ближайших сущностей к точке (x, y): список (расстояние, сущность) по возрастанию.
+        Ячейки просматриваются кольцами от центра, пока ответ не станет окончательным.
+        """
+        if not self._cells:
+            return []
+        cx, cy = self.cell_of(x, y)
+        if max_radius is not None:
+            max_ring = math.ceil(max_radius / self.cell_size) + 1
+        else:
+            # без ограничения — до самой дальней занятой ячейки
+            max_ring = max(max(abs(bx - cx), abs(by - cy)) for bx, by in self._buckets)
+
+        found = []
+        for ring in range(max_ring + 1):
+            for obj in self._ring(cx, cy, ring):
+                if cls is not None and not isinstance(obj, cls):
+                    continue
+                ox, oy = self.position(obj)
+                dist = math.sqrt((ox - x) ** 2 + (oy - y) ** 2)
+                if max_radius is None or dist <= max_radius:
+                    found.append((dist, obj))
+            found.sort(key=lambda item: item[0])
+            # всё, что ближе ring * cell_size, уже гарантированно просмотрено
+            if len(found) >= k and found[k - 1][0] <= ring * self.cell_size:
+                break
+        return found[:k]
+
+    def _ring(self, cx, cy, ring):
+        # сущности в ячейках на границе квадрата радиуса ring вокруг (cx, cy)
+        if ring == 0:
+            yield from self._buckets.get((cx, cy), ())
+            return
+        buckets = self._buckets
+        for dx in range(-ring, ring + 1):
+            yield from buckets.get((cx + dx, cy - ring), ())
+            yield from buckets.get((cx + dx, cy + ring), ())
+        for dy in range(-ring + 1, ring):
+            yield from buckets.get((cx - ring, cy + dy), ())
+            yield from buckets.get((cx + ring, cy + dy), ())
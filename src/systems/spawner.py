@@ -1,140 +1,281 @@
 import random  # модуль для генерации случайных чисел
 
+import numpy as np  # векторные операции над клетками пятен
+
 # импортируем классы и функции из других модулей
 from src.entities.enemy import Enemy
-from src.map.obstacles import Obstacle, MountainGroup, WaterGroup, is_blocked
+from src.map.obstacles import Obstacle, MountainGroup, WaterGroup
+from src.map.occupancy import FREE, ObstacleList, OccupancyGrid
 from src.map.weapon import Weapon
 
+# ---------- Параметры генерации ----------
+
+REFERENCE_RADIUS = 50  # карта, под которую подобраны количества объектов
+
+# количества и размеры объектов для карты радиуса REFERENCE_RADIUS;
+# на больших картах количества растут пропорционально площади
+WORLD_PARAMS = {
+    "lakes": 3,                  # число озёр
+    "lake_size": (30, 100),      # размер озера в клетках (мин, макс)
+    "mountains": 9,              # число гор
+    "mountain_size": (60, 140),  # размер горы в клетках (мин, макс)
+    "trees": 100,                # число деревьев
+    "bushes": 50,                # число кустов
+    "min_distance": 2,           # минимальное расстояние между деревьями (и между кустами)
+}
+
+
+BLOB_SHAPES = 64  # предел последовательностей роста пятен на один вызов generate_blob
+
+# повороты и отражения пятна (матрицы 2×2 для смещений клеток)
+SYMMETRIES = np.array([[[1, 0], [0, 1]], [[-1, 0], [0, 1]], [[1, 0], [0, -1]], [[-1, 0], [0, -1]],
+                       [[0, 1], [1, 0]], [[0, -1], [1, 0]], [[0, 1], [-1, 0]], [[0, -1], [-1, 0]]],
+                      dtype=np.int64)
+
+
+def scaled_count(count, box_map):
+    """Количество объектов для карты box_map (не меньше исходного)"""
+    area = ((2 * box_map.radius + 1) / (2 * REFERENCE_RADIUS + 1)) ** 2
+    return max(count, round(count * area))
+
+
+def _grid_of(obstacles, box_map):
+    # сетка занятости: у ObstacleList она уже есть, для обычного списка строим временную
+    grid = getattr(obstacles, "grid", None)
+    if grid is None:
+        grid = OccupancyGrid(box_map.radius)
+        for obstacle in obstacles or ():
+            grid.add(obstacle)
+    return grid
+
+
+def random_free_cell(box_map, grid, rng=random, attempts=200, accept=None):
+    """
+    Случайная свободная клетка карты: выборка прямо по сетке занятости (проверка за O(1)).
+    accept(x, y) — дополнительное условие. None, если за attempts попыток клетка не нашлась.
+    """
+    radius, kinds, size = box_map.radius, grid.kinds, grid.size
+    span = 2 * radius + 1
+    random_ = rng.random  # random() заметно быстрее randint() при десятках тысяч выборок
+    for _ in range(attempts):
+        gx = int(random_() * span)
+        gy = int(random_() * span)
+        if kinds[gy * size + gx] == FREE and (accept is None or accept(gx - radius, gy - radius)):
+            return gx - radius, gy - radius
+    return None
+
 # ---------- Генераторы ----------
 
-def generate_trees(num_trees, box_map, obstacles, min_distance=2):
-    trees = []  # список деревьев
-    for _ in range(num_trees):  # создаём указанное количество деревьев
-        for attempts in range(200):  # ограничение числа попыток
-            x = random.randint(-box_map.radius, box_map.radius)  # случайная координата X
-            y = random.randint(-box_map.radius, box_map.radius)  # случайная координата Y
-            if not box_map.is_inside(x, y):  # проверка: внутри ли карты
-                continue
-            # проверка: не слишком ли близко к другим деревьям
-            too_close = any(abs(x - t.x) < min_distance and abs(y - t.y) < min_distance for t in trees)
-            # проверка: не занята ли клетка другим препятствием
-            occupied = any(
-                (hasattr(o, "x") and o.x == x and o.y == y) or
-                (hasattr(o, "cells") and (x, y) in o.cells)
-                for o in obstacles
-            )
-            if not too_close and not occupied:
-                # создаём дерево случайного типа
-                trees.append(Obstacle(x, y, random.choice(["tree-1", "tree-2"])))
-                break
-    return trees
-
-def generate_bushes(num_bushes, box_map, obstacles, min_distance=2):
-    bushes = []  # список кустов
-    for _ in range(num_bushes):
-        for attempts in range(200):
-            x = random.randint(-box_map.radius, box_map.radius)
-            y = random.randint(-box_map.radius, box_map.radius)
-            if not box_map.is_inside(x, y):
-                continue
-            # проверка: не слишком ли близко к другим кустам
-            too_close = any(abs(x - b.x) < min_distance and abs(y - b.y) < min_distance for b in bushes)
-            # проверка: не занята ли клетка другим препятствием
-            occupied = any(
-                (hasattr(o, "x") and o.x == x and o.y == y) or
-                (hasattr(o, "cells") and (x, y) in o.cells)
-                for o in obstacles
-            )
-            if not too_close and not occupied:
-                bushes.append(Obstacle(x, y, "bush"))  # создаём куст
-                break
-    return bushes
-
-def generate_blob(num_blobs, min_size, max_size, box_map, kind):
+def scatter(count, box_map, obstacles, min_distance=2, rng=random):
+    """
+    Пуассоновская выборка (метание дротиков по сетке): count свободных клеток,
+    никакие две из которых не ближе min_distance сразу по обеим осям
+    (как проверка too_close в прежних генераторах). Дротики бросаются пачками:
+    занятость и маска окрестностей выбранных точек проверяются векторно, а из близких
+    друг к другу кандидатов одной пачки проходит брошенный раньше — остальные
+    бросаются заново со следующей пачкой. Всего не больше 200 бросков на точку, как раньше.
+    """
+    grid = _grid_of(obstacles, box_map)
+    radius, size = box_map.radius, grid.size
+    span = 2 * radius + 1
+    free = grid.kinds_view.reshape(-1) == FREE
+    # клетки ближе min_distance к уже выбранным точкам: при выборе точки закрашивается
+    # квадрат вокруг неё, поэтому проверка кандидата — одно чтение
+    near = np.zeros(size * size, dtype=bool)
+    reach = max(min_distance - 1, 0)
+    dx, dy = (d.ravel() for d in np.meshgrid(np.arange(-reach, reach + 1), np.arange(-reach, reach + 1)))
+    unclaimed = np.iinfo(np.int64).max
+    claim = np.full(size * size, unclaimed, dtype=np.int64)  # наименьший номер кандидата рядом с клеткой
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+
+    xs, ys = [], []
+    found, budget = 0, 200 * count
+    while found < count and budget > 0:
+        batch = min(max(2 * (count - found), 64), budget)
+        budget -= batch
+        gx, gy = np_rng.integers(0, span, batch), np_rng.integers(0, span, batch)
+        index = gy * size + gx
+        ok = free[index] & ~near[index]
+        gx, gy, index = gx[ok], gy[ok], index[ok]
+        if not len(index):
+            continue
+
+        # окрестности кандидатов: клетка достаётся кандидату с меньшим номером
+        rank = np.arange(len(index))
+        around_x, around_y = gx[:, None] + dx, gy[:, None] + dy
+        valid = (around_x >= 0) & (around_x < size) & (around_y >= 0) & (around_y < size)
+        around = (around_y * size + around_x)[valid]
+        around_rank = np.broadcast_to(rank[:, None], valid.shape)[valid]
+        np.minimum.at(claim, around, around_rank)
+        won = claim[index] == rank  # рядом нет кандидата, брошенного раньше
+        claim[around] = unclaimed
+
+        won[np.cumsum(won) > count - found] = False  # лишние точки последней пачки не нужны
+        near[around[won[around_rank]]] = True
+        xs.extend((gx[won] - radius).tolist())
+        ys.extend((gy[won] - radius).tolist())
+        found = len(xs)
+    return list(zip(xs, ys))
+
+def generate_trees(num_trees, box_map, obstacles, min_distance=2, rng=random):
+    # деревья случайного типа в свободных клетках, не вплотную друг к другу
+    random_ = rng.random  # выбор из двух типов без rng.choice на каждое дерево
+    return [Obstacle(x, y, "tree-1" if random_() < 0.5 else "tree-2")
+            for x, y in scatter(num_trees, box_map, obstacles, min_distance, rng)]
+
+def generate_bushes(num_bushes, box_map, obstacles, min_distance=2, rng=random):
+    # кусты в свободных клетках, не вплотную друг к другу
+    return [Obstacle(x, y, "bush") for x, y in scatter(num_bushes, box_map, obstacles, min_distance, rng)]
+
+def growth_order(count, rng=random):
+    """
+    Порядок роста связного пятна из count клеток вокруг (0, 0): массив смещений (count, 2).
+    Рост идёт по множеству клеток фронта (соседи пятна вне его): каждый шаг добавляет
+    случайную клетку фронта за O(1), поэтому время линейно по размеру пятна.
+    Любое начало этой последовательности — тоже связное пятно.
+    """
+    span = 2 * count + 1  # пятно из count клеток не выходит за квадрат span × span
+    random_ = rng.random
+
+    # клетки кодируются одним числом (индекс в квадрате) — так множества и соседи дешевле
+    cell = count * span + count  # центр квадрата
+    order = [cell]     # клетки пятна в порядке добавления
+    seen = {cell}      # клетки пятна и фронта
+    frontier = []      # клетки фронта
+    seen_add, push, pop = seen.add, frontier.append, frontier.pop
+    while len(order) < count:
+        for near in (cell - 1, cell + 1, cell - span, cell + span):
+            if near not in seen:
+                seen_add(near)
+                push(near)
+        i = int(random_() * len(frontier))
+        cell = frontier[i]
+        frontier[i] = frontier[-1]  # удаление из середины списка за O(1)
+        pop()
+        order.append(cell)
+
+    order = np.array(order, dtype=np.int64)
+    return np.stack((order % span - count, order // span - count), axis=1)
+
+def generate_blob(num_blobs, min_size, max_size, box_map, kind, rng=random):
+    """
+    num_blobs пятен (озёра, горы) размером от min_size до max_size клеток.
+    Пятна вырезаются из общих последовательностей роста (не больше BLOB_SHAPES на вызов)
+    со случайным поворотом и отражением: на больших картах тысячи пятен
+    не выращиваются заново по одной клетке. Клетки за краем карты отбрасываются.
+    """
+    radius = box_map.radius
+    if num_blobs <= 0:
+        return []
+    shapes = [growth_order(max_size, rng) for _ in range(min(num_blobs, BLOB_SHAPES))]
+
+    # параметры всех пятен: центр, размер, последовательность роста и поворот
+    centers, sizes, parts, turns = [], [], [], []
+    for i in range(num_blobs):
+        cx = rng.randint(-radius, radius)  # случайная стартовая точка X
+        cy = rng.randint(-radius, radius)  # случайная стартовая точка Y
+        target = rng.randint(min_size, max_size)  # размер blob-а
+        shape = shapes[i] if i < len(shapes) else shapes[rng.randrange(len(shapes))]
+        centers.append((cx, cy))
+        sizes.append(target)
+        parts.append(shape[:target])
+        turns.append(rng.randrange(len(SYMMETRIES)))
+
+    # клетки всех пятен считаются одним проходом по общему массиву
+    sizes = np.array(sizes)
+    offsets = np.concatenate(parts)
+    turn = SYMMETRIES[np.repeat(turns, sizes)]  # матрица поворота каждой клетки
+    center = np.repeat(np.array(centers, dtype=np.int64), sizes, axis=0)
+    xs = offsets[:, 0] * turn[:, 0, 0] + offsets[:, 1] * turn[:, 1, 0] + center[:, 0]
+    ys = offsets[:, 0] * turn[:, 0, 1] + offsets[:, 1] * turn[:, 1, 1] + center[:, 1]
+    inside = (np.abs(xs) <= radius) & (np.abs(ys) <= radius)
+    counts = np.add.reduceat(inside, np.r_[0, np.cumsum(sizes)[:-1]])  # клеток каждого пятна на карте
+    xs, ys = xs[inside], ys[inside]
+
+    if kind not in ("mountain", "lake"):
+        # одиночные препятствия в каждой клетке пятен
+        return [Obstacle(x, y, kind) for x, y in zip(xs.tolist(), ys.tolist())]
+
+    # группы строятся сразу из масок: границы и локальные координаты клеток — для всех пятен разом
+    counts = counts[counts > 0]  # пятно целиком за краем карты не создаётся
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+    min_x, min_y = np.minimum.reduceat(xs, starts), np.minimum.reduceat(ys, starts)
+    max_x, max_y = np.maximum.reduceat(xs, starts), np.maximum.reduceat(ys, starts)
+    local_x, local_y = xs - np.repeat(min_x, counts), ys - np.repeat(min_y, counts)
+
+    group = MountainGroup if kind == "mountain" else WaterGroup
     obstacles_out = []  # список препятствий
-    for _ in range(num_blobs):  # создаём несколько blob-объектов
-        cx = random.randint(-box_map.radius, box_map.radius)  # случайная стартовая точка X
-        cy = random.randint(-box_map.radius, box_map.radius)  # случайная стартовая точка Y
-        target = random.randint(min_size, max_size)  # размер blob-а
-        blob = {(cx, cy)}  # множество клеток blob-а
-        while len(blob) < target:  # пока не достигнут нужный размер
-            bx, by = random.choice(list(blob))  # выбираем случайную клетку внутри blob-а
-            dx, dy = random.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])  # случайное направление
-            nx, ny = bx + dx, by + dy
-            if box_map.is_inside(nx, ny):  # проверка: внутри карты
-                blob.add((nx, ny))
-        # создаём объект в зависимости от типа
-        if kind == "mountain":
-            obstacles_out.append(MountainGroup(blob))
-        elif kind == "lake":
-            obstacles_out.append(WaterGroup(blob))
-        else:
-            for (x, y) in blob:
-                obstacles_out.append(Obstacle(x, y, kind))
+    for start, count, x0, y0, x1, y1 in zip(starts.tolist(), counts.tolist(), min_x.tolist(), min_y.tolist(),
+                                            max_x.tolist(), max_y.tolist()):
+        mask = np.zeros((y1 - y0 + 1, x1 - x0 + 1), dtype=bool)  # клетки пятна в его прямоугольнике
+        mask[local_y[start:start + count], local_x[start:start + count]] = True
+        obstacles_out.append(group.from_mask(mask, x0, y0, count))
     return obstacles_out
 
 # ---------- Спавн ----------
 
-def spawn_obstacles(box_map):
+def spawn_obstacles(box_map, params=None, rng=random):
+    """
+    Озёра, горы, деревья и кусты. Количества из params (по умолчанию WORLD_PARAMS)
+    масштабируются под площадь карты.
+    """
+    params = {**WORLD_PARAMS, **(params or {})}
+    # у каждого вида препятствий свой поток случайных чисел (зёрна берутся из rng заранее),
+    # поэтому число деревьев не сдвигает форму гор и наоборот
+    lake_rng, mountain_rng, tree_rng, bush_rng = (random.Random(rng.getrandbits(64)) for _ in range(4))
+
     # создаём озёра
-    lakes = generate_blob(num_blobs=3, min_size=30, max_size=100, box_map=box_map, kind="lake")
+    lakes = generate_blob(num_blobs=scaled_count(params["lakes"], box_map), min_size=params["lake_size"][0],
+                          max_size=params["lake_size"][1], box_map=box_map, kind="lake", rng=lake_rng)
     # создаём горы
-    mountains = generate_blob(num_blobs=9, min_size=60, max_size=140, box_map=box_map, kind="mountain")
-    obstacles = lakes + mountains  # объединяем
+    mountains = generate_blob(num_blobs=scaled_count(params["mountains"], box_map),
+                              min_size=params["mountain_size"][0], max_size=params["mountain_size"][1],
+                              box_map=box_map, kind="mountain", rng=mountain_rng)
+    # объединяем в список с сеткой занятости (быстрые проверки is_blocked)
+    obstacles = ObstacleList(box_map.radius, lakes + mountains)
 
     # создаём деревья
-    trees = generate_trees(num_trees=100, box_map=box_map, obstacles=obstacles, min_distance=2)
+    trees = generate_trees(num_trees=scaled_count(params["trees"], box_map), box_map=box_map,
+                           obstacles=obstacles, min_distance=params["min_distance"], rng=tree_rng)
     obstacles += trees
 
     # создаём кусты
-    bushes = generate_bushes(num_bushes=50, box_map=box_map, obstacles=obstacles, min_distance=2)
+    bushes = generate_bushes(num_bushes=scaled_count(params["bushes"], box_map), box_map=box_map,
+                             obstacles=obstacles, min_distance=params["min_distance"], rng=bush_rng)
     obstacles += bushes
 
     return obstacles
 
-def spawn_enemies(num_enemies, box_map, player, min_distance=10, obstacles=None):
+def spawn_enemies(num_enemies, box_map, player, min_distance=10, obstacles=None, rng=random):
     enemies = []  # список врагов
+    grid = _grid_of(obstacles, box_map)
+
+    # враг не должен появляться слишком близко к игроку
+    def far_from_player(x, y):
+        return (x - player.x) ** 2 + (y - player.y) ** 2 >= min_distance ** 2
+
     for _ in range(num_enemies):
-        for attempts in range(200):
-            x = random.randint(-box_map.radius, box_map.radius)
-            y = random.randint(-box_map.radius, box_map.radius)
-            if not box_map.is_inside(x, y):
-                continue
-            # проверка: враг не должен появляться слишком близко к игроку
-            dist = ((x - player.x) ** 2 + (y - player.y) ** 2) ** 0.5
-            if dist >= min_distance and not is_blocked(x, y, obstacles):
-                enemies.append(Enemy(x, y))  # создаём врага
-                break
+        cell = random_free_cell(box_map, grid, rng, accept=far_from_player)
+        if cell is not None:
+            enemies.append(Enemy(*cell))  # создаём врага
     return enemies
 
-def generate_weapons(box_map, obstacles):
+def generate_weapons(box_map, obstacles, rng=random):
     """
     Генерирует ровно по одному: axe, sword, bow в случайных свободных клетках.
     Возвращает список из трёх Weapon.
     """
     weapons = []  # список оружия
     kinds = ["axe", "sword", "bow"]  # типы оружия
+    grid = _grid_of(obstacles, box_map)
 
     for kind in kinds:
-        attempts = 0
-        while True:
-            attempts += 1
-            if attempts > 300:  # защита от бесконечного цикла
-                break
-
-            x = random.randint(-box_map.radius, box_map.radius)
-            y = random.randint(-box_map.radius, box_map.radius)
-
-            if not box_map.is_inside(x, y):  # проверка: внутри карты
-                continue
-            if is_blocked(x, y, obstacles):  # проверка: клетка занята
-                continue
-
-            weapons.append(Weapon(x, y, kind))  # создаём оружие
-            break
+        cell = random_free_cell(box_map, grid, rng, attempts=300)  # защита от бесконечного цикла
+        if cell is not None:
+            weapons.append(Weapon(*cell, kind))  # создаём оружие
 
     return weapons
 
-def spawn_weapons(box_map, obstacles):
+def spawn_weapons(box_map, obstacles, rng=random):
     # спавн оружия через генератор
-    return generate_weapons(box_map, obstacles)
+    return generate_weapons(box_map, obstacles, rng)
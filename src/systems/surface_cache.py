@@ -0,0 +1,108 @@
+from collections import OrderedDict  # упорядоченный словарь для LRU
+
+import pygame as pg  # библиотека pygame для работы с графикой
+
+from src.systems.profiler import PROFILER  # счётчики кадра
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # предел памяти кэша по умолчанию (64 МБ)
+
+
+def surface_bytes(surface):
+    """Сколько байт пикселей занимает поверхность."""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class ScaledSurfaceCache:
+    """
+    Общий кэш масштабированных поверхностей с вытеснением по LRU.
+    - ключ: исходная поверхность (или объект-владелец) + тег + целевой размер
+    - max_bytes: ограничение памяти; при превышении вытесняются давно не использованные записи
+    - hits / misses / evictions: счётчики для проверки эффективности
+    При смене зума (колесико мыши) размеры старого масштаба перестают запрашиваться
+    и постепенно вытесняются новыми.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes  # предел памяти в байтах
+        self.size_bytes = 0         # текущий объём кэша в байтах
+        self.hits = 0               # попадания в кэш
+        self.misses = 0             # промахи (поверхность пришлось строить)
+        self.evictions = 0          # вытесненные записи
+        # (id(владельца), тег, размер) -> (владелец, поверхность, байты)
+        self._entries = OrderedDict()
+
+    def get(self, owner, tag, size, factory):
+        """
+        Возвращает закэшированную поверхность или строит её через factory().
+        owner хранится в записи, чтобы id не переиспользовался, пока запись жива.
+        """
+        key = (id(owner), tag, size)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)  # запись снова «свежая»
+            return entry[1]
+
+        self.misses += 1
+        surface = factory()
+        nbytes = surface_bytes(surface)
+        if nbytes > self.max_bytes:
+            return surface  # слишком большая поверхность — не кэшируем
+
+        self._entries[key] = (owner, surface, nbytes)
+        self.size_bytes += nbytes
+        self._evict()
+        return surface
+
+    def scale(self, surface, size):
+        """Аналог pg.transform.scale(surface, size) с кэшированием результата."""
+        size = (int(size[0]), int(size[1]))
+        return self.get(surface, "scale", size, lambda: _transform_scale(surface, size))
+
+    def flip(self, surface, flip_x, flip_y):
+        """Аналог pg.transform.flip(surface, flip_x, flip_y) с кэшированием результата."""
+        return self.get(surface, "flip", (flip_x, flip_y),
+                        lambda: pg.transform.flip(surface, flip_x, flip_y))
+
+    def _evict(self):
+        # вытесняем самые старые записи, пока не уложимся в предел
+        while self.size_bytes > self.max_bytes and self._entries:
+            _, (_, _, nbytes) = self._entries.popitem(last=False)
+            self.size_bytes -= nbytes
+            self.evictions += 1
+
+    def clear(self):
+        """Полная очистка кэша (счётчики сохраняются)."""
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def reset_stats(self):
+        """Обнуление счётчиков попаданий/промахов."""
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Статистика кэша в виде словаря."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def _transform_scale(surface, size):
+    PROFILER.count("scale")  # реальный вызов transform.scale (промах кэша)
+    return pg.transform.scale(surface, size)
+
+
+# --- Общий экземпляр для всех путей отрисовки ---
+SURFACE_CACHE = ScaledSurfaceCache()
+
+
+def scale(surface, size):
+    """Масштабирование через общий кэш (замена pg.transform.scale при отрисовке)."""
+    return SURFACE_CACHE.scale(surface, size)
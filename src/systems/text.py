@@ -0,0 +1,126 @@
+from collections import OrderedDict  # порядок использования для вытеснения (LRU)
+
+import pygame as pg  # библиотека pygame для шрифтов
+
+from src.systems.profiler import PROFILER  # счётчик настоящих отрисовок текста
+
+DIGITS = "0123456789"  # набор символов атласа по умолчанию
+
+
+class GlyphAtlas:
+    """
+    Атлас символов: каждый символ набора отрисован один раз в общую поверхность.
+    Часто меняющиеся числа (счётчики, таймеры) собираются из областей атласа,
+    без font.render на каждое новое значение.
+    """
+
+    def __init__(self, font, color, antialias=True, charset=DIGITS):
+        glyphs = [(char, font.render(char, antialias, color)) for char in charset]
+        width = sum(glyph.get_width() for _, glyph in glyphs)
+        self.height = font.get_height()
+        self.surface = pg.Surface((max(width, 1), self.height), pg.SRCALPHA)
+        self.rects = {}  # символ -> область в атласе
+        x = 0
+        for char, glyph in glyphs:
+            self.surface.blit(glyph, (x, 0))
+            self.rects[char] = pg.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            x += glyph.get_width()
+
+    def covers(self, text):
+        """Все символы text есть в атласе"""
+        return all(char in self.rects for char in text)
+
+    def size(self, text):
+        """Размер строки из символов атласа (ширина, высота)"""
+        return sum(self.rects[char].width for char in text), self.height
+
+    def draw(self, target, text, pos):
+        """Рисует text символами атласа, pos — левый верхний угол. Возвращает занятую область."""
+        x, y = pos
+        for char in text:
+            area = self.rects[char]
+            target.blit(self.surface, (x, y), area)
+            x += area.width
+        return pg.Rect(pos, self.size(text))
+
+
+class TextRenderer:
+    """
+    Служба отрисовки текста.
+    - font(name, size, bold): общие объекты шрифтов (name — путь к файлу или None для шрифта по умолчанию)
+    - render(...): готовые поверхности надписей в LRU-кэше по (шрифт, размер, жирность,
+      текст, цвет, сглаживание) — надпись рисуется заново, только если её ещё нет в кэше
+    - atlas(...): атлас символов для часто меняющихся чисел
+    - draw_text(...): надпись, в которой меняется только числовой хвост (префикс — из кэша, число — из атласа)
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries  # предел числа надписей в кэше
+        self._fonts = {}                # (имя, размер, жирный) -> pg.font.Font
+        self._surfaces = OrderedDict()  # ключ надписи -> поверхность (от старых к новым)
+        self._atlases = {}              # (имя, размер, жирный, цвет, сглаживание, набор) -> GlyphAtlas
+        self.hits = 0                   # надпись найдена в кэше
+        self.misses = 0                 # надпись отрисована заново
+
+    def font(self, name=None, size=24, bold=False):
+        """Шрифт (создаётся один раз на имя, размер и жирность)"""
+        key = (name, size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pg.font.Font(name, size)
+            font.set_bold(bold)
+        return font
+
+    def render(self, text, size, color=(255, 255, 255), bold=False, font=None, antialias=True):
+        """Поверхность надписи (из кэша или отрисованная и положенная в кэш)"""
+        key = (font, size, bold, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        surface = self.font(font, size, bold).render(text, antialias, color)
+        self._surfaces[key] = surface
+        self.misses += 1
+        PROFILER.count("text renders")
+        while len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)  # вытесняем давно не использованную надпись
+        return surface
+
+    def atlas(self, size, color=(255, 255, 255), bold=False, font=None, antialias=True, charset=DIGITS):
+        """Атлас символов charset для шрифта (создаётся один раз)"""
+        key = (font, size, bold, tuple(color), antialias, charset)
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = self._atlases[key] = GlyphAtlas(self.font(font, size, bold), color, antialias, charset)
+        return atlas
+
+    def draw_text(self, target, prefix, number, size, color=(255, 255, 255), bold=False, font=None,
+                  antialias=True, **anchor):
+        """
+        Рисует «prefix + number»: префикс берётся из кэша, число собирается из атласа цифр.
+        anchor — положение всей надписи, как в get_rect (topright=(x, y), center=(x, y)...).
+        Возвращает занятую область.
+        """
+        head = self.render(prefix, size, color, bold, font, antialias)
+        tail = str(number)
+        atlas = self.atlas(size, color, bold, font, antialias)
+        if not atlas.covers(tail):  # в числе есть символы не из атласа — рисуем целиком
+            surface = self.render(prefix + tail, size, color, bold, font, antialias)
+            return target.blit(surface, surface.get_rect(**anchor))
+
+        tail_width, tail_height = atlas.size(tail)
+        rect = pg.Rect(0, 0, head.get_width() + tail_width, max(head.get_height(), tail_height))
+        for name, value in anchor.items():
+            setattr(rect, name, value)
+        target.blit(head, rect.topleft)
+        atlas.draw(target, tail, (rect.x + head.get_width(), rect.y))
+        return rect
+
+    def clear(self):
+        """Сбрасывает кэш надписей и атласы (шрифты остаются)"""
+        self._surfaces.clear()
+        self._atlases.clear()
+
+
+TEXT = TextRenderer()  # общая служба текста для HUD, меню паузы и главного меню
@@ -0,0 +1,109 @@
+"""
+Версия игры без запуска git.
+
+Дата сборки берётся (по порядку):
+- в рабочей копии — из журнала .git/logs/HEAD, если его последняя запись указывает на HEAD
+  (читается как текстовый файл, без подпроцесса; объекты git не распаковываются — после git gc их нет)
+- из файла BUILD_FILE, который пишется при упаковке: python -m src.systems.version
+Если нет ни того ни другого, дата в версии не указывается.
+"""
+import datetime  # дата коммита
+import json  # файл сборки
+import os  # пути к .git и файлу сборки
+import subprocess  # git — только при упаковке (main)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # корень проекта
+BUILD_FILE = os.path.join(ROOT, "src", "build_info.json")  # версия, зафиксированная при упаковке
+
+
+def read_build_info(path=BUILD_FILE):
+    """Данные файла сборки или None"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def head_commit(root=ROOT):
+    """Хэш коммита HEAD (из .git/HEAD, ссылки ветки или packed-refs) или None"""
+    git_dir = os.path.join(root, ".git")
+    try:
+        with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as f:
+            head = f.read().strip()
+        if not head.startswith("ref: "):
+            return head  # отсоединённый HEAD — сразу хэш
+        ref = head[5:]
+        ref_path = os.path.join(git_dir, *ref.split("/"))
+        if os.path.exists(ref_path):
+            with open(ref_path, encoding="utf-8") as f:
+                return f.read().strip()
+        with open(os.path.join(git_dir, "packed-refs"), encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    except OSError:
+        pass
+    return None
+
+
+def reflog_date(commit, root=ROOT):
+    """
+    Дата YYYY-MM-DD последней записи журнала .git/logs/HEAD, если она переводит HEAD на commit, иначе None.
+    Это время, когда HEAD встал на коммит (коммит, checkout, pull), — для версии рабочей копии достаточно.
+    """
+    try:
+        with open(os.path.join(root, ".git", "logs", "HEAD"), "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - 4096, 0))  # последняя запись — в хвосте файла
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    if not lines:
+        return None
+    try:
+        # <старый хэш> <новый хэш> Имя <почта> 1700000000 +0300\t<сообщение>
+        entry = lines[-1].split(b"\t", 1)[0].decode("utf-8", "replace")
+        new = entry.split(" ", 2)[1]
+        timestamp, offset = entry.rsplit(" ", 2)[1:]
+        sign = -1 if offset.startswith("-") else 1
+        minutes = sign * (int(offset[1:3]) * 60 + int(offset[3:5]))
+    except (IndexError, ValueError):
+        return None
+    if new != commit:
+        return None  # журнал отстал от HEAD (например, ветку передвинули вручную)
+    zone = datetime.timezone(datetime.timedelta(minutes=minutes))
+    return datetime.datetime.fromtimestamp(int(timestamp), zone).strftime("%Y-%m-%d")
+
+
+def build_date():
+    """Дата сборки: журнал HEAD рабочей копии, затем файл сборки; None, если нет ни того ни другого"""
+    commit = head_commit()
+    date = reflog_date(commit) if commit else None
+    if date:
+        return date
+    info = read_build_info()
+    return info.get("date") if info else None
+
+
+def game_version(number):
+    """Строка версии «номер (дата)» или просто номер, если дата неизвестна"""
+    date = build_date()
+    return f"{number} ({date})" if date else str(number)
+
+
+def main():
+    """Упаковка: записывает дату последнего коммита в BUILD_FILE (здесь git запускается один раз)"""
+    try:
+        date = subprocess.check_output(["git", "log", "-1", "--format=%cd", "--date=short"],
+                                       cwd=ROOT, encoding="utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        date = datetime.datetime.now().strftime("%Y-%m-%d")
+    with open(BUILD_FILE, "w", encoding="utf-8") as f:
+        json.dump({"commit": head_commit(), "date": date}, f)
+    print(f"{BUILD_FILE}: {date}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import random  # модуль для генерации случайных чисел
+import time  # таймер для замеров по этапам
+
+from src import settings  # настройки кэша миров
+from src.entities.enemy import Enemy  # класс врага
+from src.entities.player import Player  # класс игрока
+from src.map.map import BoxMap  # класс карты
+from src.map.obstacles import is_blocked  # функция проверки препятствий
+from src.map.occupancy import ObstacleList  # список препятствий с сеткой занятости
+from src.map.weapon import Weapon  # класс оружия
+from src.systems import animation  # состояние анимаций юнитов
+from src.systems.enemy_pool import EnemyPool  # векторная симуляция врагов
+from src.systems.spatial_hash import SpatialHash  # поиск соседей по сетке
+from src.systems.spawner import WORLD_PARAMS, spawn_obstacles, spawn_enemies, generate_weapons  # генераторы
+from src.systems.world_cache import (WorldCache, decode_enemies, decode_grid, decode_obstacles, decode_weapons,
+                                     encode_world, world_key)  # кэш миров на диске
+
+
+class World:
+    """
+    Состояние игрового мира без привязки к экрану:
+    карта, препятствия, игрок, враги (EnemyPool), оружие и пространственный хэш.
+    Один и тот же tick() используется игрой и безголовым режимом (headless).
+    """
+
+    def __init__(self, box_map, obstacles, player, enemies, weapons, seed=None):
+        self.seed = seed              # зерно мира (build_world записывает сюда зерно генерации)
+        self.from_cache = False       # мир загружен из кэша миров, а не сгенерирован
+        self.box_map = box_map        # карта
+        self.obstacles = obstacles    # препятствия (ObstacleList)
+        self.player = player          # игрок
+        self.enemies = enemies        # объекты Enemy (виды на строки пула)
+        self.weapons = weapons        # оружие на карте
+        self.enemy_pool = EnemyPool(enemies, seed=seed)  # данные врагов в массивах
+        animation.settle_dead(self.enemy_pool)  # уже мёртвые враги не проигрывают смерть заново
+
+        # пространственный хэш: игрок, живые враги и лежащее оружие
+        self.spatial = SpatialHash(cell_size=4)
+        self.spatial.insert(player)
+        for weapon in weapons:
+            if not weapon.picked:
+                self.spatial.insert(weapon)
+        self.enemy_pool.sync_spatial_hash(self.spatial)
+
+    def tick(self, direction=None, step_scale=1.0, now=0, timings=None):
+        """
+        Один тик симуляции.
+        - direction: направление движения игрока ("UP", "DOWN", "LEFT", "RIGHT") или None
+        - step_scale: пересчёт скоростей под частоту тиков (FixedStepLoop.step_scale)
+        - now: время симуляции в мс (таймеры атак)
+        - timings: словарь этап -> накопленное время в секундах (если нужен замер)
+        """
+        player, spatial = self.player, self.spatial
+        start = time.perf_counter()
+
+        player.begin_tick()
+        self.enemy_pool.begin_tick()
+
+        # --- Управление игроком ---
+        if player.alive and direction is not None:  # мёртвый игрок не двигается
+            player.move(direction, self.box_map, self.obstacles, is_blocked_fn=is_blocked,
+                        step_scale=step_scale)
+            spatial.move(player)  # обновляем ячейку игрока в хэше
+
+        # --- Подбор оружия (оружие ровно в клетке игрока) ---
+        for weapon in spatial.query_radius(player.x, player.y, 0, cls=Weapon):
+            weapon.picked = True
+            player.weapon = weapon
+            spatial.remove(weapon)  # подобранное оружие больше не ищется
+        player_done = time.perf_counter()
+
+        # --- Враги ---
+        # движение, блуждание и атаки всех врагов — несколько векторных операций
+        self.enemy_pool.update(player, self.box_map, self.obstacles, now=now,
+                               spatial_hash=spatial, step_scale=step_scale)
+
+        # --- Анимации: кто шёл в этом тике, кто погиб ---
+        animation.update_unit(player, now)
+        animation.update_pool(self.enemy_pool, now)
+
+        if timings is not None:
+            end = time.perf_counter()
+            timings["player"] = timings.get("player", 0.0) + (player_done - start)
+            timings["enemies"] = timings.get("enemies", 0.0) + (end - player_done)
+
+
+def stage_rng(seed, stage):
+    """
+    Отдельный поток случайных чисел для этапа генерации (препятствия, враги, оружие, ИИ).
+    Зависит только от зерна и имени этапа: изменение одного этапа не сдвигает остальные.
+    """
+    return random.Random(f"{seed}:{stage}")
+
+
+def nearest_free_cell(box_map, obstacles, x, y):
+    """Ближайшая к (x, y) свободная клетка карты (поиск квадратными кольцами)"""
+    for ring in range(2 * box_map.radius + 1):
+        for cx in range(x - ring, x + ring + 1):
+            for cy in (range(y - ring, y + ring + 1) if abs(cx - x) == ring else (y - ring, y + ring)):
+                if box_map.is_inside(cx, cy) and not is_blocked(cx, cy, obstacles):
+                    return cx, cy
+    return x, y  # свободных клеток нет совсем
+
+
+def new_seed():
+    """Зерно новой случайной карты"""
+    return random.randrange(2 ** 32)
+
+
+WORLD_CACHE = WorldCache(settings.WORLD_CACHE_DIR, settings.WORLD_CACHE_MAX_BYTES)  # общий кэш миров
+
+
+def build_world(radius=50, num_enemies=10, seed=None, timings=None, params=None, cache=WORLD_CACHE):
+    """
+    Генерирует мир: препятствия, игрока в центре (или в ближайшей свободной клетке),
+    врагов и оружие. Вся случайность идёт из потоков stage_rng(seed, ...),
+    поэтому одно и то же зерно всегда даёт один и тот же мир.
+    - seed: зерно; None — случайное зерно (new_seed), такой мир не кэшируется
+    - params: параметры генерации препятствий (см. spawner.WORLD_PARAMS)
+    - cache: WorldCache — мир с известным зерном загружается из него вместо генерации
+    timings (словарь) получает время каждого этапа генерации в секундах.
+    """
+    use_cache = cache is not None and seed is not None
+    if seed is None:
+        seed = new_seed()  # новая карта; зерно сохраняется в World.seed
+    params = {**WORLD_PARAMS, **(params or {})}
+    timings = timings if timings is not None else {}
+
+    def stage(name, fn):
+        start = time.perf_counter()
+        result = fn()
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+        return result
+
+    box_map = stage("map", lambda: BoxMap(radius=radius))  # создаём карту
+
+    key = world_key(seed, radius, num_enemies, params)
+    data = stage("cache_load", lambda: cache.load(key)) if use_cache else None
+    if data is not None:
+        # мир уже генерировался с этими параметрами — собираем объекты из кэша
+        player = Player(*data["player"])
+        obstacles = stage("obstacles", lambda: ObstacleList(radius, decode_obstacles(data["obstacles"]),
+                                                            grid=decode_grid(data, radius)))
+        enemies = stage("enemies", lambda: decode_enemies(data))
+        weapons = stage("weapons", lambda: decode_weapons(data))
+    else:
+        # создаём препятствия
+        obstacles = stage("obstacles", lambda: spawn_obstacles(box_map, params, rng=stage_rng(seed, "obstacles")))
+
+        # создаём игрока в центре; если клетка занята — в ближайшей свободной
+        player = Player(*nearest_free_cell(box_map, obstacles, 0, 0))
+
+        # создаём врагов
+        enemies = stage("enemies", lambda: spawn_enemies(num_enemies=num_enemies, box_map=box_map, player=player,
+                                                         min_distance=10, obstacles=obstacles,
+                                                         rng=stage_rng(seed, "enemies")))
+
+        # создаём оружие
+        weapons = stage("weapons", lambda: generate_weapons(box_map, obstacles, rng=stage_rng(seed, "weapons")))
+
+        if use_cache:
+            stage("cache_store", lambda: cache.store(key, encode_world(player, obstacles, enemies, weapons)))
+
+    ai_seed = stage_rng(seed, "enemy_ai").getrandbits(64)  # блуждание врагов во время игры
+    world = stage("world", lambda: World(box_map, obstacles, player, enemies, weapons, seed=ai_seed))
+    world.seed = seed
+    world.from_cache = data is not None
+    return world
+
+
+def _obstacle_record(obstacle):
+    # сравнимая запись препятствия: вид и клетки
+    if hasattr(obstacle, "x"):
+        return "Obstacle", obstacle.x, obstacle.y, obstacle.kind
+    return type(obstacle).__name__, obstacle.min_x, obstacle.min_y, obstacle.mask.shape, obstacle.mask.tobytes()
+
+
+def same_obstacles(a, b):
+    """Два списка препятствий совпадают поштучно и по порядку"""
+    return len(a) == len(b) and all(_obstacle_record(p) == _obstacle_record(q) for p, q in zip(a, b))
+
+
+def world_from_save(data, radius=50, cache=WORLD_CACHE):
+    """
+    Мир из загруженного сохранения (load_game): карта, препятствия, игрок и враги.
+    Радиус карты и зерно берутся из метаданных (у JSON-сохранений их нет — тогда radius).
+    Если зерно известно, карта и оружие собираются build_world из кэша миров, а препятствия
+    из сохранения заменяют сгенерированные, только если отличаются от них.
+    Без зерна оружия на загруженной карте нет: в сохранение оно не входит.
+    """
+    meta = data.get("meta", {})
+    radius = meta.get("map_radius") or radius
+    seed = meta.get("seed")
+    saved = data["player"]
+    player = Player(saved["x"], saved["y"])
+    player.health = saved["health"]
+    player.alive = player.health > 0
+    enemies = []
+    for saved in data["enemies"]:
+        enemy = Enemy(saved["x"], saved["y"])
+        enemy.alive = saved["alive"]
+        enemies.append(enemy)
+
+    if seed is None:
+        obstacles, weapons, ai_seed = ObstacleList(radius, data["obstacles"]), [], None
+    else:
+        generated = build_world(radius, num_enemies=len(enemies), seed=seed, cache=cache)
+        obstacles, weapons = generated.obstacles, generated.weapons
+        if not same_obstacles(obstacles, data["obstacles"]):
+            obstacles = ObstacleList(radius, data["obstacles"])
+        ai_seed = stage_rng(seed, "enemy_ai").getrandbits(64)
+    world = World(BoxMap(radius=radius), obstacles, player, enemies, weapons, seed=ai_seed)
+    world.seed = seed
+    return world
@@ -0,0 +1,137 @@
+import hashlib  # ключ кэша по параметрам генерации
+import json  # каноничная запись параметров для ключа
+import os  # работа с файлами кэша
+import pickle  # компактная запись данных мира
+
+import numpy as np  # маски клеток групп
+
+from src.entities.enemy import Enemy  # класс врага
+from src.map.obstacles import Obstacle, MountainGroup, WaterGroup  # препятствия
+from src.map.occupancy import OccupancyGrid  # сетка занятости
+from src.map.weapon import Weapon  # класс оружия
+
+WORLD_FORMAT = 3  # версия формата и генераторов: при изменении генерации старый кэш не подходит
+
+GROUP_TYPES = {"MountainGroup": MountainGroup, "WaterGroup": WaterGroup}
+
+
+def world_key(seed, radius, num_enemies, params):
+    """Ключ мира: хэш от зерна, радиуса, числа врагов и параметров генерации"""
+    text = json.dumps({"format": WORLD_FORMAT, "seed": seed, "radius": radius,
+                       "enemies": num_enemies, "params": params}, sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def encode_world(player, obstacles, enemies, weapons):
+    """
+    Данные мира без картинок: препятствия (в порядке добавления) с готовой сеткой занятости
+    (obstacles — ObstacleList), враги, оружие, старт игрока
+    """
+    records = []
+    for o in obstacles:
+        if hasattr(o, "x"):  # одиночный объект-препятствие
+            records.append(("Obstacle", o.x, o.y, o.kind))
+        else:  # группа клеток — маска по битам и её угол
+            height, width = o.mask.shape
+            records.append((o.__class__.__name__, o.min_x, o.min_y, width, height, o.count,
+                            np.packbits(o.mask).tobytes()))
+    return {
+        "player": (player.x, player.y),
+        "obstacles": records,
+        "grid": obstacles.grid.state(),
+        "enemies": [(e.x, e.y) for e in enemies],
+        "weapons": [(w.x, w.y, w.kind) for w in weapons],
+    }
+
+
+def decode_obstacles(records):
+    """Объекты препятствий из записей encode_world"""
+    obstacles = []
+    for record in records:
+        if record[0] == "Obstacle":
+            obstacles.append(Obstacle(record[1], record[2], record[3]))
+        else:
+            name, min_x, min_y, width, height, count, bits = record
+            mask = np.unpackbits(np.frombuffer(bits, dtype=np.uint8), count=width * height)
+            obstacles.append(GROUP_TYPES[name].from_mask(mask.reshape(height, width).view(bool), min_x, min_y, count))
+    return obstacles
+
+
+def decode_enemies(data):
+    """Враги из данных мира"""
+    return [Enemy(x, y) for x, y in data["enemies"]]
+
+
+def decode_weapons(data):
+    """Оружие из данных мира"""
+    return [Weapon(x, y, kind) for x, y, kind in data["weapons"]]
+
+
+def decode_grid(data, radius):
+    """Сетка занятости из данных мира (OccupancyGrid)"""
+    return OccupancyGrid.from_state(radius, data["grid"])
+
+
+class WorldCache:
+    """
+    Кэш сгенерированных миров на диске: файл на каждый ключ (зерно, радиус, параметры).
+    - max_bytes: предел размера каталога; при превышении удаляются давно не открывавшиеся миры
+    - ошибки чтения и записи не мешают игре: мир просто генерируется заново
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory  # каталог кэша
+        self.max_bytes = max_bytes  # предел размера каталога в байтах
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.world")
+
+    def load(self, key):
+        """Данные мира по ключу или None, если мира нет в кэше"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            print(f"Повреждённый мир в кэше удалён: {path}")
+            self._remove(path)
+            return None
+        os.utime(path)  # отметка «недавно открывался» для вытеснения
+        return data
+
+    def store(self, key, data):
+        """Сохраняет данные мира и укладывает каталог в предел размера"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)  # файл появляется целиком или не появляется
+        except OSError as error:
+            print(f"Не удалось сохранить мир в кэш: {error}")
+            return
+        self.trim()
+
+    def trim(self):
+        """Удаляет самые давние миры, пока каталог больше max_bytes"""
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".world")]
+        except OSError:
+            return
+        files = sorted(((e.stat().st_mtime, e.stat().st_size, e.path) for e in entries))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
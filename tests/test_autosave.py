@@ -0,0 +1,64 @@
+import os
+import threading
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # без окна
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")  # без звука
+
+from src.map.obstacles import Obstacle
+from src.systems import autosave as autosave_module
+from src.systems.autosave import Autosave
+from src.systems.save_load import load_game
+from src.systems.world import build_world
+
+
+def test_replaced_snapshot_keeps_obstacle_change(tmp_path, monkeypatch):
+    """Снимок с препятствиями, заменённый снимком без них, всё равно попадает в файл"""
+    release, blocked = threading.Event(), threading.Event()
+    write = autosave_module.atomic_write
+
+    def blocking_write(path, writer):
+        blocked.set()
+        assert release.wait(10)  # поток записи стоит, пока тест ставит новые снимки
+        write(path, writer)
+
+    monkeypatch.setattr(autosave_module, "atomic_write", blocking_write)
+    world = build_world(radius=10, num_enemies=3, seed=1, cache=None)
+    path = str(tmp_path / "autosave.sav")
+    autosave = Autosave(path=path, interval=0)
+    autosave.bind(world.obstacles)
+    try:
+        autosave.save(world)  # первый снимок: поток записи занят им
+        assert blocked.wait(10)
+
+        world.obstacles.append(Obstacle(9, 9, "bush"))
+        autosave.save(world)  # снимок с новым списком препятствий ждёт в очереди...
+        autosave.save(world)  # ...и заменяется снимком без препятствий
+        release.set()
+        assert autosave.flush(10)
+    finally:
+        release.set()
+        autosave.close(10)
+
+    assert autosave.last_error is None
+    data = load_game(path)
+    assert len(data["obstacles"]) == len(world.obstacles)
+    assert any(isinstance(o, Obstacle) and (o.x, o.y, o.kind) == (9, 9, "bush") for o in data["obstacles"])
+
+
+def test_unchanged_world_still_updates_metadata(tmp_path):
+    """Без изменений в мире новый снимок всё равно обновляет метаданные слота"""
+    world = build_world(radius=10, num_enemies=3, seed=1, cache=None)
+    path = str(tmp_path / "autosave.sav")
+    autosave = Autosave(path=path, interval=0)
+    autosave.bind(world.obstacles)
+    try:
+        autosave.save(world, playtime_s=5.0)
+        assert autosave.flush(10)
+        autosave.save(world, playtime_s=12.5)  # изменилось только время игры
+        assert autosave.flush(10)
+    finally:
+        autosave.close(10)
+
+    assert autosave.last_error is None
+    assert autosave.saves == 2
+    assert load_game(path, header_only=True)["playtime_s"] == 12.5
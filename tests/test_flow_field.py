@@ -0,0 +1,48 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # без окна
+
+from src.map.obstacles import MountainGroup
+from src.map.occupancy import ObstacleList
+from src.systems.flow_field import FlowField
+
+
+def _field(obstacles, target=(3, 0)):
+    field = FlowField(max_radius=12)
+    field.bind(ObstacleList(10, obstacles))
+    field.update(*target)
+    return field
+
+
+def test_open_ground_goes_straight():
+    """Без препятствий поле — манхэттенское расстояние, враг идёт к цели напрямую"""
+    field = _field([])
+    assert field.distance_at([3, 0, -3], [0, 0, 2]).tolist() == [0, 3, 8]
+    assert field.next_cell(-3, 0, 1, 0, 0.1) is None
+
+
+def test_wall_routes_around_through_the_gap():
+    """Стена между врагом и целью: враг у стены ведётся к проходу, а не упирается в неё"""
+    wall = MountainGroup([(0, y) for y in range(-10, 5)])  # проход в клетке (0, 5)
+    field = _field([wall])
+    assert field.distance_at([0], [0]).tolist() == [-1]  # клетка стены недостижима
+    here = field.distance_at([-1], [0])[0]
+    assert here == 3 + 5 + 1 + 5  # вокруг стены через проход
+
+    cell = field.next_cell(-1, 0, 1, 0, 0.1)  # прямо — стена
+    assert cell == (-1, 1)
+    assert field.distance_at([cell[0]], [cell[1]])[0] == here - 1
+
+
+def test_obstacle_change_marks_field_dirty():
+    """Новое препятствие перестраивает поле при следующем update"""
+    obstacles = ObstacleList(10)
+    field = FlowField(max_radius=12)
+    field.bind(obstacles)
+    field.update(3, 0)
+    assert field.distance_at([-3], [0]).tolist() == [6]
+
+    obstacles.append(MountainGroup([(0, y) for y in range(-10, 11)]))  # стена во всю карту
+    field.update(3, 0)
+    assert field.recomputes == 2
+    assert field.distance_at([-3], [0]).tolist() == [-1]  # цель отрезана
@@ -0,0 +1,54 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # без окна
+
+from src.map.obstacles import MountainGroup, Obstacle, WaterGroup
+from src.map.occupancy import BUSH, FREE, MOUNTAIN, WATER, ObstacleList
+
+
+def test_overlapping_groups_add_and_remove():
+    """Общие клетки гор и озёр: тип задаёт последнее препятствие, удаление восстанавливает прежний"""
+    obstacles = ObstacleList(10)
+    grid = obstacles.grid
+    lake = WaterGroup([(0, 0), (1, 0), (2, 0)])
+    mountain = MountainGroup([(2, 0), (3, 0)])
+    bush = Obstacle(1, 0, "bush")
+    obstacles.extend([lake, mountain])
+    obstacles.append(bush)
+
+    assert [grid.kind_at(x, 0) for x in range(5)] == [WATER, BUSH, MOUNTAIN, MOUNTAIN, FREE]
+    assert grid.counts_view[10, 12] == 2  # клетка (2, 0) под озером и горой
+
+    obstacles.remove(mountain)
+    assert [grid.kind_at(x, 0) for x in range(5)] == [WATER, BUSH, WATER, FREE, FREE]
+
+    obstacles.remove(bush)
+    assert grid.kind_at(1, 0) == WATER
+    obstacles.remove(lake)
+    assert not any(grid.is_blocked(x, 0) for x in range(5))
+    assert not grid.counts_view.any()
+
+
+def test_extend_matches_append():
+    """Пакетное extend размечает сетку так же, как append по одному"""
+    items = [Obstacle(1, 1, "tree-1"), WaterGroup([(1, 1), (1, 2)]), Obstacle(1, 2, "bush"),
+             Obstacle(30, 0, "bush")]  # последняя — за краем карты
+    batched, single = ObstacleList(10), ObstacleList(10)
+    batched.extend(items)
+    for item in items:
+        single.append(item)
+    assert bytes(batched.grid.kinds) == bytes(single.grid.kinds)
+    assert batched.grid.counts == single.grid.counts
+    assert batched.grid.outside == single.grid.outside
+    assert batched.query_rect(0, 0, 2, 2) == items[:3]
+
+
+def test_clear_resets_grid_in_place():
+    """clear() обнуляет сетку на месте: виды numpy остаются привязаны к ней"""
+    obstacles = ObstacleList(5, [MountainGroup([(0, 0), (1, 1)]), Obstacle(9, 9, "bush")])
+    kinds_view = obstacles.grid.kinds_view
+    obstacles.clear()
+    assert not kinds_view.any() and not obstacles.grid.counts_view.any()
+    assert not obstacles.grid.outside
+    obstacles.append(Obstacle(0, 0, "bush"))
+    assert kinds_view[5, 5] == BUSH
@@ -0,0 +1,83 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # без окна
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")  # без звука
+
+import pytest
+
+from src.entities.enemy import Enemy
+from src.entities.player import Player
+from src.map.obstacles import MountainGroup, Obstacle, WaterGroup
+from src.systems.save_format import make_metadata
+from src.systems.save_load import load_game, save_game
+
+
+def _obstacle_record(o):
+    # сравнимая запись препятствия: тип и клетки
+    if isinstance(o, Obstacle):
+        return "Obstacle", o.x, o.y, o.kind
+    return type(o).__name__, o.cells
+
+
+def _saved_world():
+    player = Player(3, -2)
+    player.health = 42.5
+    enemies = [Enemy(1.25, 7), Enemy(-4, 0.5), Enemy(9, 9)]
+    enemies[1].alive = False
+    obstacles = [
+        Obstacle(2, 2, "tree-1"),
+        Obstacle(-3, 5, "bush"),
+        MountainGroup([(5, 5), (6, 5), (6, 6), (8, 6)]),  # клетки не обязаны быть связными
+        WaterGroup([(-7, -7), (-6, -7), (-7, -6)]),
+        Obstacle(0, -9, "tree-2"),
+    ]
+    return player, enemies, obstacles
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "lzma"])
+def test_binary_round_trip(tmp_path, compression):
+    """save_game → load_game возвращает того же игрока, врагов и все три вида препятствий"""
+    player, enemies, obstacles = _saved_world()
+    path = str(tmp_path / "slot.sav")
+    meta = make_metadata(player.health, len(enemies), 2, len(obstacles), game_version="test",
+                         map_radius=20, seed=123456789)
+    save_game(player, enemies, obstacles, path=path, compression=compression, meta=meta)
+
+    data = load_game(path)
+    assert data["player"] == {"x": 3.0, "y": -2.0, "health": 42.5}
+    assert data["enemies"] == [{"x": 1.25, "y": 7.0, "alive": True},
+                               {"x": -4.0, "y": 0.5, "alive": False},
+                               {"x": 9.0, "y": 9.0, "alive": True}]
+    assert [_obstacle_record(o) for o in data["obstacles"]] == [_obstacle_record(o) for o in obstacles]
+    assert data["meta"]["seed"] == 123456789
+    assert data["meta"]["map_radius"] == 20
+    assert data["meta"]["compression"] == compression
+
+
+def test_truncated_save_returns_none(tmp_path):
+    """Обрезанный файл (сбой посреди записи) не загружается"""
+    path = str(tmp_path / "slot.sav")
+    save_game(*_saved_world(), path=path, compression="none")
+    with open(path, "rb") as f:
+        data = f.read()
+    for size in (4, len(data) // 2, len(data) - 1):
+        with open(path, "wb") as f:
+            f.write(data[:size])
+        assert load_game(path) is None
+
+
+def test_corrupt_save_returns_none(tmp_path):
+    """Испорченное сжатое тело и мусор вместо сохранения не загружаются"""
+    path = str(tmp_path / "slot.sav")
+    save_game(*_saved_world(), path=path, compression="zlib")
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+    data[-20:] = bytes(b ^ 0xFF for b in data[-20:])  # хвост потока deflate и контрольная сумма
+    with open(path, "wb") as f:
+        f.write(data)
+    assert load_game(path) is None
+
+    junk = str(tmp_path / "junk.sav")
+    with open(junk, "w", encoding="utf-8") as f:
+        f.write("{ это не сохранение")
+    assert load_game(junk) is None
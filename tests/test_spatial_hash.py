@@ -0,0 +1,60 @@
+import math
+import random
+
+import pytest
+
+from src.systems.spatial_hash import SpatialHash
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+
+class Marker(Point):
+    pass
+
+
+def _points(seed=3, n=200):
+    rng = random.Random(seed)
+    return [(Marker if i % 5 == 0 else Point)(rng.uniform(-30, 30), rng.uniform(-30, 30)) for i in range(n)]
+
+
+def test_queries_match_brute_force():
+    """query_radius, query_rect и nearest совпадают с полным перебором"""
+    points = _points()
+    spatial = SpatialHash(cell_size=4)
+    for p in points:
+        spatial.insert(p)
+
+    for x, y, radius in ((0, 0, 5), (12.5, -7, 9.3), (-29, 29, 3), (100, 100, 10)):
+        expected = {p for p in points if math.hypot(p.x - x, p.y - y) <= radius}
+        assert set(spatial.query_radius(x, y, radius)) == expected
+        assert set(spatial.query_radius(x, y, radius, cls=Marker)) == {p for p in expected if isinstance(p, Marker)}
+
+        by_distance = sorted(points, key=lambda p: math.hypot(p.x - x, p.y - y))
+        nearest = spatial.nearest(x, y, k=3)
+        assert [p for _, p in nearest] == by_distance[:3]
+        assert [d for d, _ in nearest] == pytest.approx([math.hypot(p.x - x, p.y - y) for p in by_distance[:3]])
+
+    inside = {p for p in points if -10 <= p.x <= 3 and 2 <= p.y <= 20}
+    assert set(spatial.query_rect(-10, 2, 3, 20)) == inside
+
+
+def test_move_and_remove():
+    """Сущность ищется по новой ячейке после move и пропадает после remove"""
+    spatial = SpatialHash(cell_size=4)
+    a, b = Point(0.5, 0.5), Point(1, 1)
+    spatial.insert(a)
+    spatial.insert(b)
+
+    a.x, a.y = 20.5, -13
+    spatial.move(a)
+    assert spatial.query_radius(0, 0, 2) == [b]
+    assert spatial.query_radius(20, -13, 1) == [a]
+    assert spatial.nearest(19, -12, k=1)[0][1] is a
+
+    spatial.remove(a)
+    assert a not in spatial and len(spatial) == 1
+    assert spatial.query_radius(20, -13, 1) == []
+    assert spatial.nearest(0, 0, k=1, max_radius=0.5) == []